@@ -0,0 +1,56 @@
+"""
+Character Memory Benchmark
+
+Measures the per-character memory footprint of the nested character dict
+against the slotted Character record, using tracemalloc.
+
+Usage:
+    python benchmarks/bench_character_memory.py [--characters 100000]
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from characters.character import Character
+from main import generate_characters
+
+
+def measure(build):
+    """
+    Bytes allocated and still live after calling build().
+
+    Args:
+        build (callable): Builds and returns the objects to measure
+
+    Returns:
+        tuple: (objects, bytes)
+    """
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return objects, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--characters", type=int, default=100_000)
+    args = parser.parse_args()
+
+    batch = generate_characters(args.characters, "Ranger", "Half Elf", "dexterity", "wisdom", seed=0)
+    dicts, dict_bytes = measure(lambda: list(batch))
+    records, record_bytes = measure(lambda: [Character.from_dict(character) for character in dicts])
+
+    per_dict = dict_bytes / args.characters
+    per_record = record_bytes / args.characters
+    print(f"{args.characters:,} characters")
+    print(f"{'dict':>10}: {per_dict:>8.0f} bytes/character")
+    print(f"{'Character':>10}: {per_record:>8.0f} bytes/character ({per_dict / per_record:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
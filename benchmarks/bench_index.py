@@ -0,0 +1,69 @@
+"""
+Character Index Query Benchmark
+
+Builds in-memory indexes of growing size where a fixed number of records
+match the query, and times the query. Because lookups start from the most
+selective equality bucket, query time should stay flat as the corpus grows.
+
+Usage:
+    python benchmarks/bench_index.py [--sizes 10000 100000 1000000] [--matches 100]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import generate_characters
+from storage.index import CharacterIndex, index_entry
+from stats.classes import CLASSES
+
+
+def build_index(size, matches):
+    """
+    Index size characters, of which matches are Half-Orc Barbarians.
+
+    Args:
+        size (int): Total number of indexed characters
+        matches (int): Number of Half-Orc Barbarians to plant
+
+    Returns:
+        CharacterIndex: The populated index
+    """
+    index = CharacterIndex()
+    classes = [name for name in CLASSES if name != "Barbarian"]
+    per_class = (size - matches) // len(classes) + 1
+    added = 0
+    for character_class in classes:
+        for character in generate_characters(min(per_class, size - matches - added), character_class, "Human", seed=added):
+            index.add(f"{added}_character.json", index_entry(character))
+            added += 1
+    for character in generate_characters(matches, "Barbarian", "Half-Orc", seed=size):
+        index.add(f"{added}_character.json", index_entry(character))
+        added += 1
+    return index
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--matches", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'corpus':>10} {'build (s)':>10} {'results':>8} {'query (us)':>11}")
+    for size in args.sizes:
+        start = time.perf_counter()
+        index = build_index(size, args.matches)
+        build = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            found = index.query(character_class="Barbarian", race="Half-Orc", strength=(17, None))
+        query = (time.perf_counter() - start) / args.repeat
+        print(f"{size:>10} {build:>10.2f} {len(found):>8} {query * 1e6:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
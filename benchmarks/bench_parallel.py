@@ -0,0 +1,62 @@
+"""
+Parallel Generation Benchmark
+
+Times generate_characters_parallel at 1, 2, 4, ... workers up to the CPU
+count and reports the speedup and parallel efficiency over one worker. It
+also checks that every worker count produced identical characters.
+
+Usage:
+    python benchmarks/bench_parallel.py [--characters 4000000] [--seed 0]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from characters.parallel import generate_characters_parallel
+
+
+def worker_counts(cpus):
+    """Powers of two below the CPU count, plus the CPU count itself."""
+    counts = []
+    workers = 1
+    while workers < cpus:
+        counts.append(workers)
+        workers *= 2
+    counts.append(cpus)
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--characters", type=int, default=4_000_000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    cpus = os.cpu_count() or 1
+    print(f"{args.characters:,} characters, {cpus} CPUs")
+    print(f"{'workers':>8} {'seconds':>10} {'chars/s':>14} {'speedup':>9} {'efficiency':>11}")
+
+    baseline = None
+    reference = None
+    for workers in worker_counts(cpus):
+        start = time.perf_counter()
+        batch = generate_characters_parallel(args.characters, "Fighter", "Human", seed=args.seed, workers=workers)
+        elapsed = time.perf_counter() - start
+
+        strength = bytes(batch.scores["strength"])
+        if reference is None:
+            reference = strength
+        elif strength != reference:
+            sys.exit(f"worker count {workers} produced different characters")
+
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        print(f"{workers:>8} {elapsed:>10.3f} {args.characters / elapsed:>14,.0f} "
+              f"{speedup:>8.2f}x {speedup / workers:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Replay Store Benchmark
+
+Saves the same replay-mode characters as pretty-printed JSON files and as a
+recipe store, then compares bytes on disk and the time to get every
+character back: loading the JSON files versus regenerating from recipes.
+
+Usage:
+    python benchmarks/bench_replay.py [--characters 10000]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import create_character_from_gui, load_character_from_json, save_character_to_json
+from storage.replay import RecipeStore, write_recipes
+
+CLASSES = ("Fighter", "Wizard", "Rogue", "Cleric")
+RACES = (("Half Elf", "dexterity", "constitution"), ("Hill Dwarf", None, None), ("Human", None, None))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--characters", type=int, default=10_000)
+    args = parser.parse_args()
+
+    characters = [
+        create_character_from_gui(f"Hero {number}", CLASSES[number % len(CLASSES)], *RACES[number % len(RACES)],
+                                  seed=True)
+        for number in range(args.characters)
+    ]
+    with tempfile.TemporaryDirectory() as workdir:
+        paths = [os.path.join(workdir, f"hero_{number}_character.json") for number in range(len(characters))]
+        for character, path in zip(characters, paths):
+            save_character_to_json(character, path, index=False)
+        store_path = os.path.join(workdir, "heroes.recipes")
+        write_recipes(store_path, characters)
+
+        json_bytes = sum(os.path.getsize(path) for path in paths)
+        store_bytes = os.path.getsize(store_path)
+
+        start = time.perf_counter()
+        loaded = [load_character_from_json(path) for path in paths]
+        load_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with RecipeStore(store_path) as store:
+            regenerated = store.regenerate()
+        replay_seconds = time.perf_counter() - start
+
+    assert regenerated == loaded == characters
+    print(f"characters:       {len(characters):,}")
+    print(f"JSON files:       {json_bytes:,} bytes, loaded in {load_seconds:.3f} s")
+    print(f"recipe store:     {store_bytes:,} bytes, regenerated in {replay_seconds:.3f} s")
+    print(f"storage saved:    {json_bytes / store_bytes:.0f}x")
+    print(f"speedup:          {load_seconds / replay_seconds:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
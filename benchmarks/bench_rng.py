@@ -0,0 +1,97 @@
+"""
+RNG Backend Benchmark
+
+Times every stats.rng backend on single d6 rolls and on batched d6 and
+4d6-drop-lowest draws, and runs a chi-square goodness-of-fit test on each
+backend's d6 faces. The test fails (exit status 1) when a backend's
+statistic exceeds the critical value for p = 0.001 at 5 degrees of freedom.
+
+Usage:
+    python benchmarks/bench_rng.py [--dice 1000000] [--backends mt packed system]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stats.rng import BACKENDS, load_numpy
+from stats.roll_stat_dice import _drop_lowest_table
+
+FACES = (1, 2, 3, 4, 5, 6)
+# Chi-square critical value, 5 degrees of freedom, p = 0.001
+CRITICAL_VALUE = 20.515
+SCALAR_ROLLS = 100_000
+
+
+def chi_square(counts, expected):
+    """
+    Pearson's chi-square statistic against a uniform expectation.
+
+    Args:
+        counts (list): Observed count per face
+        expected (float): Expected count per face
+
+    Returns:
+        float: The statistic
+    """
+    return sum((observed - expected) ** 2 / expected for observed in counts)
+
+
+def bench_backend(name, dice):
+    """
+    Time one backend and test its d6 faces for uniformity.
+
+    Args:
+        name (str): Key into BACKENDS
+        dice (int): Dice per batched draw
+
+    Returns:
+        dict: Rolls per second for each draw and the chi-square statistic
+    """
+    seed = None if name == "system" else 0
+    backend = BACKENDS[name](seed)
+    table = _drop_lowest_table(6)
+
+    start = time.perf_counter()
+    for _ in range(SCALAR_ROLLS):
+        backend.choice(FACES)
+    scalar = SCALAR_ROLLS / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    faces = backend.choices(FACES, dice)
+    batch = dice / (time.perf_counter() - start)
+
+    start = time.perf_counter()
+    backend.choices(table, dice)
+    drop_lowest = dice / (time.perf_counter() - start)
+
+    counts = [0] * 6
+    for face in faces.tolist():
+        counts[face - 1] += 1
+    return {"scalar": scalar, "batch": batch, "drop_lowest": drop_lowest,
+            "chi_square": chi_square(counts, dice / 6)}
+
+
+def main():
+    available = [name for name in BACKENDS if name != "numpy" or load_numpy() is not None]
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dice", type=int, default=1_000_000, help="dice per batched draw")
+    parser.add_argument("--backends", nargs="+", choices=available, default=available)
+    args = parser.parse_args()
+
+    failed = False
+    print(f"{'backend':<8} {'d6/s single':>13} {'d6/s batch':>13} {'4d6dl/s batch':>14} {'chi-square':>11}")
+    for name in args.backends:
+        result = bench_backend(name, args.dice)
+        verdict = "ok" if result["chi_square"] <= CRITICAL_VALUE else "FAIL"
+        failed |= verdict == "FAIL"
+        print(f"{name:<8} {result['scalar']:>13,.0f} {result['batch']:>13,.0f} {result['drop_lowest']:>14,.0f} "
+              f"{result['chi_square']:>8.2f} {verdict}")
+    print(f"chi-square critical value (df=5, p=0.001): {CRITICAL_VALUE}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
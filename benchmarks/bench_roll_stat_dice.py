@@ -0,0 +1,94 @@
+"""
+Dice Rolling Benchmark
+
+Compares the original per-call 4d6 drop lowest loop against the batched
+roll_4d6_drop_lowest_batch engine. The largest size is rolled in chunks so
+memory stays bounded; the per-call loop is timed on a sample and
+extrapolated there, since running it to completion would take hours.
+
+Usage:
+    python benchmarks/bench_roll_stat_dice.py [--sizes 1000 1000000 100000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stats.roll_stat_dice import load_numpy, roll_4d6_drop_lowest_batch
+
+CHUNK_SIZE = 1_000_000
+LOOP_SAMPLE_LIMIT = 1_000_000
+
+
+def legacy_roll_4d6_drop_lowest(size=6):
+    """The original implementation: four randint calls, sort, delete, sum."""
+    rolls = []
+    for i in range(4):
+        rolls.append(random.randint(1, size))
+    rolls.sort()
+    del rolls[0]
+    return sum(rolls)
+
+
+def time_loop(n):
+    """
+    Time the per-call loop, extrapolating linearly past LOOP_SAMPLE_LIMIT.
+
+    Args:
+        n (int): Number of ability scores to roll
+
+    Returns:
+        tuple: (seconds, extrapolated) where extrapolated is a bool
+    """
+    sample = min(n, LOOP_SAMPLE_LIMIT)
+    start = time.perf_counter()
+    for _ in range(sample):
+        legacy_roll_4d6_drop_lowest()
+    elapsed = time.perf_counter() - start
+    return elapsed * n / sample, sample < n
+
+
+def time_batch(n, seed=0):
+    """
+    Time the batched engine, rolling in CHUNK_SIZE pieces.
+
+    Args:
+        n (int): Number of ability scores to roll
+        seed (int): Master seed for the chunk generators
+
+    Returns:
+        float: Elapsed seconds
+    """
+    np = load_numpy()
+    rng = np.random.default_rng(seed) if np is not None else random.Random(seed)
+    start = time.perf_counter()
+    remaining = n
+    while remaining:
+        chunk = min(remaining, CHUNK_SIZE)
+        roll_4d6_drop_lowest_batch(chunk, seed=rng)
+        remaining -= chunk
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10**3, 10**6, 10**8])
+    args = parser.parse_args()
+
+    np = load_numpy()
+    print(f"backend: {'numpy ' + np.__version__ if np is not None else 'pure python'}")
+    print(f"{'n':>12} {'loop (s)':>12} {'batch (s)':>12} {'speedup':>9} {'stats/s':>14}")
+    for n in args.sizes:
+        loop_seconds, extrapolated = time_loop(n)
+        batch_seconds = time_batch(n)
+        marker = "*" if extrapolated else " "
+        print(f"{n:>12} {loop_seconds:>11.3f}{marker} {batch_seconds:>12.3f} "
+              f"{loop_seconds / batch_seconds:>8.1f}x {n / batch_seconds:>14,.0f}")
+    print("* extrapolated from a sample of", f"{LOOP_SAMPLE_LIMIT:,}", "rolls")
+
+
+if __name__ == "__main__":
+    main()
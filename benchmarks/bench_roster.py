@@ -0,0 +1,63 @@
+"""
+Roster Browser Benchmark
+
+Writes a large binary character store and times what the roster browser
+does with it: building the sort/filter key columns, sorting, filtering,
+and loading a page of rows at a random scroll position (the only work a
+scroll does besides redrawing the visible Treeview items).
+
+Usage:
+    python benchmarks/bench_roster.py [--characters 1000000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from itertools import chain
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from characters.batch import generate_characters
+from roster import RosterModel, open_roster
+from storage.binary import write_store
+
+PARTIES = (("Fighter", "Human"), ("Wizard", "Rock Gnome"), ("Rogue", "Lightfoot Halfling"), ("Cleric", "Hill Dwarf"))
+
+
+def timed(label, func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    print(f"{label:<28}{(time.perf_counter() - start) * 1000:>10.1f} ms")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--characters", type=int, default=1_000_000)
+    parser.add_argument("--pages", type=int, default=200, help="random pages to load")
+    args = parser.parse_args()
+
+    per_party = args.characters // len(PARTIES)
+    batches = [generate_characters(per_party, character_class, race, seed=number)
+               for number, (character_class, race) in enumerate(PARTIES)]
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "roster.bin")
+        count = timed("write store", write_store, path, chain.from_iterable(batches))
+        print(f"{count:,} characters")
+        with open_roster(path) as store:
+            model = RosterModel(store)
+            timed("build key columns", model.key_columns)
+            timed("sort by strength", model.compute_view, sort="strength", descending=True)
+            view = timed("filter Wizard, sort by INT", model.compute_view, {"class": "Wizard"}, "intelligence", True)
+            model.set_view(view)
+            pages = len(model) // model.page_size
+            start = time.perf_counter()
+            for _ in range(args.pages):
+                model.store_page(model.load_page(random.randrange(pages)))
+            print(f"{'load one page':<28}{(time.perf_counter() - start) * 1000 / args.pages:>10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
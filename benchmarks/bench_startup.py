@@ -0,0 +1,81 @@
+"""
+Startup Time Benchmark
+
+Runs the headless CLI under python -X importtime and reports how long the
+project's own imports take, on top of a bare interpreter. Fails (exit
+status 1) if startup exceeds the threshold or if anything GUI-related is
+imported, so it can guard against regressions.
+
+Usage:
+    python benchmarks/bench_startup.py [--max-ms 50] [--runs 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMMAND = ["-m", "stat_calc", "generate", "--class", "Fighter", "--race", "Human", "-n", "1"]
+FORBIDDEN = ("tkinter", "_tkinter", "character_creation_gui", "gui_worker", "roster_browser")
+# Imported by the interpreter itself to run -m, not by the project
+INTERPRETER = ("runpy",)
+
+
+def import_times(args):
+    """
+    Run python -X importtime with args and parse its report.
+
+    Args:
+        args (list): Interpreter arguments after -X importtime
+
+    Returns:
+        dict: Module name mapped to cumulative import time in microseconds,
+            for top-level imports only
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=REPO,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative)
+        else:
+            times.setdefault(name.strip(), 0)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--max-ms", type=float, default=50.0)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = []
+    for _ in range(args.runs):
+        baseline = import_times(["-c", "pass"])
+        times = import_times(COMMAND)
+        # Only top-level imports the bare interpreter does not already make
+        project = {name: cumulative for name, cumulative in times.items() if name not in baseline and name not in INTERPRETER}
+        samples.append((sum(project.values()), project))
+    total, times = sorted(samples, key=lambda sample: sample[0])[len(samples) // 2]
+
+    print(f"median project import time: {total / 1000:.1f} ms (limit {args.max_ms:.0f} ms)")
+    for name, cumulative in sorted(times.items(), key=lambda item: -item[1])[:10]:
+        print(f"  {cumulative / 1000:>7.1f} ms  {name}")
+
+    failures = []
+    imported = [name for name in FORBIDDEN if name in times]
+    if imported:
+        failures.append(f"GUI modules imported: {', '.join(imported)}")
+    if total / 1000 > args.max_ms:
+        failures.append(f"startup {total / 1000:.1f} ms exceeds {args.max_ms:.0f} ms")
+    for failure in failures:
+        print("FAIL:", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
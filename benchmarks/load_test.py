@@ -0,0 +1,96 @@
+"""
+Generation Service Load Test
+
+Opens a number of keep-alive connections to the HTTP service and sends
+POST /generate requests on each as fast as responses come back, then
+reports requests/sec and p50/p99 latency. Without --port it starts a
+service in-process on a free port, which shares the CPU with the clients.
+
+Usage:
+    python benchmarks/load_test.py [--requests 20000] [--connections 64]
+    python benchmarks/load_test.py --port 8080 --host 127.0.0.1
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stat_calc.server import CharacterService
+
+PAYLOAD = {"class": "Fighter", "race": "Half Elf", "choice1": "strength", "choice2": "constitution"}
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+async def client(host, port, requests, latencies, statuses):
+    """Send requests POSTs over one keep-alive connection, recording latencies."""
+    reader, writer = await asyncio.open_connection(host, port)
+    body = json.dumps(PAYLOAD).encode()
+    request = (f"POST /generate HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+               f"Content-Length: {len(body)}\r\n\r\n").encode() + body
+    try:
+        for _ in range(requests):
+            start = time.perf_counter()
+            writer.write(request)
+            head = await reader.readuntil(b"\r\n\r\n")
+            length = 0
+            for line in head.split(b"\r\n"):
+                if line.lower().startswith(b"content-length:"):
+                    length = int(line.split(b":", 1)[1])
+            await reader.readexactly(length)
+            latencies.append(time.perf_counter() - start)
+            status = int(head.split(b" ", 2)[1])
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+
+
+async def run(args):
+    service = None
+    host, port = args.host, args.port
+    if port is None:
+        service = CharacterService()
+        server = await service.start(host, 0)
+        port = server.sockets[0].getsockname()[1]
+
+    latencies = []
+    statuses = {}
+    per_connection, extra = divmod(args.requests, args.connections)
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        client(host, port, per_connection + (index < extra), latencies, statuses)
+        for index in range(args.connections)
+    ))
+    elapsed = time.perf_counter() - start
+    if service is not None:
+        await service.close()
+
+    latencies.sort()
+    print(f"requests:    {len(latencies):,} over {args.connections} connections in {elapsed:.2f} s")
+    print(f"throughput:  {len(latencies) / elapsed:,.0f} requests/sec")
+    print(f"latency p50: {percentile(latencies, 0.50) * 1000:.2f} ms")
+    print(f"latency p99: {percentile(latencies, 0.99) * 1000:.2f} ms")
+    print(f"statuses:    {dict(sorted(statuses.items()))}")
+    if service is not None and service.batches:
+        print(f"batching:    {service.batched_requests / service.batches:.1f} requests per generate pass")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, help="target a running service instead of starting one")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--connections", type=int, default=64)
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == "__main__":
+    main()
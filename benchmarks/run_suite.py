@@ -0,0 +1,190 @@
+"""
+Benchmark Suite
+
+Times the generation and I/O hot paths at several batch sizes and reports
+throughput (characters/sec, dice/sec, bytes/sec) and peak traced memory.
+Results can be saved as a JSON baseline; a later run compared against that
+baseline fails (exit status 1) when any case regresses past the threshold.
+
+Usage:
+    python benchmarks/run_suite.py --save-baseline benchmarks/baseline.json
+    python benchmarks/run_suite.py --baseline benchmarks/baseline.json [--threshold 0.25]
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import create_character_from_gui, load_character_from_json, save_character_to_json
+from stats.roll_stat_dice import roll_4d6_drop_lowest, roll_dice
+
+DEFAULT_SIZES = (100, 1_000, 10_000)
+
+
+def _roll_dice(size, workdir):
+    for _ in range(size):
+        roll_dice(6)
+    return {"dice": size}
+
+
+def _roll_4d6_drop_lowest(size, workdir):
+    for _ in range(size):
+        roll_4d6_drop_lowest()
+    return {"dice": 4 * size}
+
+
+def _create_character(size, workdir):
+    for _ in range(size):
+        create_character_from_gui("Bench", "Fighter", "Half Elf", "strength", "constitution")
+    return {"characters": size, "dice": 24 * size}
+
+
+def _save_character(size, workdir):
+    character = create_character_from_gui("Bench", "Fighter", "Half Elf", "strength", "constitution")
+    written = 0
+    for number in range(size):
+        path = os.path.join(workdir, f"bench_{number}_character.json")
+        save_character_to_json(character, path)
+        written += os.path.getsize(path)
+    return {"characters": size, "bytes": written}
+
+
+def _load_character(size, workdir):
+    character = create_character_from_gui("Bench", "Fighter", "Half Elf", "strength", "constitution")
+    paths = []
+    for number in range(size):
+        path = os.path.join(workdir, f"bench_{number}_character.json")
+        save_character_to_json(character, path, index=False)
+        paths.append(path)
+
+    # Only the loads are timed; setup above runs before the clock starts
+    def run():
+        for path in paths:
+            load_character_from_json(path)
+        return {"characters": size, "bytes": sum(os.path.getsize(path) for path in paths)}
+    return run
+
+
+# Case name -> function(size, workdir) returning counts, or a timed callable
+CASES = {
+    "roll_dice": _roll_dice,
+    "roll_4d6_drop_lowest": _roll_4d6_drop_lowest,
+    "create_character_from_gui": _create_character,
+    "save_character_to_json": _save_character,
+    "load_character_from_json": _load_character,
+}
+
+
+def run_case(case, size, repeat):
+    """
+    Time one case at one batch size.
+
+    The fastest of repeat timed runs is kept, then one extra run measures
+    peak memory under tracemalloc, which would otherwise distort the timing.
+
+    Args:
+        case (str): Key into CASES
+        size (int): Batch size
+        repeat (int): Timed runs
+
+    Returns:
+        dict: seconds, per-second rates for every counted unit, and peak_bytes
+    """
+    best = None
+    counts = None
+    for attempt in range(repeat + 1):
+        with tempfile.TemporaryDirectory() as workdir:
+            prepared = CASES[case](size, workdir) if case == "load_character_from_json" else None
+            measure_memory = attempt == repeat
+            if measure_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            counts = prepared() if prepared else CASES[case](size, workdir)
+            elapsed = time.perf_counter() - start
+            if measure_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            elif best is None or elapsed < best:
+                best = elapsed
+
+    result = {"seconds": best, "peak_bytes": peak}
+    for unit, count in counts.items():
+        result[f"{unit}_per_sec"] = count / best
+    return result
+
+
+def compare(results, baseline, threshold):
+    """
+    Find cases slower or hungrier than the baseline by more than threshold.
+
+    Args:
+        results (dict): Current results keyed by "case@size"
+        baseline (dict): Baseline results in the same shape
+        threshold (float): Allowed fractional regression, e.g. 0.25
+
+    Returns:
+        list: Human readable regression descriptions
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric, value in current.items():
+            if metric.endswith("_per_sec") and metric in previous:
+                if value < previous[metric] * (1 - threshold):
+                    regressions.append(f"{key} {metric}: {value:,.0f} vs baseline {previous[metric]:,.0f}")
+        if current["peak_bytes"] > previous["peak_bytes"] * (1 + threshold):
+            regressions.append(f"{key} peak_bytes: {current['peak_bytes']:,} vs baseline {previous['peak_bytes']:,}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=list(CASES))
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, at least 1")
+    parser.add_argument("--baseline", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed fractional regression")
+    parser.add_argument("--save-baseline", help="write results to this JSON file")
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    if min(args.sizes) < 1:
+        parser.error("--sizes must be positive")
+
+    results = {}
+    print(f"{'case':<28} {'size':>7} {'seconds':>9} {'chars/s':>12} {'dice/s':>12} {'bytes/s':>13} {'peak KiB':>9}")
+    for case in args.cases:
+        for size in args.sizes:
+            result = results[f"{case}@{size}"] = run_case(case, size, args.repeat)
+            rates = [result.get(f"{unit}_per_sec") for unit in ("characters", "dice", "bytes")]
+            cells = [f"{rate:,.0f}" if rate is not None else "-" for rate in rates]
+            print(f"{case:<28} {size:>7} {result['seconds']:>9.4f} {cells[0]:>12} {cells[1]:>12} {cells[2]:>13} "
+                  f"{result['peak_bytes'] / 1024:>9.1f}")
+
+    if args.save_baseline:
+        with open(args.save_baseline, 'w') as f:
+            json.dump({"python": platform.python_version(), "machine": platform.machine(), "results": results}, f, indent=2)
+        print(f"Baseline saved to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print("REGRESSION:", regression)
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%} of {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
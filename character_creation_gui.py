@@ -7,21 +7,76 @@ reroll individual stats, and save characters to JSON files.
 """
 
 import tkinter as tk
-from tkinter import ttk
+from tkinter import filedialog, messagebox, ttk
 from stats.classes import CLASSES
 from stats.races import RACES
-from main import create_character_from_gui, save_character_to_json
-from stats.constitution import calculate_health, get_constitution_modifier
+from main import create_character_from_gui, generate_characters, save_character_to_json
+from gui_worker import BackgroundWorker
+from roster import open_roster
+from roster_browser import RosterBrowser
+from stats import ABILITY_SCORES
+from characters.character import Character
+
+# Character currently shown in the display fields
+current_character = None
+
+# Candidates from the latest "Generate Candidates" request, and its id
+candidates = []
+candidate_generation = 0
+CANDIDATE_CHUNK = 100
+
+def field_text(character, field):
+    """
+    Display text for one field of a character.
 
-def generate_character():
+    Args:
+        character (Character): Character being displayed
+        field (str): "name", "class", "race", "health", "unarmored ac" or an ability score name
+
+    Returns:
+        str: Text for the field's display entry
     """
-    Generate a complete D&D character based on GUI input values.
-    
-    Retrieves values from GUI elements, creates a character using the main
-    character creation function, and updates all display fields with the
-    generated character's information. Also saves the character to a JSON file.
+    if field == "name":
+        return f"Name: {character.name}"
+    if field == "class":
+        return f"Class: {character.character_class}"
+    if field == "race":
+        return f"Race: {character.race}"
+    if field == "health":
+        return f"Max Health: {character.health}"
+    if field == "unarmored ac":
+        return f"Unarmored AC: {character.unarmored_ac}"
+    position = ABILITY_SCORES.index(field)
+    return (f"{field.capitalize()}: {character.scores[position]} ({character.modifiers[position]:+d}) "
+            f"(Racial: +{character.racial_bonus[position]})")
+
+def render_fields(fields):
+    """
+    Redraw the display entries for the given fields of the current character.
+
+    Derived fields such as "strength modifier" are shown inside their
+    ability score's entry, so each entry is redrawn at most once.
+
+    Args:
+        fields (iterable): Field names, e.g. from affected_fields()
+    """
+    redrawn = set()
+    for field in fields:
+        field = field.replace(" modifier", "")
+        if field in redrawn:
+            continue
+        redrawn.add(field)
+        display = field_displays[field]
+        display.delete(0, tk.END)
+        display.insert(0, field_text(current_character, field))
+
+def read_selections():
+    """
+    Read the name, class, race and racial choices from the GUI inputs.
+
+    Returns:
+        tuple: Arguments for create_character_from_gui()
     """
-    # Get input values from GUI elements
     name = name_entry.get()
     character_class = class_dropdown.get()
     character_race = race_dropdown.get()
@@ -29,49 +84,129 @@ def generate_character():
     # Get optional racial stat choices (None if not selected)
     racial_choice1 = choice1_dropdown.get() if choice1_dropdown.get() else None
     racial_choice2 = choice2_dropdown.get() if choice2_dropdown.get() else None
-    
-    # Create character using main creation function
-    character = create_character_from_gui(name, character_class, character_race, racial_choice1, racial_choice2)
-    
-    # Update all display fields with character information
-    name_display.delete(0, tk.END)
-    name_display.insert(0, f"Name: {character['name']}")
-    
-    class_display.delete(0, tk.END)
-    class_display.insert(0, f"Class: {character['class']}")
-    
-    race_display.delete(0, tk.END)
-    race_display.insert(0, f"Race: {character['race']}")
-    
-    health_display.delete(0, tk.END)
-    health_display.insert(0, f"Max Health: {character['stats']['health']}")
-    
-    unarmored_ac_display.delete(0, tk.END)
-    unarmored_ac_display.insert(0, f"Unarmored AC: {character['stats']['unarmored ac']}")
-    
-    # Update all six ability score displays with score, modifier, and racial bonus
-    strength_display.delete(0, tk.END)
-    strength_display.insert(0, f"Strength: {character['stats']['strength']['score']} ({character['stats']['strength']['modifier']:+d}) (Racial: +{character['stats']['strength']['racial bonus']})")
-    
-    dexterity_display.delete(0, tk.END)
-    dexterity_display.insert(0, f"Dexterity: {character['stats']['dexterity']['score']} ({character['stats']['dexterity']['modifier']:+d}) (Racial: +{character['stats']['dexterity']['racial bonus']})")
-    
-    constitution_display.delete(0, tk.END)
-    constitution_display.insert(0, f"Constitution: {character['stats']['constitution']['score']} ({character['stats']['constitution']['modifier']:+d}) (Racial: +{character['stats']['constitution']['racial bonus']})")
-    
-    intelligence_display.delete(0, tk.END)
-    intelligence_display.insert(0, f"Intelligence: {character['stats']['intelligence']['score']} ({character['stats']['intelligence']['modifier']:+d}) (Racial: +{character['stats']['intelligence']['racial bonus']})")
-    
-    wisdom_display.delete(0, tk.END)
-    wisdom_display.insert(0, f"Wisdom: {character['stats']['wisdom']['score']} ({character['stats']['wisdom']['modifier']:+d}) (Racial: +{character['stats']['wisdom']['racial bonus']})")
-    
-    charisma_display.delete(0, tk.END)
-    charisma_display.insert(0, f"Charisma: {character['stats']['charisma']['score']} ({character['stats']['charisma']['modifier']:+d}) (Racial: +{character['stats']['charisma']['racial bonus']})")
+    return name, character_class, character_race, racial_choice1, racial_choice2
+
+def show_character(character):
+    """
+    Make a character dict the current character and redraw every display field.
+
+    Args:
+        character (dict): Character from create_character_from_gui()
+    """
+    global current_character
+    current_character = Character.from_dict(character)
+    render_fields(field_displays)
 
+def save_character(character):
+    """
+    Save a character to JSON on the background worker.
+
+    Saves to the same file are coalesced, so rapidly replacing a character
+    only writes the latest version.
+
+    Args:
+        character (dict): Character data dictionary
+    """
     # Save character to JSON file with sanitized filename
     filename = f"{character['name'].replace(' ', '_').lower()}_character.json"
-    save_character_to_json(character, filename)
-    print(f"Character saved to {filename}!")
+    worker.submit(save_character_to_json, character, filename,
+                  callback=lambda _: print(f"Character saved to {filename}!"), key=("save", filename))
+
+def show_and_save_character(character):
+    show_character(character)
+    save_character(character)
+
+def generate_character():
+    """
+    Generate a complete D&D character based on GUI input values.
+    
+    Rolls the character on the background worker, then updates all display
+    fields with the generated character's information and queues a save to
+    a JSON file, so the window never waits on the disk.
+    """
+    worker.submit(create_character_from_gui, *read_selections(), callback=show_and_save_character, key="generate")
+
+def _generate_candidates(generation, count, selections):
+    """
+    Worker-thread half of generate_candidates(): roll a batch and post it in chunks.
+    """
+    name, character_class, character_race, racial_choice1, racial_choice2 = selections
+    batch = generate_characters(count, character_class, character_race, racial_choice1, racial_choice2)
+    batch.name = name
+    for start in range(0, count, CANDIDATE_CHUNK):
+        if generation != candidate_generation:
+            return
+        worker.post(add_candidates, generation, [batch[i] for i in range(start, min(start + CANDIDATE_CHUNK, count))])
+
+def add_candidates(generation, characters):
+    """
+    Append a chunk of candidates to the list; runs on the main thread.
+
+    Args:
+        generation (int): Request the chunk belongs to; stale chunks are dropped
+        characters (list): Character dicts
+    """
+    if generation != candidate_generation:
+        return
+    for character in characters:
+        candidates.append(character)
+        stats = character["stats"]
+        scores = " ".join(f"{stat[:3].upper()} {stats[stat]['score']}" for stat in ABILITY_SCORES)
+        candidate_list.insert(tk.END, f"{len(candidates)}. {scores} | HP {stats['health']} AC {stats['unarmored ac']}")
+
+def generate_candidates():
+    """
+    Fill the candidate list with N characters without blocking the event loop.
+
+    The batch is rolled on the background worker and shown progressively in
+    chunks; starting a new request abandons any earlier one still filling in.
+    """
+    global candidate_generation
+    try:
+        count = int(candidates_entry.get())
+    except ValueError:
+        return
+    candidate_generation += 1
+    candidates.clear()
+    candidate_list.delete(0, tk.END)
+    worker.submit(_generate_candidates, candidate_generation, count, read_selections(), key="candidates")
+
+def on_candidate_select(event):
+    """
+    Show and save the candidate selected in the list.
+
+    Args:
+        event: Tkinter event object (not used but required by callback)
+    """
+    selection = candidate_list.curselection()
+    if selection:
+        show_and_save_character(candidates[selection[0]])
+
+def browse_roster():
+    """
+    Open a saved roster (binary store, archive or recipe store) in a browser window.
+
+    Double-clicking a row shows that character in the main window.
+    """
+    path = filedialog.askopenfilename(title="Open Roster")
+    if not path:
+        return
+    try:
+        source = open_roster(path)
+    except (OSError, ValueError) as error:
+        messagebox.showerror("Open Roster", str(error))
+        return
+    RosterBrowser(root, source, worker, on_open=show_character, title=f"Roster - {path}")
+
+def on_close():
+    """
+    Close the window once queued saves are written.
+
+    Other queued work is dropped. The event loop keeps running meanwhile and
+    the title shows how many saves are left.
+    """
+    worker.close(root.destroy, keep=lambda key: isinstance(key, tuple) and key[0] == "save",
+                 on_progress=lambda queued: root.title(f"Saving characters... ({queued} queued)"))
 
 def on_race_change(event):
     """
@@ -127,54 +262,26 @@ def reroll_single_stat(stat_name):
     """
     Reroll a single ability score for the current character.
     
-    Generates a new character with the same configuration but fresh dice rolls,
-    then updates only the specified stat display. Also updates dependent stats
-    (health for constitution, AC for dexterity).
+    Rolls only the four dice for that stat, keeps its racial bonus, and
+    redraws just the fields that depend on it (health for constitution,
+    AC for dexterity), so every display keeps describing one character.
     
     Args:
         stat_name (str): Name of the stat to reroll ('strength', 'dexterity', etc.)
     """
-    # Get current selections from GUI
-    name = name_entry.get()
-    character_class = class_dropdown.get()
-    character_race = race_dropdown.get()
-    racial_choice1 = choice1_dropdown.get() if choice1_dropdown.get() else None
-    racial_choice2 = choice2_dropdown.get() if choice2_dropdown.get() else None
-    
-    # Only proceed if we have all required information
-    if name and character_class and character_race:
-        # Generate a new character to get fresh stat rolls
-        character = create_character_from_gui(name, character_class, character_race, racial_choice1, racial_choice2)
-        
-        # Update only the specific stat display based on stat_name
-        if stat_name == 'strength':
-            strength_display.delete(0, tk.END)
-            strength_display.insert(0, f"Strength: {character['stats']['strength']['score']} ({character['stats']['strength']['modifier']:+d}) (Racial: +{character['stats']['strength']['racial bonus']})")
-        elif stat_name == 'dexterity':
-            dexterity_display.delete(0, tk.END)
-            dexterity_display.insert(0, f"Dexterity: {character['stats']['dexterity']['score']} ({character['stats']['dexterity']['modifier']:+d}) (Racial: +{character['stats']['dexterity']['racial bonus']})")
-            # Update unarmored AC since it depends on dexterity modifier
-            unarmored_ac_display.delete(0, tk.END)
-            unarmored_ac_display.insert(0, f"Unarmored AC: {character['stats']['unarmored ac']}")
-        elif stat_name == 'constitution':
-            constitution_display.delete(0, tk.END)
-            constitution_display.insert(0, f"Constitution: {character['stats']['constitution']['score']} ({character['stats']['constitution']['modifier']:+d}) (Racial: +{character['stats']['constitution']['racial bonus']})")
-            # Update health since it depends on constitution modifier
-            health_display.delete(0, tk.END)
-            health_display.insert(0, f"Max Health: {character['stats']['health']}")
-        elif stat_name == 'intelligence':
-            intelligence_display.delete(0, tk.END)
-            intelligence_display.insert(0, f"Intelligence: {character['stats']['intelligence']['score']} ({character['stats']['intelligence']['modifier']:+d}) (Racial: +{character['stats']['intelligence']['racial bonus']})")
-        elif stat_name == 'wisdom':
-            wisdom_display.delete(0, tk.END)
-            wisdom_display.insert(0, f"Wisdom: {character['stats']['wisdom']['score']} ({character['stats']['wisdom']['modifier']:+d}) (Racial: +{character['stats']['wisdom']['racial bonus']})")
-        elif stat_name == 'charisma':
-            charisma_display.delete(0, tk.END)
-            charisma_display.insert(0, f"Charisma: {character['stats']['charisma']['score']} ({character['stats']['charisma']['modifier']:+d}) (Racial: +{character['stats']['charisma']['racial bonus']})")
+    # Nothing to reroll until a character has been generated
+    if current_character is None:
+        return
+
+    render_fields(current_character.reroll(stat_name))
 
 # Initialize main window
 root = tk.Tk()
 root.title("My D&D Character Generator")
+root.protocol("WM_DELETE_WINDOW", on_close)
+
+# Background thread for generation and saving
+worker = BackgroundWorker(root)
 
 # Character name input section
 name_label = tk.Label(root, text="Character Name:")
@@ -268,9 +375,43 @@ charisma_display.pack(anchor="e")
 charisma_reroll = tk.Button(root, text="Reroll Charisma", command=lambda: reroll_single_stat('charisma'))
 charisma_reroll.pack(anchor="e")
 
+# Display entry for each field, used to redraw only what changed
+field_displays = {
+    "name": name_display,
+    "class": class_display,
+    "race": race_display,
+    "health": health_display,
+    "unarmored ac": unarmored_ac_display,
+    "strength": strength_display,
+    "dexterity": dexterity_display,
+    "constitution": constitution_display,
+    "intelligence": intelligence_display,
+    "wisdom": wisdom_display,
+    "charisma": charisma_display,
+}
+
 # Main generate button to create a complete character
 generate = tk.Button(root, text="Generate Character", command=generate_character)
 generate.pack(anchor="w")
 
+# Generate many candidates at once and pick one from the list
+candidates_label = tk.Label(root, text="Number of Candidates:")
+candidates_label.pack(anchor="w")
+
+candidates_entry = tk.Entry(root, width=10)
+candidates_entry.insert(0, "20")
+candidates_entry.pack(anchor="w")
+
+generate_candidates_button = tk.Button(root, text="Generate Candidates", command=generate_candidates)
+generate_candidates_button.pack(anchor="w")
+
+candidate_list = tk.Listbox(root, width=70, height=10)
+candidate_list.pack(anchor="w")
+candidate_list.bind("<<ListboxSelect>>", on_candidate_select)
+
+# Review bulk-generated rosters saved to disk
+browse_roster_button = tk.Button(root, text="Browse Roster...", command=browse_roster)
+browse_roster_button.pack(anchor="w")
+
 # Start the GUI event loop
 root.mainloop()
\ No newline at end of file
@@ -0,0 +1,229 @@
+"""
+Point-Buy and Standard-Array Allocation
+
+Finds the best way to spend a 27-point buy, or to assign the standard array,
+for a class and race - trying every racial choice pair for Variant Human and
+Half Elf. Objectives that score each ability independently (the default,
+per-class weights) are solved exactly by dynamic programming over
+(ability, points or array values left), with the top k partial allocations
+of every subproblem memoized, in milliseconds. An objective of the whole
+score array falls back to an exhaustive search pruned by the remaining
+budget, which takes tens of milliseconds, or about half a second for the
+choice races.
+"""
+
+import heapq
+from operator import add
+from functools import lru_cache
+from itertools import combinations
+
+from stats import ABILITY_SCORES
+from stats.races import RACES
+from stats.rules import HIT_DICE, bonus_vector
+from .character import Character
+
+POINT_BUY_COSTS = {8: 0, 9: 1, 10: 2, 11: 3, 12: 4, 13: 5, 14: 7, 15: 9}
+POINT_BUY_BUDGET = 27
+STANDARD_ARRAY = (15, 14, 13, 12, 10, 8)
+METHODS = ("point buy", "standard array")
+# Memoized top-k tables kept, one per (weights, bonuses, k); custom weights
+# would otherwise add a table per distinct objective forever
+TABLE_CACHE_SIZE = 256
+
+# Relative value of each ability score per class: primary abilities 3,
+# secondary 2, constitution 1.5 for everyone, the rest 0.5
+_PRIORITIES = {
+    "Barbarian": ("strength", "constitution"),
+    "Fighter": ("strength", "constitution"),
+    "Paladin": ("strength", "charisma"),
+    "Ranger": ("dexterity", "wisdom"),
+    "Bard": ("charisma", "dexterity"),
+    "Cleric": ("wisdom", "constitution"),
+    "Druid": ("wisdom", "constitution"),
+    "Monk": ("dexterity", "wisdom"),
+    "Rogue": ("dexterity", "intelligence"),
+    "Warlock": ("charisma", "constitution"),
+    "Sorcerer": ("charisma", "constitution"),
+    "Wizard": ("intelligence", "dexterity"),
+}
+CLASS_WEIGHTS = {
+    character_class: {
+        stat: 3 if stat == primary else 2 if stat == secondary else 1.5 if stat == "constitution" else 0.5
+        for stat in ABILITY_SCORES
+    }
+    for character_class, (primary, secondary) in _PRIORITIES.items()
+}
+
+
+def racial_options(character_race):
+    """
+    Every distinct racial bonus vector available to a race.
+
+    Args:
+        character_race (str): Selected character race
+
+    Returns:
+        list: (racial_choice1, racial_choice2, bonuses) tuples
+    """
+    if "choice" not in RACES[character_race]:
+        return [(None, None, bonus_vector(character_race))]
+    options = {}
+    for choice1, choice2 in combinations(ABILITY_SCORES, 2):
+        options.setdefault(bonus_vector(character_race, choice1, choice2), (choice1, choice2))
+    return [(choice1, choice2, bonuses) for bonuses, (choice1, choice2) in options.items()]
+
+
+def _stat_value(weight, score):
+    # A weighted modifier; odd scores earn half credit toward the next one,
+    # which the first ability score increase would complete
+    if callable(weight):
+        return weight(score)
+    return weight * (score - 10) / 2
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _point_buy_table(weights, bonuses, k):
+    # best(i, budget): top k (value, bases) for abilities i.. with budget points left
+    @lru_cache(maxsize=None)
+    def best(i, budget):
+        if i == len(ABILITY_SCORES):
+            return ((0, ()),)
+        candidates = []
+        for base, cost in POINT_BUY_COSTS.items():
+            if cost > budget:
+                break
+            value = _stat_value(weights[i], base + bonuses[i])
+            candidates.extend((value + rest, (base,) + bases) for rest, bases in best(i + 1, budget - cost))
+        return tuple(heapq.nlargest(k, candidates))
+    return best(0, POINT_BUY_BUDGET)
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def _standard_array_table(weights, bonuses, k):
+    # best(i, left): top k (value, bases) assigning the multiset left to abilities i..
+    @lru_cache(maxsize=None)
+    def best(i, left):
+        if not left:
+            return ((0, ()),)
+        candidates = []
+        for position, base in enumerate(left):
+            if base in left[:position]:
+                continue
+            value = _stat_value(weights[i], base + bonuses[i])
+            remaining = left[:position] + left[position + 1:]
+            candidates.extend((value + rest, (base,) + bases) for rest, bases in best(i + 1, remaining))
+        return tuple(heapq.nlargest(k, candidates))
+    return best(0, STANDARD_ARRAY)
+
+
+@lru_cache(maxsize=None)
+def _all_allocations(method, maximal):
+    # Exhaustive search, pruning any branch that has already overspent; with
+    # maximal, allocations that could still raise a score are skipped too
+    if method == "standard array":
+        def assign(left):
+            if not left:
+                yield ()
+            for position, base in enumerate(left):
+                if base not in left[:position]:
+                    for rest in assign(left[:position] + left[position + 1:]):
+                        yield (base,) + rest
+        return tuple(assign(STANDARD_ARRAY))
+
+    def spend(i, budget):
+        if i == len(ABILITY_SCORES):
+            yield (), budget
+            return
+        for base, cost in POINT_BUY_COSTS.items():
+            if cost > budget:
+                break
+            for rest, left in spend(i + 1, budget - cost):
+                yield (base,) + rest, left
+
+    def saturated(bases, left):
+        return all(base == 15 or POINT_BUY_COSTS[base + 1] - POINT_BUY_COSTS[base] > left for base in bases)
+
+    return tuple(bases for bases, left in spend(0, POINT_BUY_BUDGET) if not maximal or saturated(bases, left))
+
+
+def top_allocations(character_class, character_race, method="point buy", objective=None, k=5, name=None,
+                    monotone=True):
+    """
+    Find the k best allocations for a class and race.
+
+    Args:
+        character_class (str): Selected character class
+        character_race (str): Selected character race
+        method (str): "point buy" or "standard array"
+        objective (dict | callable, optional): Per ability score, a weight
+            on its modifier or a function of its final score; or a function
+            of all six final scores (ordered like ABILITY_SCORES). The value
+            is maximized. Defaults to CLASS_WEIGHTS for the class.
+        k (int): Number of allocations to return
+        name (str, optional): Name for the characters; defaults to the class
+        monotone (bool): Whether a callable objective never falls when a
+            score rises, so point buys that leave a score affordable can be
+            skipped (12k candidates instead of 192k)
+
+    Returns:
+        list: Dicts, best first, with "value", "base scores",
+        "racial choices" and "character" in create_character_from_gui() format
+
+    Raises:
+        ValueError: For an unknown method
+        KeyError: For an unknown class or race
+    """
+    if method not in METHODS:
+        raise ValueError(f"unknown method {method!r}; choose from {', '.join(METHODS)}")
+    if character_class not in HIT_DICE:
+        raise KeyError(character_class)
+    if objective is None:
+        objective = CLASS_WEIGHTS[character_class]
+
+    ranked = []
+    # Choice pairs often produce the same final scores; score each only once
+    values = {}
+    for choice1, choice2, bonuses in racial_options(character_race):
+        if callable(objective):
+            found = []
+            for bases in _all_allocations(method, monotone):
+                scores = tuple(map(add, bases, bonuses))
+                value = values.get(scores)
+                if value is None:
+                    value = values[scores] = objective(scores)
+                found.append((value, bases))
+            found = heapq.nlargest(k, found)
+        else:
+            weights = tuple(objective.get(stat, 0) for stat in ABILITY_SCORES)
+            table = _point_buy_table if method == "point buy" else _standard_array_table
+            found = table(weights, bonuses, k)
+        ranked.extend((value, bases, choice1, choice2, bonuses) for value, bases in found)
+
+    results = []
+    for value, bases, choice1, choice2, bonuses in heapq.nlargest(k, ranked):
+        scores = list(map(add, bases, bonuses))
+        character = Character(name or character_class, character_class, character_race, scores, bonuses)
+        results.append({
+            "value": value,
+            "base scores": dict(zip(ABILITY_SCORES, bases)),
+            "racial choices": (choice1, choice2),
+            "character": character.to_dict(),
+        })
+    return results
+
+
+def best_allocation(character_class, character_race, method="point buy", objective=None, name=None):
+    """
+    The single best allocation, as a create_character_from_gui() dict.
+
+    Args:
+        character_class (str): Selected character class
+        character_race (str): Selected character race
+        method (str): "point buy" or "standard array"
+        objective (dict | callable, optional): See top_allocations()
+        name (str, optional): Character name
+
+    Returns:
+        dict: Complete character data structure
+    """
+    return top_allocations(character_class, character_race, method, objective, k=1, name=name)[0]["character"]
@@ -0,0 +1,169 @@
+"""
+Columnar Character Batches
+
+Holds many characters of the same class and race as a struct of arrays:
+one column per ability score, plus modifier, health and unarmored AC
+columns. Every derived column is computed in a single whole-batch pass,
+and the per-character dict shape produced by create_character_from_gui is
+only built when a caller asks for it.
+"""
+
+from array import array
+
+from stats import ABILITY_SCORES
+from stats.rules import HIT_DICE, bonus_vector
+from stats.roll_stat_dice import load_numpy, roll_ability_scores
+
+
+def _byte_table(func):
+    # 256-entry lookup over every signed byte value, for whole-column mapping
+    return bytes(func(i - 256 if i > 127 else i) & 0xFF for i in range(256))
+
+
+def _map_column(column, func):
+    """
+    Apply func to every value of an int8 column in one pass.
+
+    Args:
+        column (array): int8 NumPy array or array('b')
+        func (callable): Mapping from one int to another, both within int8
+
+    Returns:
+        array: New column of the same kind
+    """
+    table = _byte_table(func)
+    if isinstance(column, array):
+        return array('b', bytes(column).translate(table))
+    np = load_numpy()
+    return np.frombuffer(table, dtype=np.int8)[column.view(np.uint8)]
+
+
+def _modifier(score):
+    return (score - 10) // 2
+
+
+class CharacterBatch:
+    """
+    A batch of characters sharing one class, race and set of racial choices.
+
+    Attributes:
+        character_class (str): Class of every character in the batch
+        character_race (str): Race of every character in the batch
+        racial_bonus (dict): Total racial bonus per ability score
+        scores (dict): Final score column per ability score
+        modifiers (dict): Modifier column per ability score
+        health (array): Level 1 max health column
+        unarmored_ac (array): Unarmored AC column
+    """
+
+    def __init__(self, rolls, character_class, character_race, racial_choice1=None, racial_choice2=None, name=None):
+        """
+        Build a batch from base dice rolls, applying racial bonuses.
+
+        Args:
+            rolls (sequence): Six int8 columns of base rolls, ordered like ABILITY_SCORES
+            character_class (str): Selected character class
+            character_race (str): Selected character race
+            racial_choice1 (str, optional): First choice racial stat bonus
+            racial_choice2 (str, optional): Second choice racial stat bonus
+            name (str, optional): Name given to every character; defaults
+                to "Character <n>" numbered from 1
+        """
+        self.character_class = character_class
+        self.character_race = character_race
+        self.racial_choices = (racial_choice1, racial_choice2)
+        self.name = name
+
+        bonuses = bonus_vector(character_race, racial_choice1, racial_choice2)
+        self.racial_bonus = dict(zip(ABILITY_SCORES, bonuses))
+        self.scores = {
+            stat: _map_column(column, lambda score, bonus=bonus: score + bonus)
+            for stat, column, bonus in zip(ABILITY_SCORES, rolls, bonuses)
+        }
+        self.modifiers = {stat: _map_column(column, _modifier) for stat, column in self.scores.items()}
+
+        hit_die = HIT_DICE[character_class]
+        self.health = _map_column(self.scores["constitution"], lambda score: hit_die + _modifier(score))
+        self.unarmored_ac = _map_column(self.scores["dexterity"], lambda score: 10 + _modifier(score))
+
+    def __len__(self):
+        return len(self.health)
+
+    def hit_points(self, levels=20, rule="average", seed=None):
+        """
+        Hit points at levels 1 through levels for every character.
+
+        Args:
+            levels (int): Highest level to compute
+            rule (str): "average" or "rolled"
+            seed (optional): Seed or generator for rolled hit points
+
+        Returns:
+            list: One column per level, as stats.health.hit_point_progression()
+        """
+        # Loaded on first use; the progression engine pulls in the exact-distribution code
+        from stats.health import hit_point_progression
+        return hit_point_progression(self.character_class, self.modifiers["constitution"], levels, rule, seed)
+
+    def __getitem__(self, index):
+        """
+        Build the create_character_from_gui dict for one character.
+
+        Args:
+            index (int): Position in the batch; negative values count from the end
+
+        Returns:
+            dict: Complete character data structure
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("character index out of range")
+        stats = {
+            stat: {
+                "score": int(self.scores[stat][index]),
+                "racial bonus": self.racial_bonus[stat],
+                "modifier": int(self.modifiers[stat][index]),
+            }
+            for stat in ABILITY_SCORES
+        }
+        stats["health"] = int(self.health[index])
+        stats["unarmored ac"] = int(self.unarmored_ac[index])
+        return {
+            "name": self.name if self.name is not None else f"Character {index + 1}",
+            "class": self.character_class,
+            "race": self.character_race,
+            "stats": stats,
+        }
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+
+def generate_characters(n, character_class, character_race, racial_choice1=None, racial_choice2=None, seed=None):
+    """
+    Generate many characters at once as a columnar batch.
+
+    Rolls all 6 * n ability scores in one pass with the configured stat
+    expression (4d6 drop lowest unless set_stat_expression() changed it) and
+    computes racial bonuses, modifiers, health and unarmored AC for the
+    whole batch at a time.
+    Indexing or iterating the batch yields the same dict shape as
+    create_character_from_gui(), built lazily per character.
+
+    Args:
+        n (int): Number of characters to generate
+        character_class (str): Selected character class
+        character_race (str): Selected character race
+        racial_choice1 (str, optional): First choice racial stat bonus
+        racial_choice2 (str, optional): Second choice racial stat bonus
+        seed (int, optional): Seed for reproducible batches
+
+    Returns:
+        CharacterBatch: Struct-of-arrays character batch
+    """
+    rolls = roll_ability_scores(6 * n, seed=seed)
+    # Rolls are laid out stat-major so each column is one contiguous slice
+    columns = [rolls[i * n:(i + 1) * n] for i in range(6)]
+    return CharacterBatch(columns, character_class, character_race, racial_choice1, racial_choice2)
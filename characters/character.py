@@ -1,7 +1,248 @@
-class Player:
-    def __init__(self, name, role, level, strength, constitution):
+"""
+Compact Character Record
+
+A slotted alternative to the nested character dict. Ability scores live in
+a six-byte bytes object, class and race are small interned ids, and the
+racial bonus vector is shared between every character with the same
+bonuses. Modifiers, health and unarmored AC are computed on first access
+and cached; DEPENDENCIES records which of them a score change invalidates,
+so rerolling one stat only recomputes the fields downstream of it.
+"""
+
+from stats import ABILITY_SCORES
+from stats.races import RACES
+from stats.roll_stat_dice import roll_ability_score
+from stats.rules import BONUS_VECTORS, HIT_DICE
+
+# Scores are stored one byte each and match the int8 score columns elsewhere
+MIN_SCORE = 1
+MAX_SCORE = 127
+
+# Interning tables cover exactly the known rules, so they never grow
+_CLASS_NAMES = list(HIT_DICE)
+_CLASS_IDS = {name: index for index, name in enumerate(_CLASS_NAMES)}
+_RACE_NAMES = list(RACES)
+_RACE_IDS = {name: index for index, name in enumerate(_RACE_NAMES)}
+_BONUS_VECTORS = {vector: vector for vector in BONUS_VECTORS.values()}
+_BONUS_VECTORS[(0,) * len(ABILITY_SCORES)] = (0,) * len(ABILITY_SCORES)
+
+# Which fields must be recomputed when a field changes
+DEPENDENCIES = {stat: (f"{stat} modifier",) for stat in ABILITY_SCORES}
+DEPENDENCIES["constitution modifier"] = ("health",)
+DEPENDENCIES["dexterity modifier"] = ("unarmored ac",)
+
+
+def affected_fields(field):
+    """
+    Every field that depends on field, directly or indirectly.
+
+    Args:
+        field (str): Changed field, e.g. "constitution"
+
+    Returns:
+        list: The field itself followed by its dependents, each listed after
+            everything it depends on
+    """
+    ordered = [field]
+    for dependent in ordered:
+        for child in DEPENDENCIES.get(dependent, ()):
+            if child not in ordered:
+                ordered.append(child)
+    return ordered
+
+
+def _intern_id(name, ids, kind):
+    index = ids.get(name)
+    if index is None:
+        raise ValueError(f"unknown {kind} {name!r}")
+    return index
+
+
+def _intern_bonuses(bonuses):
+    # Vectors outside the rules (hand-edited saves) are kept, just not shared
+    bonuses = tuple(bonuses)
+    return _BONUS_VECTORS.get(bonuses, bonuses)
+
+
+def _pack_scores(scores):
+    scores = tuple(scores)
+    if len(scores) != len(ABILITY_SCORES):
+        raise ValueError(f"expected {len(ABILITY_SCORES)} ability scores, got {len(scores)}")
+    for stat, score in zip(ABILITY_SCORES, scores):
+        if not MIN_SCORE <= score <= MAX_SCORE:
+            raise ValueError(f"{stat} score {score} is outside {MIN_SCORE}-{MAX_SCORE}")
+    return bytes(scores)
+
+
+class Character:
+    """
+    A single character with lazily derived fields.
+
+    Each ability score is also readable as an attribute, e.g. character.strength.
+    """
+
+    __slots__ = ("name", "_class_id", "_race_id", "_scores", "racial_bonus",
+                 "_modifiers", "_health", "_unarmored_ac")
+
+    def __init__(self, name, character_class, character_race, scores, racial_bonus=(0, 0, 0, 0, 0, 0)):
+        """
+        Args:
+            name (str): Character name
+            character_class (str): Character class
+            character_race (str): Character race
+            scores (sequence): Six final ability scores ordered like ABILITY_SCORES
+            racial_bonus (sequence): Six racial bonuses already included in scores
+
+        Raises:
+            ValueError: If the class or race is unknown, or a score is
+                outside MIN_SCORE to MAX_SCORE
+        """
         self.name = name
-        self.role = role
-        self.level = level
-        self.strength = strength
-        self.constitution = constitution
+        self._class_id = _intern_id(character_class, _CLASS_IDS, "class")
+        self._race_id = _intern_id(character_race, _RACE_IDS, "race")
+        self._scores = _pack_scores(scores)
+        self.racial_bonus = _intern_bonuses(racial_bonus)
+        self._modifiers = None
+        self._health = None
+        self._unarmored_ac = None
+
+    @property
+    def character_class(self):
+        return _CLASS_NAMES[self._class_id]
+
+    @property
+    def race(self):
+        return _RACE_NAMES[self._race_id]
+
+    @property
+    def scores(self):
+        """Final ability scores as a tuple ordered like ABILITY_SCORES."""
+        return tuple(self._scores)
+
+    def set_score(self, stat, score):
+        """
+        Replace one final ability score and drop only the derived fields that depend on it.
+
+        Args:
+            stat (str): Ability score name
+            score (int): New final score, racial bonus included
+
+        Returns:
+            list: Fields changed by the update, from affected_fields()
+
+        Raises:
+            ValueError: If the score is outside MIN_SCORE to MAX_SCORE
+        """
+        position = ABILITY_SCORES.index(stat)
+        if not MIN_SCORE <= score <= MAX_SCORE:
+            raise ValueError(f"{stat} score {score} is outside {MIN_SCORE}-{MAX_SCORE}")
+        self._scores = self._scores[:position] + bytes((score,)) + self._scores[position + 1:]
+        fields = affected_fields(stat)
+        if self._modifiers is not None:
+            modifiers = list(self._modifiers)
+            modifiers[position] = (score - 10) // 2
+            self._modifiers = tuple(modifiers)
+        if "health" in fields:
+            self._health = None
+        if "unarmored ac" in fields:
+            self._unarmored_ac = None
+        return fields
+
+    def reroll(self, stat):
+        """
+        Reroll one ability score with the configured stat expression, keeping its racial bonus.
+
+        Args:
+            stat (str): Ability score name
+
+        Returns:
+            list: Fields changed by the reroll, from affected_fields()
+        """
+        bonus = self.racial_bonus[ABILITY_SCORES.index(stat)]
+        return self.set_score(stat, roll_ability_score() + bonus)
+
+    @property
+    def modifiers(self):
+        """Ability modifiers as a tuple ordered like ABILITY_SCORES."""
+        if self._modifiers is None:
+            self._modifiers = tuple((score - 10) // 2 for score in self._scores)
+        return self._modifiers
+
+    @property
+    def health(self):
+        """Level 1 max health, or None for a class without a known hit die."""
+        if self._health is None:
+            hit_die = HIT_DICE.get(self.character_class)
+            if hit_die is not None:
+                self._health = hit_die + self.modifiers[2]
+        return self._health
+
+    @property
+    def unarmored_ac(self):
+        if self._unarmored_ac is None:
+            self._unarmored_ac = 10 + self.modifiers[1]
+        return self._unarmored_ac
+
+    @classmethod
+    def from_dict(cls, character):
+        """
+        Build a Character from the nested dict made by create_character_from_gui().
+
+        Flat integer stats, as in older saves, are accepted with no racial bonus.
+
+        Args:
+            character (dict): Character data dictionary
+
+        Returns:
+            Character: The compact record
+
+        Raises:
+            ValueError: As for Character()
+        """
+        stats = character["stats"]
+        scores = []
+        bonuses = []
+        for stat in ABILITY_SCORES:
+            entry = stats[stat]
+            if isinstance(entry, dict):
+                scores.append(entry["score"])
+                bonuses.append(entry.get("racial bonus", 0))
+            else:
+                scores.append(entry)
+                bonuses.append(0)
+        return cls(character.get("name"), character.get("class"), character.get("race"), scores, bonuses)
+
+    def to_dict(self):
+        """
+        Convert back to the create_character_from_gui() dict shape.
+
+        Returns:
+            dict: Complete character data structure
+        """
+        stats = {
+            stat: {"score": score, "racial bonus": bonus, "modifier": modifier}
+            for stat, score, bonus, modifier in zip(ABILITY_SCORES, self._scores, self.racial_bonus, self.modifiers)
+        }
+        stats["health"] = self.health
+        stats["unarmored ac"] = self.unarmored_ac
+        return {"name": self.name, "class": self.character_class, "race": self.race, "stats": stats}
+
+    def __eq__(self, other):
+        if not isinstance(other, Character):
+            return NotImplemented
+        return (self.name, self._class_id, self._race_id, self._scores, self.racial_bonus) == \
+            (other.name, other._class_id, other._race_id, other._scores, other.racial_bonus)
+
+    __hash__ = None
+
+    def __repr__(self):
+        scores = ", ".join(f"{stat}={score}" for stat, score in zip(ABILITY_SCORES, self._scores))
+        return f"Character({self.name!r}, {self.character_class!r}, {self.race!r}, {scores})"
+
+
+def _score_property(position):
+    return property(lambda self: self._scores[position], doc=f"Final {ABILITY_SCORES[position]} score.")
+
+
+for _position, _stat in enumerate(ABILITY_SCORES):
+    setattr(Character, _stat, _score_property(_position))
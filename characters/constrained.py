@@ -0,0 +1,101 @@
+"""
+Constrained Character Generation
+
+Generates characters that meet minimum (or maximum) final ability scores
+without rejection sampling. Ability scores are rolled independently, so
+conditioning the whole character on per-stat bounds is the same as drawing
+each stat from its own conditional distribution: the exact 4d6 drop lowest
+distribution restricted, by inverse CDF, to the range that meets the bound
+once racial bonuses are added. Cost does not depend on how rare the
+constraint is; acceptance_probability() reports how many characters the
+create-and-discard loop would have needed.
+"""
+
+from fractions import Fraction
+
+from stats import ABILITY_SCORES
+from stats.rng import resolve
+from stats.roll_stat_dice import _conditional_table, _drop_lowest_table, roll_4d6_drop_lowest_between
+from stats.rules import bonus_vector
+from .batch import CharacterBatch
+
+
+def _base_ranges(bonuses, minimums, maximums, size):
+    # Final-score bounds become bounds on the roll before racial bonuses
+    minimums = minimums or {}
+    maximums = maximums or {}
+    for stat in set(minimums) | set(maximums):
+        if stat not in ABILITY_SCORES:
+            raise KeyError(stat)
+    return [
+        (minimums.get(stat, 3 + bonus) - bonus, maximums.get(stat, 3 * size + bonus) - bonus)
+        for stat, bonus in zip(ABILITY_SCORES, bonuses)
+    ]
+
+
+def acceptance_probability(character_race, racial_choice1=None, racial_choice2=None, minimums=None,
+                           maximums=None, size=6):
+    """
+    Exact chance that a freshly rolled character meets the bounds.
+
+    Args:
+        character_race (str): Selected character race
+        racial_choice1 (str, optional): First choice racial stat bonus
+        racial_choice2 (str, optional): Second choice racial stat bonus
+        minimums (dict, optional): Lowest allowed final score per ability
+        maximums (dict, optional): Highest allowed final score per ability
+        size (int): Number of sides on each die
+
+    Returns:
+        Fraction: Probability that create_character_from_gui() would qualify
+    """
+    bonuses = bonus_vector(character_race, racial_choice1, racial_choice2)
+    outcomes = len(_drop_lowest_table(size))
+    probability = Fraction(1)
+    for low, high in _base_ranges(bonuses, minimums, maximums, size):
+        probability *= Fraction(len(_conditional_table(low, high, size)), outcomes)
+    return probability
+
+
+def generate_constrained(n, character_class, character_race, racial_choice1=None, racial_choice2=None,
+                         minimums=None, maximums=None, seed=None, name=None):
+    """
+    Generate characters whose final scores meet the given bounds.
+
+    The characters follow exactly the distribution that rolling and
+    discarding failures would produce.
+
+    Args:
+        n (int): Number of characters to generate
+        character_class (str): Selected character class
+        character_race (str): Selected character race
+        racial_choice1 (str, optional): First choice racial stat bonus
+        racial_choice2 (str, optional): Second choice racial stat bonus
+        minimums (dict, optional): Lowest allowed final score per ability,
+            e.g. {"strength": 15, "charisma": 14}
+        maximums (dict, optional): Highest allowed final score per ability
+        seed (int, optional): Seed for reproducible batches
+        name (str, optional): Name given to every character
+
+    Returns:
+        CharacterBatch: The characters, with an acceptance_probability
+        attribute giving the exact rejection-sampling acceptance rate avoided
+
+    Raises:
+        ValueError: If no character can meet the bounds
+        KeyError: For an unknown race or ability score
+    """
+    bonuses = bonus_vector(character_race, racial_choice1, racial_choice2)
+    rng = resolve(seed, n)
+    columns = []
+    ranges = _base_ranges(bonuses, minimums, maximums, 6)
+    for stat, bonus, (low, high) in zip(ABILITY_SCORES, bonuses, ranges):
+        try:
+            columns.append(roll_4d6_drop_lowest_between(n, low, high, seed=rng))
+        except ValueError:
+            raise ValueError(f"no {character_race} can have a final {stat} from {low + bonus} to {high + bonus}; "
+                             f"possible scores are {3 + bonus} to {18 + bonus}") from None
+    batch = CharacterBatch(columns, character_class, character_race, racial_choice1, racial_choice2, name=name)
+    batch.acceptance_probability = acceptance_probability(character_race, racial_choice1, racial_choice2,
+                                                          minimums, maximums)
+    return batch
@@ -0,0 +1,112 @@
+"""
+Parallel Character Generation
+
+Splits a large generate request into fixed-size chunks and rolls them on a
+process pool. Each chunk draws from its own seed, derived from one master
+seed and the chunk's position, and from a backend the parent picks and
+hands to every worker, so the result depends only on the master seed,
+chunk size and backend - never on how many workers ran it. Workers write their
+rolls straight into a shared memory block instead of pickling results back.
+"""
+
+import hashlib
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+from stats import ABILITY_SCORES
+from stats.rng import BACKENDS, seedable_backend
+from stats.roll_stat_dice import load_numpy, roll_4d6_drop_lowest_batch
+from .batch import CharacterBatch
+
+DEFAULT_CHUNK_SIZE = 250_000
+
+
+def chunk_seed(seed, index):
+    """
+    Derive an independent 64-bit seed for one chunk from the master seed.
+
+    Args:
+        seed (int): Master seed
+        index (int): Chunk position within the request
+
+    Returns:
+        int: Seed for that chunk's generator
+    """
+    digest = hashlib.blake2b(f"{seed}:{index}".encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def _roll_chunk(buffer, n, start, stop, seed, backend):
+    # Rolls for characters [start, stop) land in each stat-major column of buffer
+    count = stop - start
+    rolls = roll_4d6_drop_lowest_batch(len(ABILITY_SCORES) * count, seed=BACKENDS[backend](seed))
+    for i in range(len(ABILITY_SCORES)):
+        buffer[i * n + start:i * n + stop] = rolls[i * count:(i + 1) * count].tobytes()
+
+
+def _roll_chunk_shared(shm_name, n, start, stop, seed, backend):
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        _roll_chunk(shm.buf, n, start, stop, seed, backend)
+    finally:
+        shm.close()
+
+
+def _columns(buffer, n):
+    np = load_numpy()
+    if np is not None:
+        rolls = np.frombuffer(buffer, dtype=np.int8).copy()
+    else:
+        rolls = array('b', bytes(buffer))
+    return [rolls[i * n:(i + 1) * n] for i in range(len(ABILITY_SCORES))]
+
+
+def generate_characters_parallel(n, character_class, character_race, racial_choice1=None, racial_choice2=None,
+                                 seed=0, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Generate a character batch using a pool of worker processes.
+
+    Args:
+        n (int): Number of characters to generate
+        character_class (str): Selected character class
+        character_race (str): Selected character race
+        racial_choice1 (str, optional): First choice racial stat bonus
+        racial_choice2 (str, optional): Second choice racial stat bonus
+        seed (int): Master seed; the same seed, chunk_size and stats.rng
+            backend always give the same characters, whatever the worker
+            count (the "system" backend rolls like "auto" here)
+        workers (int, optional): Number of processes, defaults to the CPU count
+        chunk_size (int): Characters rolled per seeded chunk
+
+    Returns:
+        CharacterBatch: Struct-of-arrays character batch
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = [
+        (start, min(start + chunk_size, n), chunk_seed(seed, index))
+        for index, start in enumerate(range(0, n, chunk_size))
+    ]
+    size = len(ABILITY_SCORES) * n
+    backend = seedable_backend(len(ABILITY_SCORES) * min(chunk_size, n))
+
+    if workers == 1 or len(chunks) <= 1:
+        buffer = bytearray(size)
+        for start, stop, chunk in chunks:
+            _roll_chunk(memoryview(buffer), n, start, stop, chunk, backend)
+        columns = _columns(buffer, n)
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(_roll_chunk_shared, shm.name, n, start, stop, chunk, backend)
+                           for start, stop, chunk in chunks]
+                for future in futures:
+                    future.result()
+            columns = _columns(shm.buf[:size], n)
+        finally:
+            shm.close()
+            shm.unlink()
+
+    return CharacterBatch(columns, character_class, character_race, racial_choice1, racial_choice2)
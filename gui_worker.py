@@ -0,0 +1,163 @@
+"""
+GUI Background Worker
+
+Runs slow work such as character generation and JSON saves on a background
+thread so the Tk event loop never blocks on disk. Jobs submitted with the
+same key are coalesced: if a save for a file is still queued when another
+save for that file arrives, only the newest one is written. Results are
+handed back to the Tk main thread by a root.after polling loop, since Tk
+widgets must only be touched from the thread running mainloop.
+
+Closing the window goes through close(), which stops new jobs, lets the
+queued ones (typically saves) finish while the event loop keeps running,
+and only then destroys the window, waiting at most CLOSE_TIMEOUT seconds.
+"""
+
+import queue
+import threading
+import time
+import traceback
+
+POLL_MS = 20
+RESULTS_PER_POLL = 200
+CLOSE_TIMEOUT = 10.0
+
+
+class BackgroundWorker:
+    """
+    Single background thread with a keyed, coalescing work queue.
+    """
+
+    def __init__(self, root, poll_ms=POLL_MS):
+        """
+        Start the worker thread and the result polling loop.
+
+        Args:
+            root (tk.Tk): Window whose after() loop delivers results
+            poll_ms (int): Milliseconds between result polls
+        """
+        self.root = root
+        self.poll_ms = poll_ms
+        self._jobs = queue.Queue()
+        self._results = queue.Queue()
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._stopping = False
+        self._closing = None
+        self._thread = threading.Thread(target=self._run, name="gui-worker", daemon=True)
+        self._thread.start()
+        self.root.after(self.poll_ms, self._poll)
+
+    def submit(self, func, *args, callback=None, key=None):
+        """
+        Queue func(*args) to run on the worker thread.
+
+        Args:
+            func (callable): Work to run off the main thread
+            *args: Arguments for func
+            callback (callable, optional): Called on the main thread with
+                func's return value
+            key (hashable, optional): Jobs sharing a key are coalesced, so
+                only the most recently submitted one still queued runs
+
+        Jobs submitted after stop() or close() are ignored.
+        """
+        if self._stopping:
+            return
+        if key is None:
+            key = object()
+        with self._lock:
+            queued = key in self._pending
+            self._pending[key] = (func, args, callback)
+        if not queued:
+            self._jobs.put(key)
+
+    def post(self, callback, *args):
+        """
+        Schedule callback(*args) on the main thread from the worker thread.
+
+        Args:
+            callback (callable): Main-thread function, e.g. a widget update
+            *args: Arguments for callback
+        """
+        self._results.put((callback, args))
+
+    def _run(self):
+        while True:
+            key = self._jobs.get()
+            if key is None:
+                return
+            with self._lock:
+                job = self._pending.pop(key, None)
+            if job is None:
+                # Dropped by close()
+                continue
+            func, args, callback = job
+            try:
+                result = func(*args)
+            except Exception:
+                traceback.print_exc()
+                continue
+            if callback is not None:
+                self.post(callback, result)
+
+    def _poll(self):
+        # Deliver a bounded number of results per tick so the UI stays responsive
+        for _ in range(RESULTS_PER_POLL):
+            try:
+                callback, args = self._results.get_nowait()
+            except queue.Empty:
+                break
+            callback(*args)
+        if self._closing is not None:
+            on_closed, deadline, on_progress = self._closing
+            finished = not self._thread.is_alive() and self._results.empty()
+            if finished or time.monotonic() >= deadline:
+                self._closing = None
+                on_closed()
+                return
+            if on_progress is not None:
+                on_progress(len(self._pending))
+        elif self._stopping:
+            return
+        self.root.after(self.poll_ms, self._poll)
+
+    def close(self, on_closed, timeout=CLOSE_TIMEOUT, keep=None, on_progress=None):
+        """
+        Stop accepting jobs and finish the queued ones without blocking the main thread.
+
+        Results keep arriving through the polling loop, so the callbacks of
+        the jobs that finish still run. Calling close() again does nothing.
+
+        Args:
+            on_closed (callable): Called on the main thread once the worker
+                has finished or timeout seconds have passed, e.g. root.destroy
+            timeout (float): Most seconds to wait for queued jobs
+            keep (callable, optional): Called with each queued job's key;
+                jobs it rejects are dropped instead of run
+            on_progress (callable, optional): Called on the main thread each
+                poll with the number of jobs still queued
+        """
+        if self._stopping:
+            return
+        self._stopping = True
+        if keep is not None:
+            with self._lock:
+                for key in [key for key in self._pending if not keep(key)]:
+                    del self._pending[key]
+        self._closing = (on_closed, time.monotonic() + timeout, on_progress)
+        self._jobs.put(None)
+
+    def stop(self, timeout=None):
+        """
+        Finish every queued job, then stop the thread, blocking the caller.
+
+        Callbacks of jobs still running are not delivered; windows should
+        use close() instead.
+
+        Args:
+            timeout (float, optional): Seconds to wait for queued jobs
+        """
+        self._stopping = True
+        self._jobs.put(None)
+        self._thread.join(timeout)
@@ -15,18 +15,30 @@ from stats.wisdom import roll_wisdom, get_wisdom_modifier
 from stats.charisma import roll_charisma, get_charisma_modifier
 from stats.classes import CLASSES
 from stats.races import RACES
+from stats.replay import check_seed, new_seed, replay_scores
+from stats.roll_stat_dice import uses_default_dice
+from stats.rules import bonus_vector
+from stats import ABILITY_SCORES, metrics
+from characters.batch import generate_characters
+from storage.index import record_save
+from storage.loader import load_characters
 
-def save_character_to_json(character_data, filename):
+@metrics.timed(metrics.SAVE_SECONDS, metrics.SAVES)
+def save_character_to_json(character_data, filename, index=True):
     """
     Save character data to a JSON file.
     
     Args:
         character_data (dict): Complete character information dictionary
         filename (str): Name of the file to save to
+        index (bool): Also record the save in the directory's character index
     """
     with open(filename, 'w') as f:
         json.dump(character_data, f, indent=2)
+    if index:
+        record_save(filename, character_data)
 
+@metrics.timed(metrics.LOAD_SECONDS, metrics.LOADS)
 def load_character_from_json(filename):
     """
     Load character data from a JSON file.
@@ -71,98 +83,55 @@ def create_character():
         else:
             print("Invalid class, please try again.")
     
-    # Race selection with validation and racial bonuses
+    # Race selection with validation
     while True:
         print("Available races:", list(RACES.keys()))
         character_race = input("Choose your race: ")
         if character_race in RACES:
-            # Apply fixed racial bonuses to all stats
-            strength += RACES[character_race]["strength"]
-            dexterity += RACES[character_race]["dexterity"]
-            constitution += RACES[character_race]["constitution"]
-            intelligence += RACES[character_race]["intelligence"]
-            wisdom += RACES[character_race]["wisdom"]
-            charisma += RACES[character_race]["charisma"]
-            
-            # Handle customizable racial stat bonuses
-            racial_stat_bonus1 = None
-            racial_stat_bonus2 = None
-            
-            while True:
-                # Exit if race doesn't have choice bonuses
-                if "choice" not in RACES[character_race]:
-                    break
-                
-                # Handle first choice bonus
-                if "choice" in RACES[character_race] and racial_stat_bonus1 is None:
-                    available_stats = ["strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma"]
-                    print("Available Stats:", available_stats)
-                    racial_stat_bonus1 = input("Choose first bonus stat: ")
-                    if racial_stat_bonus1 in available_stats:
-                        # Apply the bonus to the selected stat
-                        if racial_stat_bonus1 == "strength":
-                            strength += RACES[character_race]["choice bonus"]
-                        elif racial_stat_bonus1 == "dexterity":
-                            dexterity += RACES[character_race]["choice bonus"]
-                        elif racial_stat_bonus1 == "constitution":
-                            constitution += RACES[character_race]["choice bonus"]
-                        elif racial_stat_bonus1 == "intelligence":
-                            intelligence += RACES[character_race]["choice bonus"]
-                        elif racial_stat_bonus1 == "wisdom":
-                            wisdom += RACES[character_race]["choice bonus"]
-                        elif racial_stat_bonus1 == "charisma":
-                            charisma += RACES[character_race]["choice bonus"]
-                    else:
-                        print("Invalid Stat, Please try again")
-                        racial_stat_bonus1 = None
-                
-                # Handle second choice bonus
-                if "choice" in RACES[character_race] and racial_stat_bonus1 is not None and racial_stat_bonus2 is None:
-                    available_stats = ["strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma"]
-                    # Remove first choice to prevent duplicates
-                    if racial_stat_bonus1 in available_stats:
-                        available_stats.remove(racial_stat_bonus1)
-                        print("Available Stats:", available_stats)
-                        racial_stat_bonus2 = input("Choose second bonus stat: ")
-                        if racial_stat_bonus2 in available_stats:
-                            # Apply the bonus to the selected stat and exit
-                            if racial_stat_bonus2 == "strength":
-                                strength += RACES[character_race]["choice bonus"]
-                                break
-                            elif racial_stat_bonus2 == "dexterity":
-                                dexterity += RACES[character_race]["choice bonus"]
-                                break
-                            elif racial_stat_bonus2 == "constitution":
-                                constitution += RACES[character_race]["choice bonus"]
-                                break
-                            elif racial_stat_bonus2 == "intelligence":
-                                intelligence += RACES[character_race]["choice bonus"]
-                                break
-                            elif racial_stat_bonus2 == "wisdom":
-                                wisdom += RACES[character_race]["choice bonus"]
-                                break
-                            elif racial_stat_bonus2 == "charisma":
-                                charisma += RACES[character_race]["choice bonus"]
-                                break
-                        else:
-                            print("Invalid Stat, Please try again")
-                            racial_stat_bonus2 = None
-            break   
+            break
         else:
             print("Invalid race, please try again.")
-    
+
+    # Handle customizable racial stat bonuses
+    racial_stat_bonus1 = None
+    racial_stat_bonus2 = None
+    if "choice" in RACES[character_race]:
+        available_stats = list(ABILITY_SCORES)
+        while racial_stat_bonus1 is None:
+            print("Available Stats:", available_stats)
+            racial_stat_bonus1 = input("Choose first bonus stat: ")
+            if racial_stat_bonus1 not in available_stats:
+                print("Invalid Stat, Please try again")
+                racial_stat_bonus1 = None
+
+        # Remove first choice to prevent duplicates
+        available_stats.remove(racial_stat_bonus1)
+        while racial_stat_bonus2 is None:
+            print("Available Stats:", available_stats)
+            racial_stat_bonus2 = input("Choose second bonus stat: ")
+            if racial_stat_bonus2 not in available_stats:
+                print("Invalid Stat, Please try again")
+                racial_stat_bonus2 = None
+
+    # Apply all racial bonuses, including choice bonuses, in one vector add
+    bonuses = bonus_vector(character_race, racial_stat_bonus1, racial_stat_bonus2)
+    strength, dexterity, constitution, intelligence, wisdom, charisma = (
+        score + bonus for score, bonus in zip((strength, dexterity, constitution, intelligence, wisdom, charisma), bonuses)
+    )
+    total_str_racial, total_dex_racial, total_con_racial, total_int_racial, total_wis_racial, total_cha_racial = bonuses
+
     # Create complete character data structure
     character = {
         "name": name,
         "class": character_class,
         "race": character_race,
         "stats": {
-            "strength": {"score": strength, "racial bonus": RACES[character_race]["strength"], "modifier": get_strength_modifier(strength)},
-            "dexterity": {"score": dexterity, "racial bonus": RACES[character_race]["dexterity"], "modifier": get_dexterity_modifier(dexterity)},
-            "constitution": {"score": constitution, "racial bonus": RACES[character_race]["constitution"], "modifier": get_constitution_modifier(constitution)},
-            "intelligence": {"score": intelligence, "racial bonus": RACES[character_race]["intelligence"], "modifier": get_intelligence_modifier(intelligence)},
-            "wisdom": {"score": wisdom, "racial bonus": RACES[character_race]["wisdom"], "modifier":  get_wisdom_modifier(wisdom)},
-            "charisma": {"score": charisma, "racial bonus": RACES[character_race]["charisma"], "modifier": get_charisma_modifier(charisma)},
+            "strength": {"score": strength, "racial bonus": total_str_racial, "modifier": get_strength_modifier(strength)},
+            "dexterity": {"score": dexterity, "racial bonus": total_dex_racial, "modifier": get_dexterity_modifier(dexterity)},
+            "constitution": {"score": constitution, "racial bonus": total_con_racial, "modifier": get_constitution_modifier(constitution)},
+            "intelligence": {"score": intelligence, "racial bonus": total_int_racial, "modifier": get_intelligence_modifier(intelligence)},
+            "wisdom": {"score": wisdom, "racial bonus": total_wis_racial, "modifier":  get_wisdom_modifier(wisdom)},
+            "charisma": {"score": charisma, "racial bonus": total_cha_racial, "modifier": get_charisma_modifier(charisma)},
             "health": calculate_health(character_class, get_constitution_modifier(constitution)),
             "unarmored ac": calculate_unarmored_ac(get_dexterity_modifier(dexterity)),
         }
@@ -170,13 +139,15 @@ def create_character():
     return character
 
 
-def create_character_from_gui(name, character_class, character_race, racial_choice1=None, racial_choice2=None):
+@metrics.timed(metrics.CHARACTER_SECONDS, metrics.CHARACTERS_CREATED)
+def create_character_from_gui(name, character_class, character_race, racial_choice1=None, racial_choice2=None,
+                              seed=None):
     """
     Create a D&D character from GUI-provided parameters.
     
     Similar to create_character() but takes all parameters directly instead of
-    prompting for user input. Handles racial choice bonuses more streamlining
-    by tracking total racial bonuses separately.
+    prompting for user input. Racial bonuses, including choice bonuses, come
+    from the precomputed bonus vector for the race and choices.
     
     Args:
         name (str): Character name
@@ -184,75 +155,43 @@ def create_character_from_gui(name, character_class, character_race, racial_choi
         character_race (str): Selected character race
         racial_choice1 (str, optional): First choice racial stat bonus
         racial_choice2 (str, optional): Second choice racial stat bonus
+        seed (int | True, optional): Replay mode. A 64-bit seed (or True for
+            a fresh one) rolls the scores with stats.replay and is recorded
+            under "seed", so the character can be regenerated from its recipe.
+            Replay scores are always 4d6 drop lowest, so seeds are refused
+            while set_stat_expression() selects other dice.
         
     Returns:
         dict: Complete character data structure
+
+    Raises:
+        ValueError: If the seed is not an integer from 0 to 2 ** 64 - 1, or
+            is given while non-default stat dice are configured
     """
-    # Roll base ability scores (3d6 for each)
-    strength = roll_strength()
-    dexterity = roll_dexterity()
-    constitution = roll_constitution()
-    intelligence = roll_intelligence()
-    wisdom = roll_wisdom()
-    charisma = roll_charisma()
+    if seed is not None and seed is not True:
+        check_seed(seed)
+    if seed is not None and not uses_default_dice():
+        raise ValueError("replay mode always rolls 4d6 drop lowest; reset set_stat_expression() to use seeds")
+    if seed is True:
+        seed = new_seed()
+    if seed is not None:
+        strength, dexterity, constitution, intelligence, wisdom, charisma = replay_scores(seed)
+    else:
+        # Roll base ability scores (3d6 for each)
+        strength = roll_strength()
+        dexterity = roll_dexterity()
+        constitution = roll_constitution()
+        intelligence = roll_intelligence()
+        wisdom = roll_wisdom()
+        charisma = roll_charisma()
 
-    # Apply base racial bonuses to all stats
-    strength += RACES[character_race]["strength"]
-    dexterity += RACES[character_race]["dexterity"]
-    constitution += RACES[character_race]["constitution"]
-    intelligence += RACES[character_race]["intelligence"]
-    wisdom += RACES[character_race]["wisdom"]
-    charisma += RACES[character_race]["charisma"]
-    
-    # Track total racial bonuses including choice bonuses for display
-    total_str_racial = RACES[character_race]["strength"]
-    total_dex_racial = RACES[character_race]["dexterity"]
-    total_con_racial = RACES[character_race]["constitution"]
-    total_int_racial = RACES[character_race]["intelligence"]
-    total_wis_racial = RACES[character_race]["wisdom"]
-    total_cha_racial = RACES[character_race]["charisma"]
-    
-    # Apply first choice bonus if provided and race supports choices
-    if racial_choice1 and "choice" in RACES[character_race]:
-        if racial_choice1 == "strength":
-            strength += RACES[character_race]["choice bonus"]
-            total_str_racial += RACES[character_race]["choice bonus"]
-        elif racial_choice1 == "dexterity":
-            dexterity += RACES[character_race]["choice bonus"]
-            total_dex_racial += RACES[character_race]["choice bonus"]
-        elif racial_choice1 == "constitution":
-            constitution += RACES[character_race]["choice bonus"]
-            total_con_racial += RACES[character_race]["choice bonus"]
-        elif racial_choice1 == "intelligence":
-            intelligence += RACES[character_race]["choice bonus"]
-            total_int_racial += RACES[character_race]["choice bonus"]
-        elif racial_choice1 == "wisdom":
-            wisdom += RACES[character_race]["choice bonus"]
-            total_wis_racial += RACES[character_race]["choice bonus"]
-        elif racial_choice1 == "charisma":
-            charisma += RACES[character_race]["choice bonus"]
-            total_cha_racial += RACES[character_race]["choice bonus"]
-    
-    # Apply second choice bonus if provided and race supports choices
-    if racial_choice2 and "choice" in RACES[character_race]:
-        if racial_choice2 == "strength":
-            strength += RACES[character_race]["choice bonus"]
-            total_str_racial += RACES[character_race]["choice bonus"]
-        elif racial_choice2 == "dexterity":
-            dexterity += RACES[character_race]["choice bonus"]
-            total_dex_racial += RACES[character_race]["choice bonus"]
-        elif racial_choice2 == "constitution":
-            constitution += RACES[character_race]["choice bonus"]
-            total_con_racial += RACES[character_race]["choice bonus"]
-        elif racial_choice2 == "intelligence":
-            intelligence += RACES[character_race]["choice bonus"]
-            total_int_racial += RACES[character_race]["choice bonus"]
-        elif racial_choice2 == "wisdom":
-            wisdom += RACES[character_race]["choice bonus"]
-            total_wis_racial += RACES[character_race]["choice bonus"]
-        elif racial_choice2 == "charisma":
-            charisma += RACES[character_race]["choice bonus"]
-            total_cha_racial += RACES[character_race]["choice bonus"]
+    # Apply base and choice racial bonuses in one vector add; the vector
+    # doubles as the total racial bonus per stat for display
+    bonuses = bonus_vector(character_race, racial_choice1, racial_choice2)
+    strength, dexterity, constitution, intelligence, wisdom, charisma = (
+        score + bonus for score, bonus in zip((strength, dexterity, constitution, intelligence, wisdom, charisma), bonuses)
+    )
+    total_str_racial, total_dex_racial, total_con_racial, total_int_racial, total_wis_racial, total_cha_racial = bonuses
 
     # Create complete character data structure with total racial bonuses
     character = {
@@ -270,6 +209,8 @@ def create_character_from_gui(name, character_class, character_race, racial_choi
             "unarmored ac": calculate_unarmored_ac(get_dexterity_modifier(dexterity)),
         }
     }
+    if seed is not None:
+        character["seed"] = seed
     return character
 
 # Main execution block - runs only when script is executed directly
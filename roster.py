@@ -0,0 +1,306 @@
+"""
+Roster Browser Model
+
+Tk-free half of the GUI's roster browser. A roster is any sequence of
+characters with len() and indexing: a list, a binary CharacterStore, a
+compressed CharacterArchive or a replay RecipeStore. The model only reads
+the rows that are on screen, a page at a time, and keeps recent pages in an
+LRU cache, so a million-character roster costs no more to show than a
+hundred.
+
+Sorting and filtering work on small integer key columns (class and race
+ids, scores, HP and AC) built in one pass over the roster. Every key has a
+few dozen distinct values, so sorting is a stable counting sort and
+filtering a set lookup per row, both linear and done in chunks that can be
+abandoned as soon as a newer request arrives. The GUI runs them on its
+background worker, so the event loop never waits on them.
+"""
+
+from array import array
+from collections import OrderedDict
+from itertools import compress, islice
+from operator import add
+
+from stats import ABILITY_SCORES
+
+PAGE_SIZE = 100
+CACHED_PAGES = 64
+CHUNK = 50_000
+COLUMNS = ("name", "class", "race") + ABILITY_SCORES + ("health", "unarmored ac")
+# Columns that can be sorted and filtered on
+KEY_FIELDS = COLUMNS[1:]
+LABEL_FIELDS = ("class", "race")
+
+
+def open_roster(path):
+    """
+    Open a roster file of any supported format, detected by its magic bytes.
+
+    Args:
+        path (str): A binary store, character archive or recipe store
+
+    Returns:
+        CharacterStore | CharacterArchive | RecipeStore: Open roster
+
+    Raises:
+        ValueError: If the file is not a supported roster
+    """
+    from storage import archive, binary, replay
+
+    with open(path, 'rb') as f:
+        magic = f.read(4)
+    formats = {binary.MAGIC: binary.CharacterStore, archive.MAGIC: archive.CharacterArchive,
+               replay.MAGIC: replay.RecipeStore}
+    if magic not in formats:
+        raise ValueError(f"{path} is not a character store, archive or recipe store")
+    return formats[magic](path)
+
+
+def character_row(character):
+    """
+    Display values of one character, ordered like COLUMNS.
+
+    Args:
+        character (dict): Character data dictionary
+
+    Returns:
+        tuple: Name, class, race, six scores, HP and unarmored AC
+    """
+    stats = character["stats"]
+    return ((character["name"], character["class"], character["race"])
+            + tuple(stats[stat]["score"] for stat in ABILITY_SCORES)
+            + (stats["health"], stats["unarmored ac"]))
+
+
+class RosterModel:
+    """
+    Paged, sortable and filterable view over a roster.
+
+    The view is the list of roster indices currently shown, in display
+    order. load_page(), key_columns() and compute_view() only read the
+    roster and may run on a worker thread; store_page() and set_view()
+    change what is displayed and belong on the main thread.
+    """
+
+    def __init__(self, source, page_size=PAGE_SIZE, cached_pages=CACHED_PAGES):
+        """
+        Args:
+            source (sequence): Roster supporting len(), indexing and iteration
+            page_size (int): Rows read per page
+            cached_pages (int): Pages kept in memory
+        """
+        self.source = source
+        self.page_size = page_size
+        self.cached_pages = cached_pages
+        # (generation, view); a view of None shows the roster in file order
+        self._state = (0, None)
+        self._pages = OrderedDict()
+        self._keys = None
+        self.labels = {}
+
+    @property
+    def generation(self):
+        """Number of views set so far; stale pages carry an older one."""
+        return self._state[0]
+
+    def __len__(self):
+        view = self._state[1]
+        return len(self.source) if view is None else len(view)
+
+    def index(self, position):
+        """Roster index of the row at a display position."""
+        view = self._state[1]
+        return position if view is None else view[position]
+
+    def row(self, position):
+        """
+        Display values at a position, if its page is loaded.
+
+        Returns:
+            tuple | None: Values ordered like COLUMNS, or None until load_page() has run
+        """
+        rows = self._pages.get(position // self.page_size)
+        if rows is None:
+            return None
+        self._pages.move_to_end(position // self.page_size)
+        return rows[position % self.page_size]
+
+    def missing_pages(self, first, last):
+        """
+        Pages needed to show positions first to last - 1 that are not cached.
+
+        Returns:
+            list: Page numbers
+        """
+        last = min(last, len(self))
+        if last <= first:
+            return []
+        pages = range(first // self.page_size, (last - 1) // self.page_size + 1)
+        return [page for page in pages if page not in self._pages]
+
+    def load_page(self, page):
+        """
+        Read one page of rows from the roster; safe on a worker thread.
+
+        Returns:
+            tuple: (generation, page, rows) for store_page()
+        """
+        generation, view = self._state
+        start = page * self.page_size
+        stop = min(start + self.page_size, len(self.source) if view is None else len(view))
+        indices = range(start, stop) if view is None else view[start:stop]
+        source = self.source
+        return generation, page, [character_row(source[index]) for index in indices]
+
+    def store_page(self, loaded):
+        """
+        Cache a page returned by load_page(), unless the view changed since.
+
+        Returns:
+            bool: Whether the page was stored
+        """
+        generation, page, rows = loaded
+        if generation != self.generation:
+            return False
+        self._pages[page] = rows
+        self._pages.move_to_end(page)
+        while len(self._pages) > self.cached_pages:
+            self._pages.popitem(last=False)
+        return True
+
+    def set_view(self, view):
+        """
+        Show a view from compute_view() and drop every cached page.
+
+        Args:
+            view (array | None): Roster indices in display order; None for file order
+        """
+        self._state = (self.generation + 1, view)
+        self._pages.clear()
+
+    def key_columns(self, cancelled=None):
+        """
+        Sort and filter keys for every roster row, built once in one pass.
+
+        Class and race are stored as ids into self.labels[field].
+
+        Args:
+            cancelled (callable, optional): Checked between chunks; returning
+                True abandons the pass
+
+        Returns:
+            dict | None: KEY_FIELDS mapped to integer array columns, or None if cancelled
+        """
+        if self._keys is not None:
+            return self._keys
+        if hasattr(self.source, "class_ids"):
+            self._keys = self._store_keys()
+            return self._keys
+        keys = {field: array('h') for field in KEY_FIELDS}
+        ids = {field: {} for field in LABEL_FIELDS}
+        rows = iter(self.source)
+        while True:
+            if cancelled is not None and cancelled():
+                return None
+            chunk = [character_row(character) for character in islice(rows, CHUNK)]
+            if not chunk:
+                break
+            for position, field in enumerate(KEY_FIELDS, start=1):
+                if field in ids:
+                    known = ids[field]
+                    keys[field].extend(known.setdefault(row[position], len(known)) for row in chunk)
+                else:
+                    keys[field].extend(row[position] for row in chunk)
+        self.labels = {field: list(ids[field]) for field in LABEL_FIELDS}
+        self._keys = keys
+        return keys
+
+    def _store_keys(self):
+        # Binary stores expose every column as a strided view, so the keys
+        # are built column by column without touching individual records
+        from stats.rules import HIT_DICE
+
+        source = self.source
+        self.labels = {"class": list(source.classes), "race": list(source.races)}
+        keys = {stat: array('b', source.scores(stat).tobytes()) for stat in ABILITY_SCORES}
+        keys["class"] = array('B', source.class_ids().tobytes())
+        keys["race"] = array('B', source.race_ids().tobytes())
+        hit_dice = [HIT_DICE[name] for name in source.classes]
+        modifiers = {score: (score - 10) // 2 for score in range(-128, 128)}
+        keys["health"] = array('h', map(add, map(hit_dice.__getitem__, keys["class"]),
+                                        map(modifiers.__getitem__, keys["constitution"])))
+        keys["unarmored ac"] = array('h', (10 + modifier for modifier in map(modifiers.__getitem__, keys["dexterity"])))
+        return keys
+
+    def _allowed(self, field, condition):
+        # Key values a filter condition accepts
+        if field in LABEL_FIELDS:
+            names = {condition} if isinstance(condition, str) else set(condition)
+            return {number for number, name in enumerate(self.labels[field]) if name in names}
+        if isinstance(condition, int):
+            return {condition}
+        low, high = condition
+        return set(range(low, high + 1))
+
+    def compute_view(self, filters=None, sort=None, descending=False, cancelled=None):
+        """
+        Roster indices matching every filter, ordered by one key.
+
+        Safe on a worker thread; pass the result to set_view().
+
+        Args:
+            filters (dict, optional): Field mapped to the accepted value: a
+                name or set of names for class and race, a score or an
+                inclusive (low, high) range for the rest
+            sort (str, optional): Field to sort on, class and race by name;
+                ties keep roster order
+            descending (bool): Sort from the largest key down
+            cancelled (callable, optional): Checked between chunks
+
+        Returns:
+            array | None: array('I') of roster indices, or None if cancelled
+
+        Raises:
+            KeyError: For a field not in KEY_FIELDS
+        """
+        keys = self.key_columns(cancelled)
+        if keys is None:
+            return None
+        tests = [(keys[field], self._allowed(field, condition)) for field, condition in (filters or {}).items()]
+        count = len(self.source)
+        view = array('I')
+        for start in range(0, count, CHUNK):
+            if cancelled is not None and cancelled():
+                return None
+            stop = min(start + CHUNK, count)
+            if not tests:
+                view.extend(range(start, stop))
+                continue
+            masks = [map(allowed.__contains__, column[start:stop]) for column, allowed in tests]
+            mask = masks[0] if len(masks) == 1 else map(all, zip(*masks))
+            view.extend(compress(range(start, stop), mask))
+        if sort is None:
+            return view
+        return self._counting_sort(view, keys[sort], sort, descending, cancelled)
+
+    def _counting_sort(self, view, column, field, descending, cancelled):
+        # Stable bucket pass: keys have a few dozen distinct values at most
+        if field in LABEL_FIELDS:
+            names = self.labels[field]
+            rank = {number: position for position, number in enumerate(sorted(range(len(names)), key=names.__getitem__))}
+        else:
+            rank = None
+        buckets = {}
+        for start in range(0, len(view), CHUNK):
+            if cancelled is not None and cancelled():
+                return None
+            for index in view[start:start + CHUNK]:
+                key = column[index]
+                bucket = buckets.get(key)
+                if bucket is None:
+                    bucket = buckets[key] = array('I')
+                bucket.append(index)
+        ordered = array('I')
+        for key in sorted(buckets, key=rank.__getitem__ if rank else None, reverse=descending):
+            ordered.extend(buckets[key])
+        return ordered
@@ -0,0 +1,237 @@
+"""
+Roster Browser Window
+
+A Toplevel window for reviewing very large rosters. The ttk.Treeview holds
+only one item per visible row; scrolling rewrites those items from the
+RosterModel's page cache instead of inserting a row per character, so the
+widget costs the same for a hundred characters as for a million. Pages
+missing from the cache, sorting (click a column heading) and filtering all
+run on the background worker, and their results are applied on the main
+thread when they arrive.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+
+from roster import COLUMNS, KEY_FIELDS, LABEL_FIELDS, RosterModel
+from stats.classes import CLASSES
+from stats.races import RACES
+
+VISIBLE_ROWS = 25
+PLACEHOLDER = "..."
+HEADINGS = {"health": "HP", "unarmored ac": "AC"}
+
+
+class RosterBrowser(tk.Toplevel):
+    """
+    Virtual-scrolling roster window.
+    """
+
+    def __init__(self, master, source, worker, on_open=None, visible_rows=VISIBLE_ROWS, title="Roster"):
+        """
+        Args:
+            master (tk.Misc): Parent window
+            source (sequence): Roster, e.g. from roster.open_roster()
+            worker (BackgroundWorker): Thread that reads the roster
+            on_open (callable, optional): Called with a character dict when a row is double-clicked
+            visible_rows (int): Rows shown at once
+            title (str): Window title
+        """
+        super().__init__(master)
+        self.title(title)
+        self.model = RosterModel(source)
+        self.worker = worker
+        self.on_open = on_open
+        self.visible_rows = visible_rows
+        self.top = 0
+        self.sort = None
+        self.descending = False
+        self.filters = {}
+        # Latest sort/filter request; older results are discarded
+        self.request = 0
+        self.busy = False
+        self._requested_pages = set()
+
+        controls = tk.Frame(self)
+        controls.pack(fill="x")
+        self.class_filter = self._filter_box(controls, "Class:", [""] + list(CLASSES))
+        self.race_filter = self._filter_box(controls, "Race:", [""] + list(RACES))
+        self.stat_filter = self._filter_box(controls, "Stat:", [""] + list(KEY_FIELDS[2:]))
+        tk.Label(controls, text="Min:").pack(side="left")
+        self.minimum = tk.Entry(controls, width=4)
+        self.minimum.pack(side="left")
+        tk.Label(controls, text="Max:").pack(side="left")
+        self.maximum = tk.Entry(controls, width=4)
+        self.maximum.pack(side="left")
+        tk.Button(controls, text="Filter", command=self.apply_filters).pack(side="left")
+        tk.Button(controls, text="Clear", command=self.clear_filters).pack(side="left")
+
+        body = tk.Frame(self)
+        body.pack(fill="both", expand=True)
+        self.tree = ttk.Treeview(body, columns=COLUMNS, show="headings", height=visible_rows, selectmode="browse")
+        for field in COLUMNS:
+            heading = HEADINGS.get(field, field[:3].upper() if field not in ("name", "class", "race") else field.capitalize())
+            if field in KEY_FIELDS:
+                self.tree.heading(field, text=heading, command=lambda field=field: self.sort_by(field))
+            else:
+                self.tree.heading(field, text=heading)
+            self.tree.column(field, width=140 if field == "name" else 110 if field in LABEL_FIELDS else 45,
+                             anchor="w" if field in ("name",) + LABEL_FIELDS else "e")
+        for slot in range(visible_rows):
+            self.tree.insert("", tk.END, iid=str(slot))
+        self.scrollbar = ttk.Scrollbar(body, orient="vertical", command=self.on_scrollbar)
+        self.tree.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
+        self.status = tk.Label(self, anchor="w")
+        self.status.pack(fill="x")
+
+        self.tree.bind("<MouseWheel>", lambda event: self.scroll_to(self.top - event.delta // 40))
+        self.tree.bind("<Button-4>", lambda event: self.scroll_to(self.top - 3))
+        self.tree.bind("<Button-5>", lambda event: self.scroll_to(self.top + 3))
+        self.tree.bind("<Prior>", lambda event: self.scroll_to(self.top - visible_rows))
+        self.tree.bind("<Next>", lambda event: self.scroll_to(self.top + visible_rows))
+        self.tree.bind("<Home>", lambda event: self.scroll_to(0))
+        self.tree.bind("<End>", lambda event: self.scroll_to(len(self.model)))
+        self.tree.bind("<Double-1>", self.on_double_click)
+        self.protocol("WM_DELETE_WINDOW", self.close)
+        self.render()
+
+    @staticmethod
+    def _filter_box(parent, text, values):
+        tk.Label(parent, text=text).pack(side="left")
+        box = ttk.Combobox(parent, values=values, width=14, state="readonly")
+        box.pack(side="left")
+        return box
+
+    def scroll_to(self, top):
+        """
+        Show the rows starting at a display position.
+
+        Args:
+            top (int): Position of the first visible row, clamped to the roster
+        """
+        self.top = max(0, min(top, len(self.model) - self.visible_rows))
+        self.render()
+        return "break"
+
+    def on_scrollbar(self, action, amount, unit=None):
+        """Scrollbar command: "moveto" a fraction or "scroll" by units or pages."""
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.model)))
+        elif unit == "pages":
+            self.scroll_to(self.top + int(amount) * self.visible_rows)
+        else:
+            self.scroll_to(self.top + int(amount))
+
+    def render(self):
+        """Redraw the visible rows from the page cache and fetch any missing pages."""
+        model = self.model
+        total = len(model)
+        for slot in range(self.visible_rows):
+            position = self.top + slot
+            if position >= total:
+                values = ()
+            else:
+                values = model.row(position) or (PLACEHOLDER,)
+            self.tree.item(str(slot), values=values)
+        if total:
+            self.scrollbar.set(self.top / total, min(1.0, (self.top + self.visible_rows) / total))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+        # Fetch the visible pages plus one page either side, so scrolling
+        # a little never shows placeholders
+        margin = model.page_size
+        for page in model.missing_pages(max(0, self.top - margin), self.top + self.visible_rows + margin):
+            key = (model.generation, page)
+            if key not in self._requested_pages:
+                self._requested_pages.add(key)
+                self.worker.submit(model.load_page, page, callback=self._page_loaded, key=("roster page", id(self), page))
+        if not self.busy:
+            self._show_count()
+
+    def _page_loaded(self, loaded):
+        self._requested_pages.discard(loaded[:2])
+        if self.winfo_exists() and self.model.store_page(loaded):
+            self.render()
+
+    def _show_count(self):
+        shown, total = len(self.model), len(self.model.source)
+        text = f"{shown:,} characters" if shown == total else f"{shown:,} of {total:,} characters"
+        if self.sort is not None:
+            text += f", sorted by {self.sort}{' (descending)' if self.descending else ''}"
+        self.status.config(text=text)
+
+    def sort_by(self, field):
+        """Sort on a column; clicking the same column again reverses the order."""
+        self.descending = not self.descending if self.sort == field else field not in LABEL_FIELDS
+        self.sort = field
+        self.refresh("Sorting")
+
+    def apply_filters(self):
+        """Filter on the selected class, race and stat range."""
+        filters = {}
+        if self.class_filter.get():
+            filters["class"] = self.class_filter.get()
+        if self.race_filter.get():
+            filters["race"] = self.race_filter.get()
+        stat = self.stat_filter.get()
+        if stat:
+            try:
+                low = int(self.minimum.get() or -128)
+                high = int(self.maximum.get() or 127)
+            except ValueError:
+                self.status.config(text="Min and Max must be whole numbers")
+                return
+            filters[stat] = (low, high)
+        self.filters = filters
+        self.refresh("Filtering")
+
+    def clear_filters(self):
+        """Drop every filter, keeping the sort."""
+        for box in (self.class_filter, self.race_filter, self.stat_filter):
+            box.set("")
+        self.minimum.delete(0, tk.END)
+        self.maximum.delete(0, tk.END)
+        self.filters = {}
+        self.refresh("Filtering")
+
+    def refresh(self, activity):
+        """
+        Recompute the view on the worker with the current sort and filters.
+
+        Args:
+            activity (str): Shown in the status line until the view arrives
+        """
+        self.request += 1
+        request = self.request
+        self.busy = True
+        self.status.config(text=f"{activity} {len(self.model.source):,} characters...")
+        self.worker.submit(self.model.compute_view, self.filters, self.sort, self.descending,
+                           lambda: request != self.request,
+                           callback=lambda view: self._view_ready(request, view), key=("roster view", id(self)))
+
+    def _view_ready(self, request, view):
+        if request != self.request or view is None or not self.winfo_exists():
+            return
+        self.busy = False
+        self.model.set_view(view)
+        self.top = 0
+        self._requested_pages.clear()
+        self.render()
+
+    def on_double_click(self, event):
+        """Open the double-clicked character with on_open, reading it on the worker."""
+        slot = self.tree.identify_row(event.y)
+        if not slot or self.on_open is None:
+            return
+        position = self.top + int(slot)
+        if position < len(self.model):
+            self.worker.submit(self.model.source.__getitem__, self.model.index(position), callback=self.on_open)
+
+    def close(self):
+        """Close the window and, once queued reads finish, the roster file."""
+        self.request += 1
+        close = getattr(self.model.source, "close", None)
+        if close is not None:
+            self.worker.submit(close)
+        self.destroy()
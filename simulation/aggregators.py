@@ -0,0 +1,250 @@
+"""
+Mergeable Streaming Aggregators
+
+Each aggregator summarizes one field of a stream of simulated chunks in
+constant memory. update() folds in one chunk's column, and merge() folds in
+another aggregator of the same kind, so chunks can be summarized
+independently (in other processes) and combined in any order at the end.
+
+A field is a column name ("strength" ... "charisma", "health",
+"unarmored ac"), a derived column ("total", "modifier sum", "max", "min"),
+or a function called with each character's six scores in ABILITY_SCORES
+order. Aggregators cross process boundaries by pickling, so functions used
+with parallel workers must be defined at module level.
+"""
+
+import math
+import random
+from collections import Counter
+from operator import add
+
+from stats import ABILITY_SCORES
+
+DERIVED_FIELDS = ("total", "modifier sum", "max", "min")
+
+
+def _modifier(score):
+    return (score - 10) // 2
+
+
+def field_values(chunk, field):
+    """
+    One value per character for field.
+
+    Args:
+        chunk (dict): Column name -> column for one simulated chunk
+        field (str | callable): Field to extract
+
+    Returns:
+        sequence: Values in character order
+    """
+    if callable(field):
+        return list(map(field, zip(*(chunk[stat] for stat in ABILITY_SCORES))))
+    if field in chunk:
+        return chunk[field]
+    columns = [chunk[stat] for stat in ABILITY_SCORES]
+    if field == "total":
+        values = list(columns[0])
+        for column in columns[1:]:
+            values = list(map(add, values, column))
+        return values
+    if field == "modifier sum":
+        return [sum(map(_modifier, scores)) for scores in zip(*columns)]
+    if field == "max":
+        return list(map(max, *columns))
+    if field == "min":
+        return list(map(min, *columns))
+    raise KeyError(field)
+
+
+class Aggregator:
+    """Base class: a field plus update/merge/result."""
+
+    def __init__(self, field):
+        self.field = field
+        self.count = 0
+
+    def update(self, chunk):
+        """Fold one chunk's values for this field into the summary."""
+        self.add(field_values(chunk, self.field))
+
+    def add(self, values):
+        raise NotImplementedError
+
+    def reseed(self, seed):
+        """Reseed any internal randomness; the engine calls it once per chunk."""
+
+    def merge(self, other):
+        raise NotImplementedError
+
+    def result(self):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.field!r}, count={self.count})"
+
+
+class Moments(Aggregator):
+    """Count, mean and variance, merged with Chan's parallel formula."""
+
+    def __init__(self, field):
+        super().__init__(field)
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def add(self, values):
+        count = len(values)
+        if not count:
+            return
+        # Two passes over the chunk, which is already in memory, then one merge
+        mean = math.fsum(values) / count
+        m2 = math.fsum((value - mean) ** 2 for value in values)
+        self._combine(count, mean, m2)
+
+    def _combine(self, count, mean, m2):
+        total = self.count + count
+        delta = mean - self.mean
+        self.mean += delta * count / total
+        self.m2 += m2 + delta * delta * self.count * count / total
+        self.count = total
+
+    def merge(self, other):
+        if other.count:
+            self._combine(other.count, other.mean, other.m2)
+        return self
+
+    @property
+    def variance(self):
+        """Sample variance; 0.0 for fewer than two values."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def result(self):
+        return {"count": self.count, "mean": self.mean, "variance": self.variance,
+                "stdev": math.sqrt(self.variance)}
+
+
+class Histogram(Aggregator):
+    """Exact count of every distinct value; memory grows with the value range, not the stream."""
+
+    def __init__(self, field):
+        super().__init__(field)
+        self.counts = Counter()
+
+    def add(self, values):
+        self.counts.update(values.tolist() if hasattr(values, "tolist") else values)
+        self.count += len(values)
+
+    def merge(self, other):
+        self.counts.update(other.counts)
+        self.count += other.count
+        return self
+
+    def quantile(self, q):
+        """Exact q-quantile (lowest value whose cumulative share reaches q)."""
+        target = q * self.count
+        seen = 0
+        for value in sorted(self.counts):
+            seen += self.counts[value]
+            if seen >= target:
+                return value
+        raise ValueError("empty histogram")
+
+    def result(self):
+        return {value: self.counts[value] / self.count for value in sorted(self.counts)}
+
+
+class QuantileSketch(Aggregator):
+    """
+    Approximate quantiles of an unbounded stream (a KLL sketch).
+
+    Keeps a stack of sorted compactors; when one fills, every other item is
+    promoted to the next level with double weight. Memory is O(k log(n / k))
+    and rank error is roughly 1.7 / k.
+    """
+
+    def __init__(self, field, k=200, seed=0):
+        super().__init__(field)
+        self.k = k
+        self.levels = [[]]
+        self.seed = seed
+        self._random = random.Random(seed)
+
+    def reseed(self, seed):
+        # Copies of one sketch must not share coin flips across chunks
+        self._random.seed(f"{self.seed}:{seed}")
+
+    def _capacity(self, level):
+        depth = len(self.levels) - level - 1
+        return max(2, int(self.k * (2 / 3) ** depth))
+
+    def _compress(self):
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append([])
+                items.sort()
+                # Odd leftovers stay behind so total weight is preserved
+                keep = [items.pop()] if len(items) % 2 else []
+                self.levels[level + 1].extend(items[self._random.getrandbits(1)::2])
+                self.levels[level] = keep
+            level += 1
+
+    def add(self, values):
+        self.levels[0].extend(values.tolist() if hasattr(values, "tolist") else values)
+        self.count += len(values)
+        self._compress()
+
+    def merge(self, other):
+        for level, items in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append([])
+            self.levels[level].extend(items)
+        self.count += other.count
+        self._compress()
+        return self
+
+    def quantile(self, q):
+        """Approximate q-quantile."""
+        weighted = sorted((value, 1 << level) for level, items in enumerate(self.levels) for value in items)
+        if not weighted:
+            raise ValueError("empty sketch")
+        target = q * sum(weight for value, weight in weighted)
+        seen = 0
+        for value, weight in weighted:
+            seen += weight
+            if seen >= target:
+                return value
+        return weighted[-1][0]
+
+    def result(self):
+        return {q: self.quantile(q) for q in (0.01, 0.05, 0.25, 0.5, 0.75, 0.95, 0.99)}
+
+
+class Predicate(Aggregator):
+    """
+    How often a condition holds.
+
+    Args:
+        test (callable): Called with each field value; truthy counts as a hit
+        field (str | callable): Defaults to max, so test sees the best score
+    """
+
+    def __init__(self, test, field="max", name=None):
+        super().__init__(field)
+        self.test = test
+        self.name = name or getattr(test, "__name__", "predicate")
+        self.hits = 0
+
+    def add(self, values):
+        self.hits += sum(map(bool, map(self.test, values)))
+        self.count += len(values)
+
+    def merge(self, other):
+        self.hits += other.hits
+        self.count += other.count
+        return self
+
+    def result(self):
+        return {"hits": self.hits, "count": self.count, "probability": self.hits / self.count if self.count else 0.0}
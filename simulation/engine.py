@@ -0,0 +1,122 @@
+"""
+Streaming Monte Carlo Engine
+
+Simulates n characters (or bare ability-score arrays) in fixed-size chunks
+and streams each chunk through a set of aggregators, so memory is bounded
+by the chunk size however large n grows. Chunks are seeded from one master
+seed and their position, like characters.parallel, so results depend only
+on the seed and chunk size. With several workers each chunk is aggregated
+in its own process and only the small per-chunk summaries travel back to be
+merged.
+
+Usage:
+    from simulation.aggregators import Histogram, Moments, Predicate
+    from simulation.engine import simulate
+
+    def no_score_above_13(best):
+        return best <= 13
+
+    moments, odds = simulate(10**9, [Moments("total"), Predicate(no_score_above_13)], workers=8)
+"""
+
+import copy
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from characters.batch import generate_characters
+from characters.parallel import chunk_seed
+from stats import ABILITY_SCORES
+from stats.rng import BACKENDS, seedable_backend
+from stats.roll_stat_dice import roll_4d6_drop_lowest_batch
+
+DEFAULT_CHUNK_SIZE = 100_000
+
+
+def simulate_chunk(n, character_class=None, character_race=None, racial_choice1=None, racial_choice2=None,
+                   seed=None):
+    """
+    Roll one chunk as a dict of columns.
+
+    Without a race only the six base 4d6 drop lowest columns are produced;
+    with a class and race the chunk also has racial bonuses applied and
+    "health" and "unarmored ac" columns.
+
+    Returns:
+        dict: Column name -> column of n values
+    """
+    if character_race is None:
+        rolls = roll_4d6_drop_lowest_batch(len(ABILITY_SCORES) * n, seed=seed)
+        return {stat: rolls[i * n:(i + 1) * n] for i, stat in enumerate(ABILITY_SCORES)}
+    batch = generate_characters(n, character_class, character_race, racial_choice1, racial_choice2, seed=seed)
+    chunk = dict(batch.scores)
+    chunk["health"] = batch.health
+    chunk["unarmored ac"] = batch.unarmored_ac
+    return chunk
+
+
+def _aggregate_chunk(aggregators, n, options, seed, backend):
+    # Runs in a worker: aggregators arrive as fresh pickled copies, and the
+    # backend by name, since workers do not inherit set_backend()
+    chunk = simulate_chunk(n, seed=BACKENDS[backend](seed), **options)
+    for aggregator in aggregators:
+        aggregator.reseed(seed)
+        aggregator.update(chunk)
+    return aggregators
+
+
+def _merge(totals, partials):
+    for total, partial in zip(totals, partials):
+        total.merge(partial)
+
+
+def simulate(n, aggregators, character_class=None, character_race=None, racial_choice1=None,
+             racial_choice2=None, seed=0, workers=1, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Stream n simulated characters through aggregators.
+
+    Args:
+        n (int): Number of characters (or six-score arrays) to simulate
+        aggregators (list): Empty aggregators from simulation.aggregators;
+            they are left untouched and merged copies are returned
+        character_class (str, optional): Class, needed for "health"
+        character_race (str, optional): Race; None simulates bare rolls
+        racial_choice1 (str, optional): First choice racial stat bonus
+        racial_choice2 (str, optional): Second choice racial stat bonus
+        seed (int): Master seed
+        workers (int, optional): Processes; None uses the CPU count
+        chunk_size (int): Characters per chunk, which bounds memory
+
+    Returns:
+        list: Merged aggregators, in the order given
+
+    Raises:
+        ValueError: If a race is given without a class
+    """
+    if character_race is not None and character_class is None:
+        raise ValueError("simulating characters of a race needs a character_class for their hit points")
+    workers = workers or os.cpu_count() or 1
+    options = {"character_class": character_class, "character_race": character_race,
+               "racial_choice1": racial_choice1, "racial_choice2": racial_choice2}
+    totals = copy.deepcopy(aggregators)
+    backend = seedable_backend(len(ABILITY_SCORES) * min(chunk_size, n))
+    chunks = ((min(chunk_size, n - start), chunk_seed(seed, index))
+              for index, start in enumerate(range(0, n, chunk_size)))
+
+    if workers == 1 or n <= chunk_size:
+        for size, chunk in chunks:
+            _merge(totals, _aggregate_chunk(copy.deepcopy(aggregators), size, options, chunk, backend))
+        return totals
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # A bounded window of chunks in flight keeps memory flat for any n;
+        # merging in chunk order keeps order-sensitive merges (the quantile
+        # sketch's compaction) identical to the serial run
+        pending = deque()
+        for size, chunk in chunks:
+            if len(pending) >= 2 * workers:
+                _merge(totals, pending.popleft().result())
+            pending.append(pool.submit(_aggregate_chunk, aggregators, size, options, chunk, backend))
+        while pending:
+            _merge(totals, pending.popleft().result())
+    return totals
@@ -0,0 +1,37 @@
+"""
+Headless D&D Character Generator Core
+
+The generator without the GUI: importing this package loads nothing but
+this file. Rules tables, dice engines and storage are imported the first
+time one of the names below is used, which keeps the command line
+(python -m stat_calc) fast to start and safe on machines without a display.
+"""
+
+# Public name -> module that defines it, imported on first access
+_EXPORTS = {
+    "ABILITY_SCORES": "stats",
+    "CLASSES": "stats.classes",
+    "RACES": "stats.races",
+    "bonus_vector": "stats.rules",
+    "roll_4d6_drop_lowest": "stats.roll_stat_dice",
+    "roll_4d6_drop_lowest_batch": "stats.roll_stat_dice",
+    "CharacterBatch": "characters.batch",
+    "generate_characters": "characters.batch",
+    "Character": "characters.character",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
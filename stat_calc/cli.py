@@ -0,0 +1,186 @@
+"""
+Command Line Interface
+
+Usage:
+    python -m stat_calc generate --class Wizard --race "Half Elf" --choice1 intelligence --choice2 dexterity -n 10
+    python -m stat_calc optimize --class Wizard --race "Half Elf" --method point-buy -k 3
+    python -m stat_calc serve --port 8080 --data-dir saves/
+    python -m stat_calc classes
+    python -m stat_calc races
+
+Generated characters are written as JSON lines by default, one character
+per line, in the same shape as create_character_from_gui().
+"""
+
+import argparse
+import sys
+
+
+def _generate(args):
+    # Rules and the dice engine load here, not at startup
+    import json
+    from characters.batch import generate_characters
+    from stats import ABILITY_SCORES
+    from stats.classes import CLASSES
+    from stats.races import RACES
+    from stats.rng import load_numpy, set_backend
+    from stats.roll_stat_dice import DEFAULT_STAT_EXPRESSION, set_stat_expression
+
+    if args.character_class not in CLASSES:
+        return f"unknown class {args.character_class!r}; choose from {', '.join(CLASSES)}"
+    if args.race not in RACES:
+        return f"unknown race {args.race!r}; choose from {', '.join(RACES)}"
+    for choice in (args.choice1, args.choice2):
+        if choice is not None and choice not in ABILITY_SCORES:
+            return f"unknown ability score {choice!r}; choose from {', '.join(ABILITY_SCORES)}"
+
+    if args.rng == "system" and args.seed is not None:
+        return "the system RNG cannot be seeded"
+    if args.rng == "numpy" and load_numpy() is None:
+        return "the numpy RNG requires NumPy"
+    set_backend(args.rng)
+    try:
+        set_stat_expression(args.dice)
+    except ValueError as error:
+        return str(error)
+    minimums = {}
+    for bound in args.minimums or ():
+        stat, _, score = bound.partition("=")
+        if stat not in ABILITY_SCORES or not score.isdigit():
+            return f"--min expects STAT=SCORE with an ability score name, got {bound!r}"
+        minimums[stat] = int(score)
+    if minimums and args.dice != DEFAULT_STAT_EXPRESSION:
+        return f"--min only supports the default {DEFAULT_STAT_EXPRESSION} dice"
+    if minimums:
+        from characters.constrained import generate_constrained
+        try:
+            batch = generate_constrained(args.count, args.character_class, args.race, args.choice1, args.choice2,
+                                         minimums=minimums, seed=args.seed)
+        except ValueError as error:
+            return str(error)
+        print(f"acceptance probability {float(batch.acceptance_probability):.3g} "
+              f"(rejection sampling would roll ~{float(1 / batch.acceptance_probability):,.0f} characters per keeper)",
+              file=sys.stderr)
+    else:
+        batch = generate_characters(args.count, args.character_class, args.race, args.choice1, args.choice2,
+                                    seed=args.seed)
+    batch.name = args.name
+    out = open(args.output, 'w') if args.output else sys.stdout
+    try:
+        if args.format == "json":
+            json.dump(list(batch), out, indent=2)
+            out.write("\n")
+        elif args.format == "table":
+            header = ["name"] + [stat[:3].upper() for stat in ABILITY_SCORES] + ["HP", "AC"]
+            out.write("\t".join(header) + "\n")
+            for character in batch:
+                stats = character["stats"]
+                row = [character["name"]] + [str(stats[stat]["score"]) for stat in ABILITY_SCORES]
+                row += [str(stats["health"]), str(stats["unarmored ac"])]
+                out.write("\t".join(row) + "\n")
+        else:
+            for character in batch:
+                out.write(json.dumps(character, separators=(",", ":")) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return None
+
+
+def _optimize(args):
+    import json
+    from characters.allocation import top_allocations
+    from stats.classes import CLASSES
+    from stats.races import RACES
+
+    if args.character_class not in CLASSES:
+        return f"unknown class {args.character_class!r}; choose from {', '.join(CLASSES)}"
+    if args.race not in RACES:
+        return f"unknown race {args.race!r}; choose from {', '.join(RACES)}"
+    method = args.method.replace("-", " ")
+    for entry in top_allocations(args.character_class, args.race, method, k=args.top, name=args.name):
+        print(json.dumps(entry["character"], separators=(",", ":")))
+    return None
+
+
+def _serve(args):
+    from .server import serve
+    serve(args.host, args.port, args.data_dir, max_batch=args.max_batch, batch_window=args.batch_window / 1000)
+
+
+def _list_classes(args):
+    from stats.classes import CLASSES
+    for name, hit_die in CLASSES.items():
+        print(f"{name}\td{hit_die}")
+
+
+def _list_races(args):
+    from stats.races import RACES
+    for name, race in RACES.items():
+        print(f"{name}\tchoice" if "choice" in race else name)
+
+
+def build_parser():
+    """
+    Build the argument parser for every subcommand.
+
+    Returns:
+        argparse.ArgumentParser: The configured parser
+    """
+    parser = argparse.ArgumentParser(prog="stat_calc", description="Headless D&D 5e character generator.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    generate = commands.add_parser("generate", help="roll characters (4d6 drop lowest by default)")
+    generate.add_argument("--class", dest="character_class", required=True, help="character class")
+    generate.add_argument("--race", required=True, help="character race")
+    generate.add_argument("--choice1", help="first choice bonus stat (Variant Human, Half Elf)")
+    generate.add_argument("--choice2", help="second choice bonus stat (Variant Human, Half Elf)")
+    generate.add_argument("-n", "--count", type=int, default=1, help="number of characters")
+    generate.add_argument("--name", help="name for every character (default: Character <n>)")
+    generate.add_argument("--min", dest="minimums", action="append", metavar="STAT=SCORE",
+                          help="minimum final score, repeatable (e.g. --min strength=15)")
+    generate.add_argument("--dice", default="4d6dl1", help="ability score dice expression (e.g. 5d6kh3, 4d6r1dl1)")
+    generate.add_argument("--seed", type=int, help="seed for reproducible output")
+    generate.add_argument("--rng", choices=("auto", "mt", "packed", "numpy", "system"), default="auto",
+                          help="random number backend (system: os.urandom, for tournament play)")
+    generate.add_argument("--format", choices=("jsonl", "json", "table"), default="jsonl")
+    generate.add_argument("-o", "--output", help="write to this file instead of stdout")
+    generate.set_defaults(handler=_generate)
+
+    optimize = commands.add_parser("optimize", help="best point-buy or standard-array characters")
+    optimize.add_argument("--class", dest="character_class", required=True, help="character class")
+    optimize.add_argument("--race", required=True, help="character race")
+    optimize.add_argument("--method", choices=("point-buy", "standard-array"), default="point-buy")
+    optimize.add_argument("-k", "--top", type=int, default=1, help="number of allocations, best first")
+    optimize.add_argument("--name", help="character name (default: the class)")
+    optimize.set_defaults(handler=_optimize)
+
+    server = commands.add_parser("serve", help="run the HTTP/JSON generation service")
+    server.add_argument("--host", default="127.0.0.1", help="interface to bind")
+    server.add_argument("--port", type=int, default=8080, help="TCP port")
+    server.add_argument("--data-dir", default=".", help="directory the /load endpoint may read")
+    server.add_argument("--max-batch", type=int, default=1024, help="most generate requests per rolled batch")
+    server.add_argument("--batch-window", type=float, default=2.0, help="milliseconds to gather a batch")
+    server.set_defaults(handler=_serve)
+
+    commands.add_parser("classes", help="list classes and hit dice").set_defaults(handler=_list_classes)
+    commands.add_parser("races", help="list races").set_defaults(handler=_list_races)
+    return parser
+
+
+def main(argv=None):
+    """
+    Run the command line interface.
+
+    Args:
+        argv (list, optional): Arguments, defaulting to sys.argv[1:]
+
+    Returns:
+        int: Process exit status
+    """
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    error = args.handler(args)
+    if error:
+        parser.error(error)
+    return 0
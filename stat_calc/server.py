@@ -0,0 +1,393 @@
+"""
+HTTP/JSON Generation Service
+
+A small stdlib-asyncio HTTP/1.1 server for other tools to call:
+
+    POST /generate  {"class", "race", "choice1"?, "choice2"?, "name"?, "count"?}
+                    -> {"characters": [...]}
+    POST /reroll    {"character": {...}, "stat"} -> {"character": {...}, "changed": [...]}
+    POST /load      {"path"} -> {"character": {...}}   (paths inside the data directory)
+    GET  /metrics   Prometheus text from stats.metrics
+
+Characters have the create_character_from_gui() shape. Generate requests
+that arrive together are queued, grouped by class, race and racial choices,
+and rolled in one generate_characters() pass per group on a worker
+thread, so a large batch never stalls other connections. Connections are
+kept alive until the client closes them or sits idle. A full queue answers
+503 with Retry-After instead of queueing without bound.
+
+Usage:
+    python -m stat_calc serve --port 8080 --data-dir saves/
+"""
+
+import asyncio
+import json
+import os
+
+MAX_BODY = 1 << 20
+MAX_COUNT = 10_000
+# Most characters rolled in one generate pass, across every batched request
+MAX_BATCH_CHARACTERS = 100_000
+MIN_SCORE = 1
+MAX_SCORE = 127
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    """A request that gets an error status and a JSON {"error": message} body."""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+async def read_request(reader):
+    """
+    Read one HTTP/1.1 request.
+
+    Returns:
+        tuple: (method, path, headers, body), or None when the client closed
+            the connection between requests
+    """
+    try:
+        head = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError as error:
+        if error.partial.strip():
+            raise HTTPError(400, "incomplete request") from None
+        return None
+    except asyncio.LimitOverrunError:
+        raise HTTPError(413, "request head too large") from None
+    lines = head.decode("latin-1").split("\r\n")
+    try:
+        method, target, version = lines[0].split(" ", 2)
+    except ValueError:
+        raise HTTPError(400, "malformed request line") from None
+    headers = {"http-version": version}
+    for line in lines[1:]:
+        if line:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+    # Only plain decimal digits: int() would also take "-5", "+5" and "1_000"
+    length = headers.get("content-length") or "0"
+    if not (length.isascii() and length.isdigit()):
+        raise HTTPError(400, "invalid Content-Length")
+    length = int(length)
+    if length > MAX_BODY:
+        raise HTTPError(413, "request body too large")
+    body = await reader.readexactly(length) if length else b""
+    return method, target.split("?", 1)[0], headers, body
+
+
+def _keep_alive(headers):
+    connection = headers.get("connection", "").lower()
+    if headers["http-version"] == "HTTP/1.0":
+        return connection == "keep-alive"
+    return connection != "close"
+
+
+def render_response(status, body, keep_alive=True, content_type="application/json", extra_headers=()):
+    """
+    Serialize an HTTP/1.1 response.
+
+    Args:
+        status (int): Status code
+        body (bytes): Response body
+        keep_alive (bool): Whether the connection stays open
+        content_type (str): Content-Type header
+        extra_headers (iterable): Further (name, value) header pairs
+
+    Returns:
+        bytes: Status line, headers and body
+    """
+    lines = [f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}",
+             f"Content-Type: {content_type}",
+             f"Content-Length: {len(body)}",
+             f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+    lines.extend(f"{name}: {value}" for name, value in extra_headers)
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+
+def _check_character(character):
+    # Reject posted characters before Character.from_dict() interns their
+    # class, race and bonus vector, so clients cannot grow those tables
+    from stats import ABILITY_SCORES
+    from stats.classes import CLASSES
+    from stats.races import RACES
+    from stats.rules import BONUS_VECTORS
+
+    if not isinstance(character, dict) or not isinstance(character.get("stats"), dict):
+        raise HTTPError(400, "character must be an object with stats")
+    if character.get("class") not in CLASSES:
+        raise HTTPError(400, f"unknown class {character.get('class')!r}")
+    race = character.get("race")
+    if race not in RACES:
+        raise HTTPError(400, f"unknown race {race!r}")
+    bonuses = []
+    for stat in ABILITY_SCORES:
+        entry = character["stats"].get(stat)
+        score, bonus = (entry.get("score"), entry.get("racial bonus", 0)) if isinstance(entry, dict) else (entry, 0)
+        if type(score) is not int or not MIN_SCORE <= score <= MAX_SCORE:
+            raise HTTPError(400, f"{stat} score must be an integer from {MIN_SCORE} to {MAX_SCORE}")
+        if type(bonus) is not int:
+            raise HTTPError(400, f"{stat} racial bonus must be an integer")
+        bonuses.append(bonus)
+    # Flat saves carry no bonuses; otherwise the bonuses must be a real vector for the race
+    if any(bonuses) and tuple(bonuses) not in {vector for (name, _, _), vector in BONUS_VECTORS.items() if name == race}:
+        raise HTTPError(400, f"racial bonuses {bonuses} are not possible for a {race}")
+
+
+class CharacterService:
+    """
+    The HTTP service and its generate micro-batcher.
+
+    Args:
+        data_dir (str): Directory /load may read from
+        max_batch (int): Most generate requests rolled in one pass, which
+            also holds at most MAX_BATCH_CHARACTERS characters
+        batch_window (float): Seconds to wait for more requests after the first
+        max_queue (int): Queued generate requests before answering 503
+        idle_timeout (float): Seconds an idle keep-alive connection stays open
+    """
+
+    def __init__(self, data_dir=".", max_batch=1024, batch_window=0.002, max_queue=10_000, idle_timeout=15.0):
+        self.data_dir = os.path.realpath(data_dir)
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.idle_timeout = idle_timeout
+        self._queue = asyncio.Queue(max_queue)
+        self._batcher = None
+        self._server = None
+        self.batches = 0
+        self.batched_requests = 0
+
+    async def start(self, host="127.0.0.1", port=8080):
+        """
+        Start listening and batching.
+
+        Returns:
+            asyncio.Server: The listening server; its sockets give the bound port
+        """
+        self._batcher = asyncio.ensure_future(self._run_batches())
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+        return self._server
+
+    async def close(self):
+        """Stop listening and cancel the batcher."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+
+    async def _handle_connection(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(read_request(reader), self.idle_timeout)
+                except asyncio.TimeoutError:
+                    break
+                except HTTPError as error:
+                    writer.write(self._error(error, keep_alive=False))
+                    break
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = _keep_alive(headers)
+                try:
+                    writer.write(await self._dispatch(method, path, body, keep_alive))
+                except HTTPError as error:
+                    writer.write(self._error(error, keep_alive))
+                except Exception as error:
+                    writer.write(self._error(HTTPError(500, f"{type(error).__name__}: {error}"), keep_alive))
+                # Slow readers hold this connection back rather than growing our buffers
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    def _error(self, error, keep_alive):
+        extra = (("Retry-After", "1"),) if error.status == 503 else ()
+        body = json.dumps({"error": str(error)}).encode()
+        return render_response(error.status, body, keep_alive, extra_headers=extra)
+
+    async def _dispatch(self, method, path, body, keep_alive):
+        routes = {"/generate": self.generate, "/reroll": self.reroll, "/load": self.load}
+        if path == "/metrics":
+            if method != "GET":
+                raise HTTPError(405, "use GET")
+            from stats import metrics
+            return render_response(200, metrics.render_prometheus().encode(), keep_alive,
+                                   content_type="text/plain; version=0.0.4")
+        handler = routes.get(path)
+        if handler is None:
+            raise HTTPError(404, f"no endpoint {path}")
+        if method != "POST":
+            raise HTTPError(405, "use POST")
+        try:
+            payload = json.loads(body or b"{}")
+        except ValueError:
+            raise HTTPError(400, "body is not JSON") from None
+        if not isinstance(payload, dict):
+            raise HTTPError(400, "body must be a JSON object")
+        result = await handler(payload)
+        return render_response(200, json.dumps(result, separators=(",", ":")).encode(), keep_alive)
+
+    async def generate(self, payload):
+        """Queue a generate request for the next batch and wait for its characters."""
+        from stats import ABILITY_SCORES
+        from stats.classes import CLASSES
+        from stats.races import RACES
+
+        character_class, race = payload.get("class"), payload.get("race")
+        if character_class not in CLASSES:
+            raise HTTPError(400, f"unknown class {character_class!r}")
+        if race not in RACES:
+            raise HTTPError(400, f"unknown race {race!r}")
+        choices = (payload.get("choice1"), payload.get("choice2"))
+        if any(choice is not None and choice not in ABILITY_SCORES for choice in choices):
+            raise HTTPError(400, "racial choices must be ability score names")
+        count = payload.get("count", 1)
+        if type(count) is not int or not 1 <= count <= MAX_COUNT:
+            raise HTTPError(400, f"count must be an integer from 1 to {MAX_COUNT}")
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait(((character_class, race) + choices, count, payload.get("name"), future))
+        except asyncio.QueueFull:
+            raise HTTPError(503, "generate queue is full") from None
+        return {"characters": await future}
+
+    async def _run_batches(self):
+        loop = asyncio.get_running_loop()
+        held = None
+        while True:
+            batch = [held if held is not None else await self._queue.get()]
+            held = None
+            characters = batch[0][1]
+            deadline = loop.time() + self.batch_window
+            # Polled with get_nowait(): wait_for(queue.get(), timeout) can
+            # drop a dequeued request when the timeout races the get
+            while len(batch) < self.max_batch:
+                try:
+                    request = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    await asyncio.sleep(remaining)
+                    continue
+                if characters + request[1] > MAX_BATCH_CHARACTERS:
+                    held = request
+                    break
+                batch.append(request)
+                characters += request[1]
+            await self._roll(batch)
+
+    async def _roll(self, batch):
+        # Rolling and building the response dicts happen on a worker thread;
+        # the futures are resolved back here on the event loop
+        groups = {}
+        for request in batch:
+            groups.setdefault(request[0], []).append(request)
+        outcomes = await asyncio.to_thread(self._roll_groups, groups)
+        for requests, results in outcomes:
+            for request, result in zip(requests, results):
+                future = request[3]
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+        self.batches += 1
+        self.batched_requests += len(batch)
+
+    @staticmethod
+    def _roll_groups(groups):
+        from characters.batch import generate_characters
+
+        outcomes = []
+        for (character_class, race, choice1, choice2), requests in groups.items():
+            try:
+                characters = generate_characters(sum(request[1] for request in requests), character_class, race,
+                                                 choice1, choice2)
+            except Exception as error:
+                outcomes.append((requests, [error] * len(requests)))
+                continue
+            results = []
+            start = 0
+            for _, count, name, _ in requests:
+                rolled = [characters[i] for i in range(start, start + count)]
+                for number, character in enumerate(rolled, 1):
+                    character["name"] = name or f"Character {number}"
+                results.append(rolled)
+                start += count
+            outcomes.append((requests, results))
+        return outcomes
+
+    async def reroll(self, payload):
+        """Reroll one ability score of a posted character."""
+        from characters.character import Character
+        from stats import ABILITY_SCORES
+
+        stat = payload.get("stat")
+        if stat not in ABILITY_SCORES:
+            raise HTTPError(400, f"stat must be one of {', '.join(ABILITY_SCORES)}")
+        _check_character(payload.get("character"))
+        try:
+            character = Character.from_dict(payload["character"])
+        except (KeyError, TypeError, ValueError) as error:
+            raise HTTPError(400, f"invalid character: {error}") from None
+        changed = character.reroll(stat)
+        return {"character": character.to_dict(), "changed": changed}
+
+    async def load(self, payload):
+        """Load and normalize a saved character from the data directory."""
+        from storage.loader import load_characters
+
+        path = payload.get("path")
+        if not isinstance(path, str):
+            raise HTTPError(400, "path must be a string")
+        full = os.path.realpath(os.path.join(self.data_dir, path))
+        if os.path.commonpath((full, self.data_dir)) != self.data_dir:
+            raise HTTPError(400, "path is outside the data directory")
+        if not os.path.isfile(full):
+            raise HTTPError(404, f"no saved character {path}")
+        try:
+            character = (await asyncio.to_thread(load_characters, [full]))[0]
+        except (OSError, ValueError, KeyError) as error:
+            raise HTTPError(400, f"unreadable character file: {error}") from None
+        return {"character": character}
+
+
+def serve(host="127.0.0.1", port=8080, data_dir=".", **options):
+    """
+    Run the service until interrupted.
+
+    Args:
+        host (str): Interface to bind
+        port (int): TCP port
+        data_dir (str): Directory /load may read from
+        **options: CharacterService tuning options
+    """
+    async def run():
+        service = CharacterService(data_dir, **options)
+        server = await service.start(host, port)
+        print(f"Serving on http://{host}:{server.sockets[0].getsockname()[1]}", flush=True)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await service.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
@@ -1 +1,4 @@
-# This file makes the stats directory a Python package
\ No newline at end of file
+# This file makes the stats directory a Python package
+
+# Ability score names in the order used by batches and bonus vectors
+ABILITY_SCORES = ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma")
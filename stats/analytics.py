@@ -0,0 +1,287 @@
+"""
+Stat Array Analytics
+
+Exact distributions for 4d6 drop lowest and for whole six-stat arrays,
+computed by convolution instead of simulation. Distributions are built once
+and cached, and the percentile tables for every race are built when the
+module is imported, so ranking a character against every possible rolled
+array is a couple of table lookups.
+
+The joint distribution of a whole array is kept over its sorted scores:
+there are only 54,264 distinct sorted arrays, and any statistic of the
+array (order statistics, total, modifier sum, or several at once) is a
+function of one.
+"""
+
+from fractions import Fraction
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from math import comb, factorial
+
+from . import ABILITY_SCORES
+from .rules import BONUS_VECTORS, bonus_vector
+from .roll_stat_dice import DROP_LOWEST_TABLE_LIMIT, _drop_lowest_dice, _drop_lowest_table
+
+METRICS = ("total", "modifier sum")
+
+
+def _modifier(score):
+    return (score - 10) // 2
+
+
+def _convolve(left, right):
+    # Both distributions are {value: count} over independent outcomes
+    result = {}
+    for a, count_a in left.items():
+        for b, count_b in right.items():
+            result[a + b] = result.get(a + b, 0) + count_a * count_b
+    return result
+
+
+def _power(distribution, times):
+    result = {0: 1}
+    for _ in range(times):
+        result = _convolve(result, distribution)
+    return result
+
+
+def _to_probabilities(counts):
+    outcomes = sum(counts.values())
+    return {value: Fraction(count, outcomes) for value, count in sorted(counts.items())}
+
+
+@lru_cache(maxsize=None)
+def _roll_counts(size=6):
+    counts = {}
+    for total in _drop_lowest_table(size):
+        counts[total] = counts.get(total, 0) + 1
+    return counts
+
+
+def stat_distribution(size=6):
+    """
+    Exact distribution of a single 4dN drop lowest roll.
+
+    Args:
+        size (int): Number of sides on each die
+
+    Returns:
+        dict: Score mapped to its exact probability (Fraction)
+
+    Raises:
+        ValueError: If size is above stats.dice.MAX_SIDES
+    """
+    if size ** 4 > DROP_LOWEST_TABLE_LIMIT:
+        return _drop_lowest_dice(size).distribution()
+    return _to_probabilities(_roll_counts(size))
+
+
+@lru_cache(maxsize=None)
+def _total_counts():
+    return _power(_roll_counts(), len(ABILITY_SCORES))
+
+
+@lru_cache(maxsize=None)
+def _modifier_sum_counts(bonuses):
+    # Stats are identically distributed, so only the multiset of bonuses matters
+    result = {0: 1}
+    for bonus in bonuses:
+        modifiers = {}
+        for score, count in _roll_counts().items():
+            modifier = _modifier(score + bonus)
+            modifiers[modifier] = modifiers.get(modifier, 0) + count
+        result = _convolve(result, modifiers)
+    return result
+
+
+def total_distribution():
+    """
+    Exact distribution of the sum of six rolled scores, before racial bonuses.
+
+    Returns:
+        dict: Total mapped to its exact probability (Fraction)
+    """
+    return _to_probabilities(_total_counts())
+
+
+def modifier_sum_distribution(bonuses=(0, 0, 0, 0, 0, 0)):
+    """
+    Exact distribution of the sum of the six ability modifiers.
+
+    Args:
+        bonuses (sequence): Racial bonus per ability score
+
+    Returns:
+        dict: Modifier sum mapped to its exact probability (Fraction)
+    """
+    return _to_probabilities(_modifier_sum_counts(tuple(sorted(bonuses))))
+
+
+def order_statistic_distribution(rank):
+    """
+    Exact distribution of the rank-th highest score in a rolled array.
+
+    Args:
+        rank (int): 1 for the highest score, 6 for the lowest
+
+    Returns:
+        dict: Score mapped to its exact probability (Fraction)
+    """
+    if not 1 <= rank <= len(ABILITY_SCORES):
+        raise ValueError(f"rank must be between 1 and {len(ABILITY_SCORES)}")
+    stats = len(ABILITY_SCORES)
+    cdf = 0
+    previous = Fraction(0)
+    result = {}
+    for score, probability in stat_distribution().items():
+        cdf += probability
+        # At most rank - 1 of the six scores may exceed this one
+        at_most = sum(comb(stats, above) * (1 - cdf) ** above * cdf ** (stats - above) for above in range(rank))
+        result[score] = at_most - previous
+        previous = at_most
+    return result
+
+
+@lru_cache(maxsize=None)
+def _array_counts():
+    # Descending sorted arrays -> how many of the 1296 ** 6 ordered rolls sort to them
+    counts = _roll_counts()
+    stats = len(ABILITY_SCORES)
+    result = {}
+    for array in combinations_with_replacement(sorted(counts, reverse=True), stats):
+        ways = factorial(stats)
+        for score in set(array):
+            ways //= factorial(array.count(score))
+        for score in array:
+            ways *= counts[score]
+        result[array] = ways
+    return result
+
+
+@lru_cache(maxsize=None)
+def _array_probabilities():
+    return _to_probabilities(_array_counts())
+
+
+def array_distribution():
+    """
+    Exact joint distribution of the six order statistics of a rolled array.
+
+    Returns:
+        dict: Scores sorted highest first, e.g. (15, 14, 13, 12, 10, 8),
+            mapped to their exact probability (Fraction)
+    """
+    return dict(_array_probabilities())
+
+
+def joint_distribution(key):
+    """
+    Exact joint distribution of any statistics of a rolled array.
+
+    Args:
+        key (callable): Maps scores sorted highest first to a value, e.g.
+            lambda array: (array[0], sum(array)) for the highest score and
+            the total together
+
+    Returns:
+        dict: Each value of key mapped to its exact probability (Fraction),
+            ascending
+    """
+    counts = {}
+    for array, ways in _array_counts().items():
+        value = key(array)
+        counts[value] = counts.get(value, 0) + ways
+    return _to_probabilities(counts)
+
+
+def race_effect(character_race, racial_choice1=None, racial_choice2=None):
+    """
+    Summarise how a race's bonuses shift the rolled array.
+
+    Args:
+        character_race (str): Selected character race
+        racial_choice1 (str, optional): First choice racial stat bonus
+        racial_choice2 (str, optional): Second choice racial stat bonus
+
+    Returns:
+        dict: Total shift, expected modifier sum with and without the
+            bonuses, and the exact modifier sum distribution
+    """
+    bonuses = bonus_vector(character_race, racial_choice1, racial_choice2)
+    with_race = modifier_sum_distribution(bonuses)
+    without = modifier_sum_distribution()
+    expected = sum(value * p for value, p in with_race.items())
+    baseline = sum(value * p for value, p in without.items())
+    return {
+        "total shift": sum(bonuses),
+        "expected modifier sum": float(expected),
+        "modifier sum gain": float(expected - baseline),
+        "modifier sum distribution": with_race,
+    }
+
+
+@lru_cache(maxsize=None)
+def _mid_rank_table(metric, bonuses):
+    # value -> percentage of arrays scoring lower, counting ties as half
+    counts = _total_counts() if metric == "total" else _modifier_sum_counts(bonuses)
+    outcomes = sum(counts.values())
+    table = {}
+    below = 0
+    for value, count in sorted(counts.items()):
+        table[value] = 100 * (below + count / 2) / outcomes
+        below += count
+    return table, min(counts), max(counts)
+
+
+def precompute():
+    """Build the percentile tables for every race and racial choice up front."""
+    _mid_rank_table("total", ())
+    for bonuses in set(BONUS_VECTORS.values()):
+        _mid_rank_table("modifier sum", tuple(sorted(bonuses)))
+
+
+def percentile_of(character, metric="total"):
+    """
+    Rank a character's array against every possible 4d6 drop lowest array.
+
+    "total" ranks the sum of the rolled scores with racial bonuses removed.
+    "modifier sum" ranks the sum of final modifiers against arrays given the
+    same racial bonuses.
+
+    Args:
+        character (dict): Character from create_character_from_gui(), or one
+            with flat integer stats
+        metric (str): One of METRICS
+
+    Returns:
+        float: Percentile from 0 to 100, with ties counted as half
+    """
+    if metric not in METRICS:
+        raise ValueError(f"metric must be one of {METRICS}")
+    stats = character["stats"]
+    scores = []
+    bonuses = []
+    for stat in ABILITY_SCORES:
+        entry = stats[stat]
+        if isinstance(entry, dict):
+            scores.append(entry["score"])
+            bonuses.append(entry.get("racial bonus", 0))
+        else:
+            scores.append(entry)
+            bonuses.append(0)
+
+    if metric == "total":
+        value = sum(scores) - sum(bonuses)
+        table, low, high = _mid_rank_table("total", ())
+    else:
+        value = sum(_modifier(score) for score in scores)
+        bonuses.sort()
+        table, low, high = _mid_rank_table("modifier sum", tuple(bonuses))
+    if value < low:
+        return 0.0
+    if value > high:
+        return 100.0
+    return table[value]
+
+
+precompute()
@@ -1,8 +1,8 @@
 #charisma
-from .roll_stat_dice import roll_4d6_drop_lowest
+from .roll_stat_dice import roll_ability_score
 
 def roll_charisma():
-    charisma = roll_4d6_drop_lowest()
+    charisma = roll_ability_score()
     return charisma
 
 def get_charisma_modifier(charisma):
@@ -1,9 +1,9 @@
 #constitution
-from .roll_stat_dice import roll_4d6_drop_lowest
+from .roll_stat_dice import roll_ability_score
 from .classes import CLASSES
 
 def roll_constitution():
-    constitution = roll_4d6_drop_lowest()
+    constitution = roll_ability_score()
     return constitution
 
 def get_constitution_modifier(constitution):
@@ -1,8 +1,8 @@
 #dexterity
-from .roll_stat_dice import roll_4d6_drop_lowest
+from .roll_stat_dice import roll_ability_score
 
 def roll_dexterity():
-    dexterity = roll_4d6_drop_lowest()
+    dexterity = roll_ability_score()
     return dexterity
 
 def get_dexterity_modifier(dexterity):
@@ -0,0 +1,305 @@
+"""
+Dice Expressions
+
+Parses house-rule dice expressions such as "4d6dl1", "5d6kh3", "2d20kl1+3"
+or "4d6r1dl1" once into a Dice object that rolls one result, rolls large
+batches and gives the exact distribution. compile_dice() caches compiled
+expressions, so asking for the same text again costs one dict lookup.
+
+Syntax: integers and NdS dice joined by + or -, each dice term followed by
+any of
+    khK or kK   keep the K highest dice     klK        keep the K lowest
+    dlK or dK   drop the K lowest dice      dhK        drop the K highest
+    rX          reroll dice showing X until they don't (r<X: X or lower,
+                r>X: X or higher); may be repeated
+    roX         reroll dice showing X once, keeping the second roll
+
+Like the 4d6 drop lowest engine, small expressions compile to a table of
+every equally likely outcome, so a roll is one uniform pick from it.
+Expressions with too many outcomes roll their dice and sort them instead.
+"""
+
+import re
+from array import array
+from functools import lru_cache, reduce
+from itertools import combinations_with_replacement, product
+from math import factorial, gcd, prod
+from operator import add
+
+from . import metrics
+from .rng import _typecode, get_rng, load_numpy, resolve
+
+# Largest outcome table built for table sampling
+TABLE_LIMIT = 1 << 16
+# Most sorted dice combinations enumerated for an exact keep/drop distribution
+EXACT_LIMIT = 1 << 20
+MAX_SIDES = 127
+MAX_DICE = 1000
+
+_TERM = re.compile(r"\s*([+-]?)\s*(?:(\d*)d(\d+)((?:(?:ro|r|kh|kl|k|dh|dl|d)[<>]?\d+)*)|(\d+))\s*", re.IGNORECASE)
+_MODIFIER = re.compile(r"(ro|r|kh|kl|k|dh|dl|d)([<>]?)(\d+)", re.IGNORECASE)
+
+
+def _die_faces(sides, rerolls, text):
+    # A tuple of equally likely faces for one die after rerolls, so a uniform
+    # pick from it is one rerolled die
+    if not rerolls:
+        return tuple(range(1, sides + 1))
+    once = {kind for kind, _ in rerolls}
+    if len(once) > 1:
+        raise ValueError(f"invalid dice expression {text!r}: cannot mix r and ro")
+    matched = {face for face in range(1, sides + 1) if any(test(face) for _, test in rerolls)}
+    if len(matched) == sides:
+        raise ValueError(f"invalid dice expression {text!r}: every face of a d{sides} is rerolled")
+    if "r" in once:
+        return tuple(face for face in range(1, sides + 1) if face not in matched)
+    # Reroll once: over sides ** 2 equally likely first and second rolls, a
+    # kept face appears sides + len(matched) times and a rerolled one len(matched)
+    weights = [len(matched) if face in matched else sides + len(matched) for face in range(1, sides + 1)]
+    divisor = reduce(gcd, weights)
+    return tuple(face for face, weight in zip(range(1, sides + 1), weights) for _ in range(weight // divisor))
+
+
+class _Group:
+    # count dice drawn from faces, sorted ascending and summed over [keep_start:keep_stop]
+
+    def __init__(self, sign, count, sides, faces, keep_start, keep_stop):
+        self.sign = sign
+        self.count = count
+        self.sides = sides
+        self.faces = faces
+        self.keep_start = keep_start
+        self.keep_stop = keep_stop
+        self.keeps_all = keep_start == 0 and keep_stop == count
+        kept = keep_stop - keep_start
+        low, high = kept * min(faces), kept * max(faces)
+        self.low, self.high = (low, high) if sign > 0 else (-high, -low)
+        self.outcomes = len(faces) ** count
+        self.table = None
+        if self.outcomes <= TABLE_LIMIT and _typecode(self.low, self.high) == 'b':
+            self.table = tuple(sign * self.total(dice) for dice in product(faces, repeat=count))
+
+    def total(self, dice):
+        if self.keeps_all:
+            return sum(dice)
+        return sum(sorted(dice)[self.keep_start:self.keep_stop])
+
+    def counts(self):
+        # {total: ways} over len(faces) ** count equally likely outcomes
+        if self.table is not None:
+            counts = {}
+            for total in self.table:
+                counts[total] = counts.get(total, 0) + 1
+            return counts
+        weights = {}
+        for face in self.faces:
+            weights[face] = weights.get(face, 0) + 1
+        if self.keeps_all:
+            from .analytics import _power
+            counts = _power(weights, self.count)
+        else:
+            # Only which faces come up matters, not their order: enumerate
+            # sorted combinations and weight each by its permutations
+            values = sorted(weights)
+            combinations = factorial(len(values) + self.count - 1) // factorial(self.count) // factorial(len(values) - 1)
+            if combinations > EXACT_LIMIT:
+                raise ValueError(f"{self.count}d{self.sides} with keep or drop has too many outcomes for an exact distribution")
+            counts = {}
+            for dice in combinations_with_replacement(values, self.count):
+                ways = factorial(self.count)
+                for value in set(dice):
+                    repeats = dice.count(value)
+                    ways = ways // factorial(repeats) * weights[value] ** repeats
+                total = sum(dice[self.keep_start:self.keep_stop])
+                counts[total] = counts.get(total, 0) + ways
+        return {self.sign * total: ways for total, ways in counts.items()}
+
+    def roll(self, rng):
+        if self.table is not None:
+            return rng.choice(self.table)
+        choice, faces = rng.choice, self.faces
+        return self.sign * self.total([choice(faces) for _ in range(self.count)])
+
+    def roll_batch(self, n, rng, np):
+        # One column of n totals, as a NumPy array or a list
+        if self.table is not None:
+            return rng.choices(self.table, n)
+        dice = rng.choices(self.faces, n * self.count)
+        count = self.count
+        if np is not None and isinstance(dice, np.ndarray):
+            dice = dice.reshape(n, count).astype(np.int64)
+            if not self.keeps_all:
+                dice = np.sort(dice, axis=1)[:, self.keep_start:self.keep_stop]
+            return self.sign * dice.sum(axis=1)
+        if self.keeps_all:
+            totals = [sum(dice[i:i + count]) for i in range(0, n * count, count)]
+        else:
+            start, stop = self.keep_start, self.keep_stop
+            totals = [sum(sorted(dice[i:i + count])[start:stop]) for i in range(0, n * count, count)]
+        return totals if self.sign > 0 else [-total for total in totals]
+
+
+class Dice:
+    """
+    A compiled dice expression.
+
+    Attributes:
+        expression (str): The expression as written
+        dice (int): Dice thrown per roll, before rerolls
+        minimum (int): Lowest possible result
+        maximum (int): Highest possible result
+        table (tuple | None): Every equally likely outcome, when the
+            expression is small enough to sample as one pick
+    """
+
+    def __init__(self, expression):
+        """
+        Args:
+            expression (str): Dice expression, see the module docstring
+
+        Raises:
+            ValueError: If the expression is malformed or out of range
+        """
+        self.expression = expression
+        self._groups = []
+        self.constant = 0
+        position = 0
+        text = expression.strip()
+        if not text:
+            raise ValueError("empty dice expression")
+        while position < len(text):
+            match = _TERM.match(text, position)
+            if match is None or match.end() == position or (position and not match.group(1)):
+                raise ValueError(f"invalid dice expression {expression!r} at {text[position:]!r}")
+            position = match.end()
+            sign = -1 if match.group(1) == "-" else 1
+            if match.group(5) is not None:
+                self.constant += sign * int(match.group(5))
+                continue
+            self._groups.append(self._compile_group(sign, match, expression))
+
+        self.dice = sum(group.count for group in self._groups)
+        self.minimum = self.constant + sum(group.low for group in self._groups)
+        self.maximum = self.constant + sum(group.high for group in self._groups)
+        self.typecode = _typecode(self.minimum, self.maximum)
+        self.table = None
+        if self.typecode == 'b' and all(group.table is not None for group in self._groups) \
+                and prod(len(group.table) for group in self._groups) <= TABLE_LIMIT:
+            if len(self._groups) == 1 and not self.constant:
+                self.table = self._groups[0].table
+            else:
+                tables = [group.table for group in self._groups]
+                self.table = tuple(self.constant + sum(totals) for totals in product(*tables))
+        self._distribution = None
+
+    @staticmethod
+    def _compile_group(sign, match, expression):
+        count = int(match.group(2) or 1)
+        sides = int(match.group(3))
+        if not 1 <= count <= MAX_DICE:
+            raise ValueError(f"invalid dice expression {expression!r}: roll between 1 and {MAX_DICE} dice")
+        if not 1 <= sides <= MAX_SIDES:
+            raise ValueError(f"invalid dice expression {expression!r}: dice have 1 to {MAX_SIDES} sides")
+        rerolls = []
+        keep = None
+        for kind, comparison, number in _MODIFIER.findall(match.group(4)):
+            kind, number = kind.lower(), int(number)
+            if kind in ("r", "ro"):
+                if comparison == "<":
+                    test = number.__ge__
+                elif comparison == ">":
+                    test = number.__le__
+                else:
+                    test = number.__eq__
+                rerolls.append((kind, test))
+                continue
+            if comparison or keep is not None:
+                raise ValueError(f"invalid dice expression {expression!r}: one plain keep or drop per term")
+            if number > count:
+                raise ValueError(f"invalid dice expression {expression!r}: cannot keep or drop {number} of {count} dice")
+            keep = {
+                "k": (count - number, count), "kh": (count - number, count), "kl": (0, number),
+                "d": (number, count), "dl": (number, count), "dh": (0, count - number),
+            }[kind]
+        keep_start, keep_stop = keep or (0, count)
+        return _Group(sign, count, sides, _die_faces(sides, rerolls, expression), keep_start, keep_stop)
+
+    def __repr__(self):
+        return f"Dice({self.expression!r})"
+
+    def roll(self):
+        """
+        Roll the expression once with this thread's generator.
+
+        Returns:
+            int: The result
+        """
+        if metrics.enabled:
+            metrics.DICE_ROLLED.inc(self.dice)
+        if self.table is not None:
+            return get_rng().choice(self.table)
+        rng = get_rng()
+        return self.constant + sum(group.roll(rng) for group in self._groups)
+
+    def roll_batch(self, n, seed=None):
+        """
+        Roll the expression n times in one pass.
+
+        Args:
+            n (int): Number of rolls
+            seed (int | backend | random.Random | numpy.random.Generator, optional):
+                Seed or generator to draw from, as for roll_dice_batch()
+
+        Returns:
+            array: NumPy array when NumPy is used, otherwise array(typecode);
+                int8 (typecode 'b') whenever every result fits
+        """
+        if metrics.enabled:
+            metrics.DICE_ROLLED.inc(self.dice * n)
+        rng = resolve(seed, n)
+        if self.table is not None:
+            return rng.choices(self.table, n)
+        np = load_numpy()
+        columns = [group.roll_batch(n, rng, np) for group in self._groups]
+        if np is not None and any(isinstance(column, np.ndarray) for column in columns):
+            total = sum((np.asarray(column, dtype=np.int64) for column in columns), np.int64(self.constant))
+            return total.astype(np.dtype(self.typecode))
+        totals = reduce(lambda left, right: list(map(add, left, right)), columns)
+        if self.constant:
+            totals = [total + self.constant for total in totals]
+        return array(self.typecode, totals)
+
+    def distribution(self):
+        """
+        Exact distribution of the result, computed once per expression.
+
+        Returns:
+            dict: Result mapped to its exact probability (Fraction), ascending
+
+        Raises:
+            ValueError: If a keep/drop term has too many outcomes to enumerate
+        """
+        if self._distribution is None:
+            from .analytics import _convolve, _to_probabilities
+            counts = {self.constant: 1}
+            for group in self._groups:
+                counts = _convolve(counts, group.counts())
+            self._distribution = _to_probabilities(counts)
+        return dict(self._distribution)
+
+
+@lru_cache(maxsize=256)
+def compile_dice(expression):
+    """
+    Compile a dice expression, reusing earlier compilations of the same text.
+
+    Args:
+        expression (str): Dice expression such as "5d6kh3" or "2d20kl1+3"
+
+    Returns:
+        Dice: The compiled expression
+
+    Raises:
+        ValueError: If the expression is malformed or out of range
+    """
+    return Dice(expression)
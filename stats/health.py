@@ -0,0 +1,174 @@
+"""
+Hit Point Progression
+
+Hit points from level 1 to 20 for any class in CLASSES. Level 1 is the full
+hit die plus the CON modifier, as in calculate_health(). Each later level
+adds either the fixed average (half the die plus one) or a roll of the hit
+die, plus the CON modifier, and never less than 1.
+
+Whole batches are advanced one level at a time over columns, and the exact
+rolled-HP distribution for a (class, CON modifier, level) is built by
+convolution and cached, each level reusing the one below it.
+"""
+
+from array import array
+from fractions import Fraction
+from functools import lru_cache
+from operator import add
+
+from .analytics import _convolve, _to_probabilities, stat_distribution
+from .classes import CLASSES
+from .rng import load_numpy, resolve
+from .roll_stat_dice import roll_dice, roll_dice_batch
+
+MAX_LEVEL = 20
+RULES = ("average", "rolled")
+
+
+def _check(character_class, level, rule="average"):
+    if character_class not in CLASSES:
+        raise KeyError(character_class)
+    if not 1 <= level <= MAX_LEVEL:
+        raise ValueError(f"level must be between 1 and {MAX_LEVEL}")
+    if rule not in RULES:
+        raise ValueError(f"rule must be one of {RULES}")
+
+
+def average_gain(hit_die):
+    """Fixed hit points per level after the first, before CON."""
+    return hit_die // 2 + 1
+
+
+def hit_points(character_class, constitution_modifier, level, rule="average"):
+    """
+    Hit points of one character at a level.
+
+    Args:
+        character_class (str): Character class
+        constitution_modifier (int): CON modifier
+        level (int): Character level, 1 to 20
+        rule (str): "average" for fixed hit points per level, "rolled" to roll
+
+    Returns:
+        int: Maximum hit points
+    """
+    _check(character_class, level, rule)
+    hit_die = CLASSES[character_class]
+    total = hit_die + constitution_modifier
+    for _ in range(level - 1):
+        gain = average_gain(hit_die) if rule == "average" else roll_dice(hit_die)
+        total += max(1, gain + constitution_modifier)
+    return total
+
+
+def hit_point_progression(character_class, constitution_modifiers, levels=MAX_LEVEL, rule="average", seed=None):
+    """
+    Hit points at every level for a whole batch of characters.
+
+    Args:
+        character_class (str): Class of every character
+        constitution_modifiers (array): CON modifier column (array('b') or NumPy)
+        levels (int): Highest level to compute
+        rule (str): "average" or "rolled"
+        seed (optional): Seed or generator, as for roll_dice_batch()
+
+    Returns:
+        list: levels columns; column i holds every character's HP at level i + 1
+            (array('h'), or int16 NumPy arrays for NumPy input)
+    """
+    _check(character_class, levels, rule)
+    hit_die = CLASSES[character_class]
+    n = len(constitution_modifiers)
+    rng = resolve(seed, n)
+    np = load_numpy()
+
+    if np is not None and isinstance(constitution_modifiers, np.ndarray):
+        modifiers = constitution_modifiers.astype(np.int16)
+        if rule == "average":
+            dice = np.full((levels - 1, n), average_gain(hit_die), dtype=np.int16)
+        else:
+            dice = np.asarray(roll_dice_batch((levels - 1) * n, hit_die, seed=rng), dtype=np.int16).reshape(levels - 1, n)
+        gains = np.maximum(dice + modifiers, 1)
+        first = (hit_die + modifiers)[np.newaxis, :]
+        return list(np.cumsum(np.concatenate((first, gains)), axis=0, dtype=np.int16))
+
+    # Whole columns advance one level per pass; fixed gains are the same every level
+    modifiers = list(constitution_modifiers)
+    current = array('h', [hit_die + modifier for modifier in modifiers])
+    columns = [current]
+    fixed = [max(1, average_gain(hit_die) + modifier) for modifier in modifiers] if rule == "average" else None
+    for _ in range(levels - 1):
+        if fixed is not None:
+            gains = fixed
+        else:
+            gains = [max(1, total) for total in map(add, roll_dice_batch(n, hit_die, seed=rng), modifiers)]
+        current = array('h', map(add, current, gains))
+        columns.append(current)
+    return columns
+
+
+@lru_cache(maxsize=None)
+def _rolled_counts(hit_die, constitution_modifier, level):
+    # {hp: ways} over hit_die ** (level - 1) equally likely roll sequences
+    if level == 1:
+        return {hit_die + constitution_modifier: 1}
+    gain = {}
+    for face in range(1, hit_die + 1):
+        value = max(1, face + constitution_modifier)
+        gain[value] = gain.get(value, 0) + 1
+    return _convolve(_rolled_counts(hit_die, constitution_modifier, level - 1), gain)
+
+
+@lru_cache(maxsize=None)
+def _distribution(character_class, constitution_modifier, level, rule):
+    hit_die = CLASSES[character_class]
+    if rule == "average":
+        return {hit_points(character_class, constitution_modifier, level): Fraction(1)}
+    return _to_probabilities(_rolled_counts(hit_die, constitution_modifier, level))
+
+
+def hit_point_distribution(character_class, constitution_modifier, level, rule="rolled", constitution_bonus=0):
+    """
+    Exact distribution of hit points at a level.
+
+    Args:
+        character_class (str): Character class
+        constitution_modifier (int | None): CON modifier; None averages over a
+            4d6 drop lowest CON roll plus constitution_bonus
+        level (int): Character level, 1 to 20
+        rule (str): "rolled" or "average"
+        constitution_bonus (int): Racial CON bonus, used when the modifier is None
+
+    Returns:
+        dict: Hit points mapped to exact probability (Fraction), ascending
+    """
+    _check(character_class, level, rule)
+    if constitution_modifier is not None:
+        return dict(_distribution(character_class, constitution_modifier, level, rule))
+    mixture = {}
+    for score, chance in stat_distribution().items():
+        modifier = (score + constitution_bonus - 10) // 2
+        for hp, probability in _distribution(character_class, modifier, level, rule).items():
+            mixture[hp] = mixture.get(hp, 0) + chance * probability
+    return dict(sorted(mixture.items()))
+
+
+def probability_at_least(character_class, hp, level, constitution_modifier=None, rule="rolled",
+                         constitution_bonus=0):
+    """
+    Exact chance of having at least hp hit points at a level.
+
+    Args:
+        character_class (str): Character class
+        hp (int): Hit point threshold
+        level (int): Character level, 1 to 20
+        constitution_modifier (int, optional): CON modifier; None averages
+            over a rolled CON, as in hit_point_distribution()
+        rule (str): "rolled" or "average"
+        constitution_bonus (int): Racial CON bonus for a rolled CON
+
+    Returns:
+        Fraction: P(HP >= hp)
+    """
+    distribution = hit_point_distribution(character_class, constitution_modifier, level, rule, constitution_bonus)
+    return sum((probability for value, probability in distribution.items() if value >= hp), Fraction(0))
@@ -1,8 +1,8 @@
 #intelligence
-from .roll_stat_dice import roll_4d6_drop_lowest
+from .roll_stat_dice import roll_ability_score
 
 def roll_intelligence():
-    intelligence = roll_4d6_drop_lowest()
+    intelligence = roll_ability_score()
     return intelligence
 
 def get_intelligence_modifier(intelligence):
@@ -0,0 +1,232 @@
+"""
+Hot-Path Instrumentation
+
+Opt-in counters and latency histograms for dice rolling, character
+construction and JSON saves and loads. While disabled (the default) each
+instrumented call pays for one module attribute check and nothing else.
+Metrics are readable with snapshot() and can be written, once or
+periodically, as Prometheus text-format files for a node_exporter
+textfile collector to pick up.
+
+Usage:
+    from stats import metrics
+    metrics.enable()
+    dumper = metrics.start_dumping("/var/lib/node_exporter/stat_calc.prom", interval=15)
+"""
+
+import functools
+import os
+import threading
+import time
+
+# Checked inline on every instrumented call; flip with enable()/disable()
+enabled = False
+
+DEFAULT_BUCKETS = (0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+_registry = {}
+
+
+class Counter:
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation):
+        self.name = name
+        self.documentation = documentation
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+    def samples(self):
+        yield self.name, "", self.value
+
+    def reset(self):
+        with self._lock:
+            self.value = 0
+
+
+class Histogram:
+    """Distribution of observed values, e.g. latencies in seconds."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, buckets=DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self.reset()
+
+    def observe(self, value):
+        with self._lock:
+            self.count += 1
+            self.sum += value
+            for position, bound in enumerate(self.buckets):
+                if value <= bound:
+                    self.bucket_counts[position] += 1
+                    break
+
+    def snapshot(self):
+        with self._lock:
+            cumulative = 0
+            buckets = {}
+            for bound, count in zip(self.buckets, self.bucket_counts):
+                cumulative += count
+                buckets[bound] = cumulative
+            return {"count": self.count, "sum": self.sum, "buckets": buckets}
+
+    def samples(self):
+        snapshot = self.snapshot()
+        for bound, cumulative in snapshot["buckets"].items():
+            yield f"{self.name}_bucket", f'{{le="{bound}"}}', cumulative
+        yield f"{self.name}_bucket", '{le="+Inf"}', snapshot["count"]
+        yield f"{self.name}_sum", "", snapshot["sum"]
+        yield f"{self.name}_count", "", snapshot["count"]
+
+    def reset(self):
+        with self._lock:
+            self.count = 0
+            self.sum = 0.0
+            self.bucket_counts = [0] * len(self.buckets)
+
+
+def counter(name, documentation):
+    """Register (or fetch) a counter."""
+    return _registry.setdefault(name, Counter(name, documentation))
+
+
+def histogram(name, documentation, buckets=DEFAULT_BUCKETS):
+    """Register (or fetch) a histogram."""
+    return _registry.setdefault(name, Histogram(name, documentation, buckets))
+
+
+DICE_ROLLED = counter("stat_calc_dice_rolled_total", "Individual dice rolled.")
+CHARACTERS_CREATED = counter("stat_calc_characters_created_total", "Characters built by create_character_from_gui.")
+CHARACTER_SECONDS = histogram("stat_calc_character_create_seconds", "Time to build one character.")
+SAVES = counter("stat_calc_saves_total", "Characters saved with save_character_to_json.")
+SAVE_SECONDS = histogram("stat_calc_save_seconds", "Time to save one character to JSON.")
+LOADS = counter("stat_calc_loads_total", "Characters loaded with load_character_from_json.")
+LOAD_SECONDS = histogram("stat_calc_load_seconds", "Time to load one character from JSON.")
+
+
+def enable():
+    """Start recording metrics."""
+    global enabled
+    enabled = True
+
+
+def disable():
+    """Stop recording metrics; values recorded so far are kept."""
+    global enabled
+    enabled = False
+
+
+def reset():
+    """Zero every registered metric."""
+    for metric in _registry.values():
+        metric.reset()
+
+
+def timed(latency, calls):
+    """
+    Decorate a function to record its latency and call count when enabled.
+
+    Args:
+        latency (Histogram): Receives the call duration in seconds
+        calls (Counter): Incremented once per call
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                latency.observe(time.perf_counter() - start)
+                calls.inc()
+        return wrapper
+    return decorator
+
+
+def snapshot():
+    """
+    Current value of every metric.
+
+    Returns:
+        dict: Counter name -> int, histogram name -> {"count", "sum", "buckets"}
+    """
+    return {name: metric.snapshot() for name, metric in _registry.items()}
+
+
+def render_prometheus():
+    """
+    Format every metric in the Prometheus text exposition format.
+
+    Returns:
+        str: Exposition text ending in a newline
+    """
+    lines = []
+    for metric in _registry.values():
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        for name, labels, value in metric.samples():
+            lines.append(f"{name}{labels} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """
+    Atomically write the current metrics to a Prometheus text file.
+
+    Args:
+        path (str): Destination, conventionally ending in .prom
+    """
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, 'w') as f:
+        f.write(render_prometheus())
+    os.replace(temporary, path)
+
+
+class PeriodicDumper:
+    """Background thread that rewrites a Prometheus file every interval."""
+
+    def __init__(self, path, interval):
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="metrics-dumper", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            write_prometheus(self.path)
+
+    def stop(self):
+        """Stop dumping, writing one final snapshot."""
+        self._stop.set()
+        self._thread.join()
+        write_prometheus(self.path)
+
+
+def start_dumping(path, interval=15.0):
+    """
+    Write metrics to path every interval seconds until stopped.
+
+    Args:
+        path (str): Prometheus text file to rewrite
+        interval (float): Seconds between writes
+
+    Returns:
+        PeriodicDumper: Call stop() to end dumping
+    """
+    return PeriodicDumper(path, interval)
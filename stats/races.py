@@ -1,3 +1,5 @@
+from . import ABILITY_SCORES
+
 RACES = {
     "Human": {
         "strength": 1,
@@ -81,14 +83,6 @@ RACES = {
         "wisdom": 0,
         "charisma": 1
     },
-    "Mountain Dwarf": {
-        "strength": 2,
-        "dexterity": 0,
-        "constitution": 2,
-        "intelligence": 0,
-        "wisdom": 0,
-        "charisma": 0
-    },
     "Forest Gnome": {
         "strength": 0,
         "dexterity": 1,
@@ -131,4 +125,25 @@ RACES = {
         "wisdom": 0,
         "charisma": 2
     },
-}
\ No newline at end of file
+}
+
+
+def racial_bonus_vector(character_race, racial_choice1=None, racial_choice2=None):
+    """
+    Total racial bonus for each ability score, including choice bonuses.
+
+    Args:
+        character_race (str): Selected character race
+        racial_choice1 (str, optional): First choice racial stat bonus
+        racial_choice2 (str, optional): Second choice racial stat bonus
+
+    Returns:
+        tuple: Bonuses ordered like ABILITY_SCORES
+    """
+    race = RACES[character_race]
+    bonuses = [race[stat] for stat in ABILITY_SCORES]
+    if "choice" in race:
+        for choice in (racial_choice1, racial_choice2):
+            if choice in ABILITY_SCORES:
+                bonuses[ABILITY_SCORES.index(choice)] += race["choice bonus"]
+    return tuple(bonuses)
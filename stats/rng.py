@@ -0,0 +1,315 @@
+"""
+Pluggable Random Number Backends
+
+Every dice roll in stats/ draws through one of these backends:
+
+    "mt"      stdlib Mersenne Twister (random.Random)
+    "packed"  Mersenne Twister words split into many dice: one 64-bit word
+              holds 24 d6 results, or six whole 4d6-drop-lowest rolls;
+              fewer generator calls, but slower than "mt" in CPython
+              (benchmarks/bench_rng.py), so "auto" never picks it
+    "numpy"   NumPy PCG64, for large batches
+    "system"  os.urandom read through a buffer, for tournament play;
+              cannot be seeded
+    "auto"    "mt" for small draws and "numpy" for large batches when
+              NumPy is installed (the default)
+
+Unseeded rolls use a per-thread instance of the configured backend, so
+threads never contend on one generator's state. set_backend() picks the
+backend and, optionally, a master seed from which each thread's generator
+is seeded deterministically.
+"""
+
+import os
+import random
+import threading
+from array import array
+from itertools import count
+
+# Below this many rolls the NumPy setup cost outweighs the vectorized pass
+NUMPY_THRESHOLD = 256
+WORD_BITS = 64
+SYSTEM_BUFFER_WORDS = 4096
+
+_TYPECODES = (('b', 1 << 7), ('h', 1 << 15), ('i', 1 << 31), ('q', 1 << 63))
+
+_numpy = False
+
+
+def _typecode(low, high):
+    # Narrowest array typecode holding every value from low to high
+    for typecode, bound in _TYPECODES:
+        if -bound <= low and high < bound:
+            return typecode
+    raise ValueError("values do not fit in 64 bits")
+
+
+def _pack(values):
+    # Dice and stat tables fit int8; only wider tables pay for finding their range
+    try:
+        return array('b', values)
+    except OverflowError:
+        return array(_typecode(min(values), max(values)), values)
+
+
+def load_numpy():
+    # NumPy is optional and slow to import, so it is only loaded once a
+    # batch is big enough to use it; None means it is not installed
+    global _numpy
+    if _numpy is False:
+        try:
+            import numpy
+        except ImportError:
+            numpy = None
+        _numpy = numpy
+    return _numpy
+
+
+class MersenneTwisterBackend:
+    """Stdlib random.Random; fast for single rolls."""
+
+    name = "mt"
+
+    def __init__(self, seed=None, generator=None):
+        self._random = generator if generator is not None else random.Random(seed)
+        # Bound directly so single rolls skip a wrapper frame
+        self.choice = self._random.choice
+
+    def choices(self, table, n):
+        return _pack(self._random.choices(table, k=n))
+
+
+class _WordBackend:
+    # Uniform picks from a table by splitting each 64-bit word into as many
+    # base-len(table) digits as fit, rejecting the few words that would bias them
+
+    def __init__(self):
+        self._layouts = {}
+        self._spare = {}
+
+    def _next_word(self):
+        raise NotImplementedError
+
+    def _layout(self, size):
+        layout = self._layouts.get(size)
+        if layout is None:
+            digits = 1
+            while size ** (digits + 1) <= 1 << WORD_BITS:
+                digits += 1
+            span = size ** digits
+            layout = self._layouts[size] = (digits, (1 << WORD_BITS) // span * span)
+        return layout
+
+    def _indices(self, size, n):
+        if size <= 1:
+            # A one-entry table needs no randomness, and has no digit layout
+            return [0] * n
+        digits, limit = self._layout(size)
+        spare = self._spare.get(size, [])
+        indices = spare[:n]
+        del spare[:n]
+        next_word = self._next_word
+        while len(indices) < n:
+            word = next_word()
+            if word >= limit:
+                continue
+            for _ in range(digits):
+                word, digit = divmod(word, size)
+                indices.append(digit)
+        if len(indices) > n:
+            spare.extend(indices[n:])
+            del indices[n:]
+        self._spare[size] = spare
+        return indices
+
+    def choice(self, table):
+        return table[self._indices(len(table), 1)[0]]
+
+    def choices(self, table, n):
+        return _pack(list(map(table.__getitem__, self._indices(len(table), n))))
+
+
+class PackedBackend(_WordBackend):
+    """Mersenne Twister words split into many dice per draw."""
+
+    name = "packed"
+
+    def __init__(self, seed=None):
+        super().__init__()
+        self._getrandbits = random.Random(seed).getrandbits
+
+    def _next_word(self):
+        return self._getrandbits(WORD_BITS)
+
+
+class SystemBackend(_WordBackend):
+    """Operating system entropy (os.urandom), read in large buffered chunks."""
+
+    name = "system"
+
+    def __init__(self, seed=None):
+        if seed is not None:
+            raise ValueError("the system backend draws from os.urandom and cannot be seeded")
+        super().__init__()
+        self._words = []
+
+    def _next_word(self):
+        if not self._words:
+            self._words = array('Q', os.urandom(8 * SYSTEM_BUFFER_WORDS)).tolist()
+        return self._words.pop()
+
+
+class NumPyBackend:
+    """NumPy PCG64 generator; fastest for large batches."""
+
+    name = "numpy"
+
+    def __init__(self, seed=None, generator=None):
+        np = load_numpy()
+        if np is None:
+            raise RuntimeError("the numpy backend requires NumPy")
+        self._np = np
+        self._generator = generator if generator is not None else np.random.Generator(np.random.PCG64(seed))
+        self._tables = {}
+
+    def _table(self, table):
+        values = self._tables.get(id(table))
+        if values is None or values[0] is not table:
+            dtype = self._np.dtype(_typecode(min(table), max(table)))
+            values = self._tables[id(table)] = (table, self._np.asarray(table, dtype=dtype))
+        return values[1]
+
+    def choice(self, table):
+        return table[int(self._generator.integers(len(table)))]
+
+    def choices(self, table, n):
+        if isinstance(table, range):
+            # Faces of a large die: draw the values directly, never the table
+            values = self._generator.integers(table.start, table.stop, size=n)
+            return values.astype(self._np.dtype(_typecode(table.start, table.stop - 1)))
+        return self._table(table)[self._generator.integers(0, len(table), size=n)]
+
+
+BACKENDS = {
+    "mt": MersenneTwisterBackend,
+    "packed": PackedBackend,
+    "numpy": NumPyBackend,
+    "system": SystemBackend,
+}
+
+_backend = "auto"
+_master_seed = None
+_generation = 0
+_threads = threading.local()
+_thread_numbers = count()
+
+
+def set_backend(name, seed=None):
+    """
+    Choose the backend used for unseeded rolls, in every thread.
+
+    Args:
+        name (str): "auto" or a key of BACKENDS
+        seed (int, optional): Master seed; each thread's generator is seeded
+            from it and the order in which threads first roll
+
+    Raises:
+        ValueError: For an unknown backend name, or a seed for "system"
+    """
+    global _backend, _master_seed, _generation, _thread_numbers
+    if name != "auto" and name not in BACKENDS:
+        raise ValueError(f"unknown RNG backend {name!r}; choose from auto, {', '.join(BACKENDS)}")
+    if name == "system" and seed is not None:
+        raise ValueError("the system backend draws from os.urandom and cannot be seeded")
+    _backend = name
+    _master_seed = seed
+    _thread_numbers = count()
+    _generation += 1
+
+
+def backend_name():
+    """Name of the configured backend."""
+    return _backend
+
+
+def _auto_backend(n):
+    # bench_rng.py: "mt" beats "packed" for single rolls and batches alike
+    # (about 1.7M vs 0.8M single d6/s, 6.4M vs 2.7M batched 4d6dl/s), and
+    # NumPy beats both once a batch covers its setup cost
+    return "numpy" if n >= NUMPY_THRESHOLD and load_numpy() is not None else "mt"
+
+
+def _backend_for(n):
+    return _auto_backend(n) if _backend == "auto" else _backend
+
+
+def seedable_backend(n=1):
+    """
+    Name of the backend a seeded stream of n draws should use.
+
+    The configured backend, unless it is "auto" (resolved here, for n) or
+    "system" (which ignores seeds, so "auto"'s choice is used instead).
+    Pass the name to worker processes: they do not inherit set_backend().
+
+    Args:
+        n (int): Size of the draws
+
+    Returns:
+        str: A key of BACKENDS whose instances repeat for a seed
+    """
+    if _backend in ("auto", "system"):
+        return _auto_backend(n)
+    return _backend
+
+
+def get_rng(n=1):
+    """
+    This thread's generator for the configured backend.
+
+    Args:
+        n (int): Size of the upcoming draw; "auto" switches to NumPy for large ones
+
+    Returns:
+        Backend instance
+    """
+    local = _threads
+    if n < NUMPY_THRESHOLD and getattr(local, "generation", None) == _generation:
+        return local.scalar
+    if getattr(local, "generation", None) != _generation:
+        # Derived per thread, so seeded runs repeat whichever thread rolls
+        local.seed = None if _master_seed is None else hash((_master_seed, next(_thread_numbers))) & (1 << WORD_BITS) - 1
+        local.instances = {}
+        local.scalar = _thread_instance(local, _backend_for(1))
+        local.generation = _generation
+    return _thread_instance(local, _backend_for(n))
+
+
+def _thread_instance(local, name):
+    instance = local.instances.get(name)
+    if instance is None:
+        instance = local.instances[name] = BACKENDS[name](local.seed)
+    return instance
+
+
+def resolve(seed, n=1):
+    """
+    Turn a seed argument into a backend instance.
+
+    Args:
+        seed: None for this thread's generator, an int to seed a fresh
+            generator of the configured backend, a backend instance, a
+            random.Random or a numpy.random.Generator
+        n (int): Size of the upcoming draw
+
+    Returns:
+        Backend instance
+    """
+    if seed is None:
+        return get_rng(n)
+    if isinstance(seed, random.Random):
+        return MersenneTwisterBackend(generator=seed)
+    if hasattr(seed, "choices") and hasattr(seed, "choice"):
+        return seed
+    if type(seed).__module__.startswith("numpy"):
+        return NumPyBackend(generator=seed)
+    return BACKENDS[_backend_for(n)](seed)
@@ -1,16 +1,232 @@
-import random
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import product
+
+from . import metrics
+from .rng import NUMPY_THRESHOLD, _typecode, get_rng, load_numpy, resolve
+
+# Largest 4dN drop lowest outcome table built (4d22); bigger dice roll
+# four faces per score instead
+DROP_LOWEST_TABLE_LIMIT = 1 << 18
+# Largest die whose faces are kept as a table; bigger dice draw from a range
+FACE_TABLE_LIMIT = 256
+
+_drop_lowest_tables = {}
+_conditional_tables = {}
+_faces = {}
+
+# Dice expression (see stats.dice) that roll_ability_score() and
+# roll_ability_scores() use; compiled on first use
+DEFAULT_STAT_EXPRESSION = "4d6dl1"
+_stat_expression = DEFAULT_STAT_EXPRESSION
+_stat_dice = None
+
+
+def _drop_lowest_table(size):
+    # Every equally likely 4dN outcome mapped to its drop-lowest total, so one
+    # uniform pick from the table is exactly one 4dN-drop-lowest roll
+    table = _drop_lowest_tables.get(size)
+    if table is None:
+        if size ** 4 > DROP_LOWEST_TABLE_LIMIT:
+            raise ValueError(f"4d{size} has too many outcomes for an outcome table")
+        table = tuple(sum(dice) - min(dice) for dice in product(range(1, size + 1), repeat=4))
+        _drop_lowest_tables[size] = table
+    return table
+
+
+def _conditional_table(low, high, size):
+    # The outcome table sorted by total is the inverse CDF: the outcomes
+    # scoring low..high are one contiguous slice, and a uniform pick from
+    # that slice is an exact draw from the roll conditioned on the range
+    key = (low, high, size)
+    table = _conditional_tables.get(key)
+    if table is None:
+        ordered = sorted(_drop_lowest_table(size))
+        table = _conditional_tables[key] = tuple(ordered[bisect_left(ordered, low):bisect_right(ordered, high)])
+    return table
+
+
+def _drop_lowest_dice(size):
+    # Exact 4dN drop lowest distribution for dice too big to tabulate
+    from .dice import compile_dice
+    return compile_dice(f"4d{size}dl1")
+
+
+def _face_table(size):
+    # Every backend samples a range in O(1) without materializing it, so
+    # only small dice, which are rolled often, keep a cached tuple
+    if size > FACE_TABLE_LIMIT:
+        return range(1, size + 1)
+    table = _faces.get(size)
+    if table is None:
+        table = _faces[size] = tuple(range(1, size + 1))
+    return table
+
+
+def _roll_drop_lowest(n, size, rng):
+    # 4dN drop lowest for dice too big to tabulate: four faces per score
+    dice = rng.choices(_face_table(size), 4 * n)
+    np = load_numpy()
+    if np is not None and isinstance(dice, np.ndarray):
+        dice = dice.reshape(n, 4).astype(np.int64)
+        totals = dice.sum(axis=1) - dice.min(axis=1)
+        return totals.astype(np.dtype(_typecode(3, 3 * size)))
+    totals = [sum(dice[i:i + 4]) - min(dice[i:i + 4]) for i in range(0, 4 * n, 4)]
+    return array(_typecode(3, 3 * size), totals)
+
+
+def roll_dice_batch(n, size=6, seed=None):
+    """
+    Roll n dice with the given number of sides in one pass.
+
+    Args:
+        n (int): Number of dice to roll
+        size (int): Number of sides on each die
+        seed (int | backend | random.Random | numpy.random.Generator, optional):
+            Seed or generator to draw from. None uses this thread's generator
+            for the configured stats.rng backend.
+
+    Returns:
+        array: NumPy array when NumPy is installed, otherwise an array;
+            int8 (typecode 'b') for dice of up to 127 sides, wider above
+    """
+    if metrics.enabled:
+        metrics.DICE_ROLLED.inc(n)
+    return resolve(seed, n).choices(_face_table(size), n)
+
+
+def roll_4d6_drop_lowest_batch(n, size=6, seed=None):
+    """
+    Roll n ability scores using 4dN drop lowest in one vectorized pass.
+
+    Args:
+        n (int): Number of ability scores to roll
+        size (int): Number of sides on each die
+        seed (int | backend | random.Random | numpy.random.Generator, optional):
+            Seed or generator to draw from. None uses this thread's generator
+            for the configured stats.rng backend.
+
+    Returns:
+        array: int8 NumPy array when NumPy is installed, otherwise array('b');
+            wider when 4dN can exceed 127
+    """
+    if metrics.enabled:
+        metrics.DICE_ROLLED.inc(4 * n)
+    if size ** 4 > DROP_LOWEST_TABLE_LIMIT:
+        return _roll_drop_lowest(n, size, resolve(seed, 4 * n))
+    return resolve(seed, n).choices(_drop_lowest_table(size), n)
+
+
+def roll_4d6_drop_lowest_between(n, low, high, size=6, seed=None):
+    """
+    Roll n ability scores with 4dN drop lowest, conditioned on low <= score <= high.
+
+    Every draw costs the same however unlikely the range is.
+
+    Args:
+        n (int): Number of ability scores to roll
+        low (int): Smallest allowed score
+        high (int): Largest allowed score
+        size (int): Number of sides on each die
+        seed (int | backend | random.Random | numpy.random.Generator, optional):
+            Seed or generator to draw from
+
+    Returns:
+        array: int8 NumPy array or array('b'), as roll_4d6_drop_lowest_batch
+
+    Raises:
+        ValueError: If no roll can land in the range, or 4dN has more than
+            DROP_LOWEST_TABLE_LIMIT outcomes
+    """
+    table = _conditional_table(low, high, size)
+    if not table:
+        raise ValueError(f"4d{size} drop lowest cannot roll between {low} and {high}")
+    if metrics.enabled:
+        metrics.DICE_ROLLED.inc(4 * n)
+    return resolve(seed, n).choices(table, n)
+
 
 def roll_dice(size):
-    return random.randint(1, size)
+    # Same faces as roll_dice_batch, minus the array round trip for one die
+    if metrics.enabled:
+        metrics.DICE_ROLLED.inc()
+    return get_rng().choice(_face_table(size))
 
 def add_rolls(rolls):
     return sum(rolls)
 
 
 def roll_4d6_drop_lowest(size=6):
-    rolls = []
-    for i in range(4):
-        rolls.append(roll_dice(size))
-    rolls.sort()
-    del rolls[0]
-    return add_rolls(rolls)
\ No newline at end of file
+    # One pick from the batch engine's outcome table is one full 4dN roll
+    if metrics.enabled:
+        metrics.DICE_ROLLED.inc(4)
+    if size ** 4 > DROP_LOWEST_TABLE_LIMIT:
+        choice, faces = get_rng().choice, _face_table(size)
+        dice = [choice(faces) for _ in range(4)]
+        return sum(dice) - min(dice)
+    return get_rng().choice(_drop_lowest_table(size))
+
+
+def set_stat_expression(expression=DEFAULT_STAT_EXPRESSION):
+    """
+    Choose the dice expression ability scores are rolled with, e.g. "5d6kh3".
+
+    Only roll_ability_score() and roll_ability_scores() follow it; the exact
+    analytics, constrained generation and replay mode (stats.replay) always
+    use 4d6 drop lowest.
+
+    Args:
+        expression (str): Dice expression, see stats.dice
+
+    Raises:
+        ValueError: If the expression is malformed, can roll below 1, or can
+            exceed 127 once the largest racial bonus is added (the int8
+            score columns)
+    """
+    global _stat_expression, _stat_dice
+    from .dice import compile_dice
+    from .rules import BONUS_VECTORS
+
+    dice = compile_dice(expression)
+    if dice.minimum < 1:
+        raise ValueError(f"ability score expression {expression!r} can roll {dice.minimum}; scores start at 1")
+    largest_bonus = max(max(vector) for vector in BONUS_VECTORS.values())
+    if dice.maximum + largest_bonus > 127:
+        raise ValueError(f"ability score expression {expression!r} can roll {dice.maximum}, which with a "
+                         f"+{largest_bonus} racial bonus exceeds 127")
+    _stat_expression, _stat_dice = expression, dice
+
+
+def uses_default_dice():
+    """Whether the configured expression rolls exactly like 4d6 drop lowest."""
+    return stat_dice().table == _drop_lowest_table(6)
+
+
+def stat_dice():
+    """The compiled ability score expression (a stats.dice.Dice)."""
+    global _stat_dice
+    if _stat_dice is None:
+        from .dice import compile_dice
+        _stat_dice = compile_dice(_stat_expression)
+    return _stat_dice
+
+
+def roll_ability_score():
+    # The default expression compiles to the 4d6 drop lowest outcome table,
+    # so this is the same single pick as roll_4d6_drop_lowest()
+    return (_stat_dice or stat_dice()).roll()
+
+
+def roll_ability_scores(n, seed=None):
+    """
+    Roll n ability scores with the configured expression in one pass.
+
+    Args:
+        n (int): Number of ability scores to roll
+        seed (int | backend | random.Random | numpy.random.Generator, optional):
+            Seed or generator to draw from, as for roll_4d6_drop_lowest_batch()
+
+    Returns:
+        array: int8 NumPy array when NumPy is used, otherwise array('b')
+    """
+    return (_stat_dice or stat_dice()).roll_batch(n, seed=seed)
@@ -0,0 +1,188 @@
+"""
+Compiled Rules Tables
+
+Validates RACES and CLASSES once and compiles them into flat lookup tables:
+a dense racial bonus vector for every (race, choice1, choice2) combination
+and a hit die per class. Character construction then needs one dict lookup
+and a vector add instead of per-stat lookups and if/elif chains.
+
+Compiled tables are cached on disk with marshal (which, unlike pickle,
+costs nothing to import), keyed by a fingerprint of the rules, so only the
+first import after RACES or CLASSES change pays for validation and
+compilation. The cache lives in the user's cache directory (override with
+STAT_CALC_CACHE_DIR) and records that the tables passed validation; an
+entry without that mark is recompiled.
+"""
+
+import marshal
+import os
+import sys
+import zlib
+
+from . import ABILITY_SCORES
+from . import classes, races
+from .classes import CLASSES
+from .races import RACES, racial_bonus_vector
+
+
+def _user_cache_dir():
+    # Per-user cache location; installed packages are often read-only
+    if sys.platform == "win32":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+    elif sys.platform == "darwin":
+        base = os.path.join(os.path.expanduser("~"), "Library", "Caches")
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "stat_calc")
+
+
+CACHE_DIR = os.environ.get("STAT_CALC_CACHE_DIR") or _user_cache_dir()
+
+_CHOICES = (None,) + ABILITY_SCORES
+
+
+class RulesError(ValueError):
+    """Raised when RACES or CLASSES contain an invalid entry."""
+
+
+def _duplicate_keys(module, name):
+    # A dict literal silently keeps the last of any repeated key, so look at
+    # the source. Only needed on a cache miss, so keep the imports out of startup.
+    import ast
+    import inspect
+
+    try:
+        tree = ast.parse(inspect.getsource(module))
+    except (OSError, TypeError):
+        # Installed without sources (e.g. only .pyc files); the values
+        # are still validated, only repeated keys go unnoticed
+        return []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and any(getattr(target, "id", None) == name for target in node.targets):
+            keys = [key.value for key in node.value.keys if isinstance(key, ast.Constant)]
+            return sorted({key for key in keys if keys.count(key) > 1})
+    return []
+
+
+def validate_rules():
+    """
+    Check RACES and CLASSES for missing, malformed or duplicated entries.
+
+    Raises:
+        RulesError: Describing every problem found
+    """
+    problems = []
+    for name in _duplicate_keys(races, "RACES"):
+        problems.append(f"race {name!r} is defined more than once")
+    for name in _duplicate_keys(classes, "CLASSES"):
+        problems.append(f"class {name!r} is defined more than once")
+
+    for name, race in RACES.items():
+        for stat in ABILITY_SCORES:
+            if not isinstance(race.get(stat), int):
+                problems.append(f"race {name!r} has no integer {stat} bonus")
+        unknown = set(race) - set(ABILITY_SCORES) - {"choice", "choice bonus"}
+        if unknown:
+            problems.append(f"race {name!r} has unknown keys {sorted(unknown)}")
+        if ("choice" in race) != ("choice bonus" in race):
+            problems.append(f"race {name!r} must define both 'choice' and 'choice bonus'")
+
+    for name, hit_die in CLASSES.items():
+        if not isinstance(hit_die, int) or hit_die <= 0:
+            problems.append(f"class {name!r} has invalid hit die {hit_die!r}")
+
+    if problems:
+        raise RulesError("; ".join(problems))
+
+
+def compile_rules():
+    """
+    Validate the rules and build the lookup tables.
+
+    Returns:
+        dict: "bonus vectors" keyed by (race, choice1, choice2) and
+            "hit dice" keyed by class
+    """
+    validate_rules()
+    bonus_vectors = {}
+    for name, race in RACES.items():
+        if "choice" in race:
+            for first in _CHOICES:
+                for second in _CHOICES:
+                    bonus_vectors[(name, first, second)] = racial_bonus_vector(name, first, second)
+        else:
+            bonus_vectors[(name, None, None)] = racial_bonus_vector(name)
+    return {"bonus vectors": bonus_vectors, "hit dice": dict(CLASSES)}
+
+
+def _fingerprint():
+    source = repr((ABILITY_SCORES, RACES, CLASSES)).encode()
+    return f"{zlib.crc32(source):08x}{len(source):x}"
+
+
+def load_rules():
+    """
+    Load compiled rules from the disk cache, compiling and caching on a miss.
+
+    Returns:
+        dict: Compiled tables as returned by compile_rules()
+    """
+    fingerprint = _fingerprint()
+    path = os.path.join(CACHE_DIR, f"rules-{fingerprint}.marshal")
+    try:
+        with open(path, 'rb') as f:
+            cached = marshal.load(f)
+        # Only trust entries written after these exact rules validated
+        if cached.get("validated") == fingerprint:
+            return cached["rules"]
+    except (OSError, ValueError, EOFError, TypeError, AttributeError, KeyError):
+        pass
+
+    rules = compile_rules()
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'wb') as f:
+            marshal.dump({"validated": fingerprint, "rules": rules}, f)
+        os.replace(temporary, path)
+    except OSError:
+        # A read-only install still works, it just recompiles next time
+        pass
+    return rules
+
+
+_RULES = load_rules()
+BONUS_VECTORS = _RULES["bonus vectors"]
+HIT_DICE = _RULES["hit dice"]
+
+
+def bonus_vector(character_race, racial_choice1=None, racial_choice2=None):
+    """
+    Precomputed total racial bonus per ability score.
+
+    Choices are ignored for races without choice bonuses, as are choices
+    that are not ability score names.
+
+    Args:
+        character_race (str): Selected character race
+        racial_choice1 (str, optional): First choice racial stat bonus
+        racial_choice2 (str, optional): Second choice racial stat bonus
+
+    Returns:
+        tuple: Bonuses ordered like ABILITY_SCORES
+
+    Raises:
+        KeyError: If the race is not in RACES
+    """
+    vector = BONUS_VECTORS.get((character_race, racial_choice1, racial_choice2))
+    if vector is None:
+        if character_race not in RACES:
+            raise KeyError(character_race)
+        if racial_choice1 not in ABILITY_SCORES:
+            racial_choice1 = None
+        if racial_choice2 not in ABILITY_SCORES:
+            racial_choice2 = None
+        vector = BONUS_VECTORS.get((character_race, racial_choice1, racial_choice2))
+        if vector is None:
+            vector = BONUS_VECTORS[(character_race, None, None)]
+    return vector
@@ -1,8 +1,8 @@
 #strength stats
-from .roll_stat_dice import roll_4d6_drop_lowest
+from .roll_stat_dice import roll_ability_score
 
 def roll_strength():
-    strength = roll_4d6_drop_lowest()
+    strength = roll_ability_score()
     return strength
 
 def get_strength_modifier(strength):
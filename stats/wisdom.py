@@ -1,8 +1,8 @@
 #wisdom.py
-from .roll_stat_dice import roll_4d6_drop_lowest
+from .roll_stat_dice import roll_ability_score
 
 def roll_wisdom():
-    wisdom = roll_4d6_drop_lowest()
+    wisdom = roll_ability_score()
     return wisdom
 
 def get_wisdom_modifier(wisdom):
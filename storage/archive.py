@@ -0,0 +1,283 @@
+"""
+Compressed Chunked Character Archive
+
+Long-term storage for very many characters. Characters are grouped into
+blocks of compact JSON lines and each block is compressed on its own with
+zlib or lzma, so any block can be read without touching the others. A block
+index at the end of the file records where every block starts, how many
+characters it holds and its CRC, which makes finding character i a binary
+search plus one block decompression. Both codecs release the GIL while
+decompressing, so blocks decompress in parallel on a thread pool.
+
+File layout:
+    header (16 bytes) | block 0 | block 1 | ... | index (24 bytes per block) | trailer (24 bytes)
+"""
+
+import json
+import lzma
+import mmap
+import os
+import re
+import struct
+import zlib
+from bisect import bisect_right
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+MAGIC = b"SCAR"
+VERSION = 1
+HEADER = struct.Struct("<4sHBxI4x")
+INDEX_ENTRY = struct.Struct("<QIII4x")
+TRAILER = struct.Struct("<QQI4s")
+CODECS = {"zlib": 0, "lzma": 1}
+DEFAULT_BLOCK_SIZE = 4096
+DEFAULT_CACHED_BLOCKS = 8
+
+
+def _compress(codec, data, level):
+    if codec == "lzma":
+        return lzma.compress(data, preset=6 if level is None else level)
+    return zlib.compress(data, 6 if level is None else level)
+
+
+def _decompress(codec, data):
+    if codec == "lzma":
+        return lzma.decompress(data)
+    return zlib.decompress(data)
+
+
+class ArchiveWriter:
+    """
+    Write characters to a new archive, one compressed block at a time.
+
+    Use as a context manager, or call close() to write the last block and
+    the index.
+    """
+
+    def __init__(self, path, codec="zlib", block_size=DEFAULT_BLOCK_SIZE, level=None):
+        """
+        Args:
+            path (str): Archive file to create
+            codec (str): "zlib" (fast) or "lzma" (smaller)
+            block_size (int): Characters per block; smaller blocks make
+                single-character reads cheaper, larger ones compress better
+            level (int, optional): Codec compression level or preset
+        """
+        if codec not in CODECS:
+            raise ValueError(f"codec must be one of {', '.join(CODECS)}")
+        self.path = path
+        self.codec = codec
+        self.block_size = block_size
+        self.level = level
+        self.count = 0
+        self._pending = []
+        self._index = []
+        self._file = open(path, 'wb')
+        self._file.write(HEADER.pack(MAGIC, VERSION, CODECS[codec], block_size))
+
+    def add(self, character):
+        """Append one character dict."""
+        self._pending.append(json.dumps(character, separators=(",", ":")))
+        if len(self._pending) >= self.block_size:
+            self._write_block()
+
+    def extend(self, characters):
+        """Append every character dict from an iterable."""
+        for character in characters:
+            self.add(character)
+
+    def _write_block(self):
+        data = _compress(self.codec, "\n".join(self._pending).encode(), self.level)
+        self._index.append((self._file.tell(), len(data), len(self._pending), zlib.crc32(data)))
+        self._file.write(data)
+        self.count += len(self._pending)
+        self._pending = []
+
+    def close(self):
+        """Write the final partial block, the block index and the trailer."""
+        if self._file.closed:
+            return
+        if self._pending:
+            self._write_block()
+        index_offset = self._file.tell()
+        for entry in self._index:
+            self._file.write(INDEX_ENTRY.pack(*entry))
+        self._file.write(TRAILER.pack(index_offset, self.count, len(self._index), MAGIC))
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+class CharacterArchive:
+    """
+    Read-only, memory-mapped view of an archive.
+
+    Supports len(), indexing and iteration. Recently used blocks are kept
+    decompressed, so neighbouring lookups cost one decompression between them.
+    """
+
+    def __init__(self, path, cached_blocks=DEFAULT_CACHED_BLOCKS):
+        """
+        Args:
+            path (str): Archive written by ArchiveWriter
+            cached_blocks (int): Decompressed blocks to keep
+
+        Raises:
+            ValueError: If the file is not a character archive
+        """
+        self._file = open(path, 'rb')
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, codec, self.block_size = HEADER.unpack_from(self._map, 0)
+            index_offset, self._count, blocks, end_magic = TRAILER.unpack_from(self._map, len(self._map) - TRAILER.size)
+        except (ValueError, struct.error):
+            self._file.close()
+            raise ValueError(f"{path} is not a character archive") from None
+        if magic != MAGIC or end_magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} character archive")
+        self.codec = {number: name for name, number in CODECS.items()}[codec]
+        self._blocks = [INDEX_ENTRY.unpack_from(self._map, index_offset + i * INDEX_ENTRY.size)
+                        for i in range(blocks)]
+        # First character index of every block, for bisecting
+        self._starts = []
+        start = 0
+        for _, _, count, _ in self._blocks:
+            self._starts.append(start)
+            start += count
+        self._cache = OrderedDict()
+        self._cached_blocks = cached_blocks
+
+    def __len__(self):
+        return self._count
+
+    @property
+    def block_count(self):
+        return len(self._blocks)
+
+    def _block_lines(self, number):
+        offset, length, count, crc = self._blocks[number]
+        data = self._map[offset:offset + length]
+        if zlib.crc32(data) != crc:
+            raise ValueError(f"block {number} is corrupt (CRC mismatch)")
+        return _decompress(self.codec, data).split(b"\n")
+
+    def block(self, number):
+        """
+        Every character in one block.
+
+        Args:
+            number (int): Block number
+
+        Returns:
+            list: Character dicts
+        """
+        return [json.loads(line) for line in self._block_lines(number)]
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("character index out of range")
+        number = bisect_right(self._starts, index) - 1
+        lines = self._cache.get(number)
+        if lines is None:
+            lines = self._cache[number] = self._block_lines(number)
+            if len(self._cache) > self._cached_blocks:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(number)
+        return json.loads(lines[index - self._starts[number]])
+
+    def __iter__(self):
+        for number in range(len(self._blocks)):
+            yield from self.block(number)
+
+    def read_all(self, workers=None):
+        """
+        Decompress every block in parallel and return all characters.
+
+        Args:
+            workers (int, optional): Decompression threads, defaults to the CPU count
+
+        Returns:
+            list: Character dicts in archive order
+        """
+        workers = workers or os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            blocks = pool.map(self._block_lines, range(len(self._blocks)))
+            return [json.loads(line) for lines in blocks for line in lines]
+
+    def close(self):
+        """Release the mapping and the underlying file."""
+        if hasattr(self, "_map"):
+            self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+def export_archive(paths_or_dir, archive_path, codec="zlib", block_size=DEFAULT_BLOCK_SIZE,
+                   pattern="*_character.json"):
+    """
+    Pack saved character files into an archive, exactly as loaded.
+
+    Args:
+        paths_or_dir (str | iterable): A directory, a single file, or file paths
+        archive_path (str): Archive to create
+        codec (str): "zlib" or "lzma"
+        block_size (int): Characters per block
+        pattern (str): Glob used when a directory is given
+
+    Returns:
+        int: Number of characters archived
+    """
+    from main import load_character_from_json
+    from .loader import _expand
+
+    with ArchiveWriter(archive_path, codec, block_size) as writer:
+        for path in _expand(paths_or_dir, pattern):
+            writer.add(load_character_from_json(path))
+    return writer.count
+
+
+def import_archive(archive_path, directory, index=True):
+    """
+    Unpack an archive into one save_character_to_json() file per character.
+
+    Files are named like the CLI's saves, <name>_character.json, with a
+    number added when names repeat.
+
+    Args:
+        archive_path (str): Archive to read
+        directory (str): Destination directory, created if missing
+        index (bool): Also record each file in the directory's character index
+
+    Returns:
+        list: Paths written, in archive order
+    """
+    from main import save_character_to_json
+
+    os.makedirs(directory, exist_ok=True)
+    used = set()
+    paths = []
+    with CharacterArchive(archive_path) as archive:
+        for character in archive:
+            stem = re.sub(r"[^\w-]", "_", str(character.get("name") or "character")).lower()
+            filename, number = f"{stem}_character.json", 1
+            while filename in used or os.path.exists(os.path.join(directory, filename)):
+                number += 1
+                filename = f"{stem}_{number}_character.json"
+            used.add(filename)
+            path = os.path.join(directory, filename)
+            save_character_to_json(character, path, index=index)
+            paths.append(path)
+    return paths
@@ -0,0 +1,283 @@
+"""
+Fixed-Width Binary Character Store
+
+Packs each character into a 16-byte record: six final scores, the six
+racial bonuses as nibbles, a class id, a race id and a name id. Names
+are UTF-8 strings in a heap after the records, found through a table of
+offsets, so opening a store reads none of them and looking one up is two
+slices of the mapping. Classes and races live once in a small JSON table at
+the end. Reading maps the file with mmap, so a record is an O(1) offset
+calculation and a whole score column is a zero-copy strided view over the
+mapping.
+
+File layout:
+    header (32 bytes) | records (16 bytes each) |
+    name offsets (count + 1 uint64) | name heap (UTF-8) | class and race tables (JSON)
+"""
+
+import json
+import mmap
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+
+from stats import ABILITY_SCORES
+from stats.rules import HIT_DICE
+from stats.roll_stat_dice import load_numpy
+
+MAGIC = b"SCHR"
+VERSION = 2
+HEADER = struct.Struct("<4sHHQQQ")
+RECORD = struct.Struct("<6b3BBBxI")
+OFFSET = struct.Struct("<Q")
+
+
+def _record_dtype(np):
+    # NumPy view of RECORD
+    return np.dtype([
+        ("scores", "i1", (6,)), ("bonuses", "u1", (3,)),
+        ("class", "u1"), ("race", "u1"), ("pad", "u1"), ("name", "<u4"),
+    ])
+
+
+def _modifier(score):
+    return (score - 10) // 2
+
+
+class _StringTable:
+    def __init__(self):
+        self.values = []
+        self.ids = {}
+
+    def id(self, value):
+        index = self.ids.get(value)
+        if index is None:
+            index = self.ids[value] = len(self.values)
+            self.values.append(value)
+        return index
+
+
+class _NameHeap:
+    # Read-only sequence of the names in a store, decoded on access
+
+    def __init__(self, buffer, offset, count):
+        self._buffer = buffer
+        self._offsets = offset
+        self._heap = offset + (count + 1) * OFFSET.size
+        self._count = count
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("name index out of range")
+        position = self._offsets + index * OFFSET.size
+        start, = OFFSET.unpack_from(self._buffer, position)
+        stop, = OFFSET.unpack_from(self._buffer, position + OFFSET.size)
+        return self._buffer[self._heap + start:self._heap + stop].decode()
+
+
+def write_store(path, characters):
+    """
+    Write characters to a binary store, replacing any existing file.
+
+    Args:
+        path (str): File to write
+        characters (iterable): Character dicts from create_character_from_gui()
+
+    Returns:
+        int: Number of characters written
+
+    Raises:
+        ValueError: If a racial bonus is outside 0-15 or there are more
+            than 256 distinct classes or races
+    """
+    classes, races = _StringTable(), _StringTable()
+    # Names stream to a spill file as records are written; only their
+    # offsets stay in memory, 8 bytes per character
+    offsets = array('Q', [0])
+    count = 0
+    with open(path, 'wb') as f, tempfile.TemporaryFile() as heap:
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, 0, 0, 0))
+        for character in characters:
+            stats = character["stats"]
+            scores = [stats[stat]["score"] for stat in ABILITY_SCORES]
+            bonuses = [stats[stat]["racial bonus"] for stat in ABILITY_SCORES]
+            if not all(0 <= bonus <= 15 for bonus in bonuses):
+                raise ValueError(f"racial bonuses {bonuses} do not fit the binary store")
+            packed = [bonuses[i] | bonuses[i + 1] << 4 for i in range(0, 6, 2)]
+            class_id = classes.id(character["class"])
+            race_id = races.id(character["race"])
+            if class_id > 255 or race_id > 255:
+                raise ValueError("binary store supports at most 256 classes and races")
+            f.write(RECORD.pack(*scores, *packed, class_id, race_id, count))
+            offsets.append(offsets[-1] + heap.write(character["name"].encode()))
+            count += 1
+
+        names_offset = f.tell()
+        if sys.byteorder != "little":
+            offsets.byteswap()
+        f.write(offsets.tobytes())
+        heap.seek(0)
+        shutil.copyfileobj(heap, f)
+        tables_offset = f.tell()
+        f.write(json.dumps({"classes": classes.values, "races": races.values}, separators=(",", ":")).encode())
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, RECORD.size, count, names_offset, tables_offset))
+    return count
+
+
+class CharacterStore:
+    """
+    Read-only, memory-mapped view of a binary character store.
+
+    Supports len(), indexing (O(1)) and iteration, and exposes zero-copy
+    score columns through scores().
+    """
+
+    def __init__(self, path):
+        """
+        Map a store written by write_store().
+
+        Args:
+            path (str): Store file to open
+
+        Raises:
+            ValueError: If the file is not a binary character store
+        """
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, count, names_offset, tables_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECORD.size:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} binary character store")
+        self._count = count
+        self.names = _NameHeap(self._map, names_offset, count)
+        tables = json.loads(self._map[tables_offset:])
+        self.classes = tables["classes"]
+        self.races = tables["races"]
+
+    def __len__(self):
+        return self._count
+
+    def record(self, index):
+        """
+        Raw fields of one record, without building a dict.
+
+        Args:
+            index (int): Record position
+
+        Returns:
+            tuple: Six scores, six racial bonuses, class id, race id, name id
+        """
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("character index out of range")
+        fields = RECORD.unpack_from(self._map, HEADER.size + index * RECORD.size)
+        bonuses = []
+        for packed in fields[6:9]:
+            bonuses += [packed & 0x0F, packed >> 4]
+        return fields[:6], tuple(bonuses), fields[9], fields[10], fields[11]
+
+    def __getitem__(self, index):
+        """
+        Rebuild the create_character_from_gui dict for one record.
+
+        Args:
+            index (int): Record position; negative values count from the end
+
+        Returns:
+            dict: Complete character data structure
+        """
+        scores, bonuses, class_id, race_id, name_id = self.record(index)
+        character_class = self.classes[class_id]
+        stats = {
+            stat: {"score": score, "racial bonus": bonus, "modifier": _modifier(score)}
+            for stat, score, bonus in zip(ABILITY_SCORES, scores, bonuses)
+        }
+        stats["health"] = HIT_DICE[character_class] + stats["constitution"]["modifier"]
+        stats["unarmored ac"] = 10 + stats["dexterity"]["modifier"]
+        return {
+            "name": self.names[name_id],
+            "class": character_class,
+            "race": self.races[race_id],
+            "stats": stats,
+        }
+
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+
+    def scores(self, stat):
+        """
+        Zero-copy view of one ability score across every record.
+
+        Args:
+            stat (str): Ability score name
+
+        Returns:
+            int8 NumPy array, or a strided memoryview of format 'b'
+        """
+        offset = ABILITY_SCORES.index(stat)
+        if load_numpy() is not None:
+            return self.records()["scores"][:, offset]
+        end = HEADER.size + self._count * RECORD.size
+        view = memoryview(self._map).cast('b')
+        return view[HEADER.size + offset:end:RECORD.size]
+
+    def class_ids(self):
+        """
+        Zero-copy view of every record's class id, an index into self.classes.
+
+        Returns:
+            uint8 NumPy array, or a strided memoryview of format 'B'
+        """
+        return self._ids("class", 9)
+
+    def race_ids(self):
+        """
+        Zero-copy view of every record's race id, an index into self.races.
+
+        Returns:
+            uint8 NumPy array, or a strided memoryview of format 'B'
+        """
+        return self._ids("race", 10)
+
+    def _ids(self, field, offset):
+        if load_numpy() is not None:
+            return self.records()[field]
+        end = HEADER.size + self._count * RECORD.size
+        return memoryview(self._map).cast('B')[HEADER.size + offset:end:RECORD.size]
+
+    def records(self):
+        """
+        Structured NumPy view over every record (requires NumPy).
+
+        Returns:
+            numpy.ndarray: Records with scores, bonuses, class, race and name fields
+        """
+        np = load_numpy()
+        if np is None:
+            raise RuntimeError("records() requires NumPy; use scores() or indexing instead")
+        return np.frombuffer(self._map, dtype=_record_dtype(np), count=self._count, offset=HEADER.size)
+
+    def close(self):
+        """Release the mapping and the underlying file."""
+        try:
+            self._map.close()
+        except BufferError:
+            # Views from scores() are still alive; the map closes when they go
+            pass
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
@@ -0,0 +1,225 @@
+"""
+Secondary Index Over Saved Characters
+
+Keeps a manifest of saved character files plus secondary indexes on class,
+race, every ability score and health, so queries like "Half-Orc Barbarians
+with strength >= 17" only touch matching records instead of loading every
+file. The index is an append-only log next to the saved files: each save
+appends one line, and loading replays the log with the newest entry for a
+path winning. Once superseded lines outnumber the live ones, loading
+rewrites the log as a snapshot with one line per file, so repeated re-saves
+never make loading slower than the number of files.
+"""
+
+import glob
+import json
+import os
+
+from stats import ABILITY_SCORES
+
+INDEX_FILENAME = ".characters.idx"
+FIELDS = ("class", "race") + ABILITY_SCORES + ("health",)
+# Superseded log lines tolerated before load() compacts, beyond one per file
+COMPACT_SLACK = 1000
+
+
+def _in_range(value, bounds):
+    low, high = bounds
+    return value is not None and (low is None or value >= low) and (high is None or value <= high)
+
+
+def _score(entry):
+    # Nested {"score": ...} stats from main.py, or flat integers from older files
+    return entry["score"] if isinstance(entry, dict) else entry
+
+
+def index_entry(character):
+    """
+    Extract the indexed fields from a character dict.
+
+    Args:
+        character (dict): Character data dictionary
+
+    Returns:
+        tuple: Values ordered like FIELDS; missing fields are None
+    """
+    stats = character.get("stats", {})
+    return (character.get("class"), character.get("race"),
+            *(_score(stats[stat]) if stat in stats else None for stat in ABILITY_SCORES),
+            stats.get("health"))
+
+
+def index_path(filename):
+    """Index log that covers a saved character file."""
+    return os.path.join(os.path.dirname(os.path.abspath(filename)), INDEX_FILENAME)
+
+
+def record_save(filename, character):
+    """
+    Append one saved character to the index log in its directory.
+
+    Called by save_character_to_json; costs a single small append.
+
+    Args:
+        filename (str): Path the character was saved to
+        character (dict): Character data dictionary
+    """
+    line = json.dumps([os.path.basename(filename), *index_entry(character)], separators=(",", ":"))
+    with open(index_path(filename), 'a') as f:
+        f.write(line + "\n")
+
+
+class CharacterIndex:
+    """
+    In-memory manifest and secondary indexes for one directory of saves.
+
+    Each indexed value maps to the set of record ids holding it, so equality
+    lookups are a dict hit and range lookups union only the buckets whose
+    value falls in range. Remaining conditions are checked against the
+    manifest entries of the candidates only.
+    """
+
+    def __init__(self, directory="."):
+        """
+        Create an empty index for a directory.
+
+        Args:
+            directory (str): Directory holding the saved character files
+        """
+        self.directory = directory
+        self.paths = []
+        self.entries = []
+        self._ids = {}
+        self._buckets = {field: {} for field in FIELDS}
+
+    @classmethod
+    def load(cls, directory="."):
+        """
+        Replay a directory's index log, compacting it when mostly superseded.
+
+        Args:
+            directory (str): Directory holding the saved character files
+
+        Returns:
+            CharacterIndex: The loaded index, empty if there is no log
+        """
+        index = cls(directory)
+        lines = 0
+        try:
+            with open(os.path.join(directory, INDEX_FILENAME)) as f:
+                for line in f:
+                    if line.endswith("\n"):
+                        path, *entry = json.loads(line)
+                        index.add(path, tuple(entry))
+                        lines += 1
+        except FileNotFoundError:
+            pass
+        if lines - len(index) > max(COMPACT_SLACK, len(index)):
+            try:
+                index.compact()
+            except OSError:
+                # Read-only directory: keep replaying the full log
+                pass
+        return index
+
+    @classmethod
+    def rebuild(cls, directory=".", pattern="*_character.json"):
+        """
+        Build a fresh index log by loading every saved file once.
+
+        Args:
+            directory (str): Directory holding the saved character files
+            pattern (str): Glob for character files
+
+        Returns:
+            CharacterIndex: The rebuilt index
+        """
+        index = cls(directory)
+        for path in sorted(glob.glob(os.path.join(directory, pattern))):
+            with open(path) as f:
+                index.add(os.path.basename(path), index_entry(json.load(f)))
+        index.compact()
+        return index
+
+    def __len__(self):
+        return len(self._ids)
+
+    def add(self, path, entry):
+        """
+        Index or re-index one saved file.
+
+        Args:
+            path (str): File path relative to the index directory
+            entry (tuple): Values ordered like FIELDS, from index_entry()
+        """
+        record_id = self._ids.get(path)
+        if record_id is None:
+            record_id = self._ids[path] = len(self.paths)
+            self.paths.append(path)
+            self.entries.append(None)
+        else:
+            for field, value in zip(FIELDS, self.entries[record_id]):
+                self._buckets[field][value].discard(record_id)
+        self.entries[record_id] = entry
+        for field, value in zip(FIELDS, entry):
+            self._buckets[field].setdefault(value, set()).add(record_id)
+
+    def _matching(self, field, condition):
+        buckets = self._buckets[field]
+        if not isinstance(condition, tuple):
+            return buckets.get(condition, set())
+        result = set()
+        for value, ids in buckets.items():
+            if _in_range(value, condition):
+                result |= ids
+        return result
+
+    def query(self, **conditions):
+        """
+        Find saved files matching every condition.
+
+        Keyword names are fields, with "class" spelled character_class.
+        String and int values match exactly; a (low, high) tuple matches an
+        inclusive range, with None leaving that end open.
+
+        Example:
+            index.query(character_class="Barbarian", race="Half-Orc", strength=(17, None))
+
+        Returns:
+            list: Matching file paths, relative to the index directory
+        """
+        if "character_class" in conditions:
+            conditions["class"] = conditions.pop("character_class")
+        unknown = set(conditions) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"cannot query on {sorted(unknown)}; indexed fields are {FIELDS}")
+        if not conditions:
+            return sorted(self._ids)
+
+        # Equality lookups are single bucket hits, so start from the smallest
+        # of those and check the remaining conditions against just its records
+        exact = {field: value for field, value in conditions.items() if not isinstance(value, tuple)}
+        if exact:
+            field = min(exact, key=lambda name: len(self._buckets[name].get(exact[name], ())))
+            candidates = self._buckets[field].get(exact.pop(field), set())
+        else:
+            field = next(iter(conditions))
+            candidates = self._matching(field, conditions[field])
+        remaining = [(FIELDS.index(name), condition) for name, condition in conditions.items() if name != field]
+
+        result = []
+        for record_id in candidates:
+            entry = self.entries[record_id]
+            if all(_in_range(entry[position], condition) if isinstance(condition, tuple) else entry[position] == condition
+                   for position, condition in remaining):
+                result.append(record_id)
+        return [self.paths[record_id] for record_id in sorted(result)]
+
+    def compact(self):
+        """Rewrite the log with one line per indexed file."""
+        path = os.path.join(self.directory, INDEX_FILENAME)
+        temporary = path + ".tmp"
+        with open(temporary, 'w') as f:
+            for name, record_id in self._ids.items():
+                f.write(json.dumps([name, *self.entries[record_id]], separators=(",", ":")) + "\n")
+        os.replace(temporary, path)
@@ -0,0 +1,194 @@
+"""
+Streaming JSONL Character Storage
+
+Appends characters as compact one-line JSON records to rotating .jsonl
+files through a large write buffer, instead of creating one pretty-printed
+file per character. Flushes and fsyncs are batched and configurable. A
+crash can leave at most one partial line at the end of the newest file;
+opening a writer truncates it away and readers skip it.
+"""
+
+import glob
+import json
+import os
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+
+
+def segment_paths(directory, prefix="characters"):
+    """
+    List a writer's segment files in write order.
+
+    Args:
+        directory (str): Directory holding the segments
+        prefix (str): Segment filename prefix
+
+    Returns:
+        list: Segment paths, oldest first
+    """
+    return sorted(glob.glob(os.path.join(directory, f"{prefix}-[0-9][0-9][0-9][0-9][0-9].jsonl")))
+
+
+def recover(path):
+    """
+    Truncate a partially written final record left behind by a crash.
+
+    Args:
+        path (str): JSONL file to repair
+
+    Returns:
+        int: Number of bytes removed
+    """
+    with open(path, 'r+b') as f:
+        size = f.seek(0, os.SEEK_END)
+        position = size
+        block = 64 * 1024
+        # Walk backwards until the last newline; everything after it is partial
+        while position > 0:
+            start = max(0, position - block)
+            f.seek(start)
+            chunk = f.read(position - start)
+            newline = chunk.rfind(b"\n")
+            if newline != -1:
+                position = start + newline + 1
+                break
+            position = start
+        if position < size:
+            f.truncate(position)
+        return size - position
+
+
+class JsonlWriter:
+    """
+    Buffered, rotating, append-only writer for character records.
+
+    Use as a context manager, or call close() when done.
+    """
+
+    def __init__(self, directory, prefix="characters", max_bytes=DEFAULT_MAX_BYTES,
+                 buffer_size=DEFAULT_BUFFER_SIZE, flush_every=1000, fsync_every=None):
+        """
+        Open (or resume) a segment set for appending.
+
+        Args:
+            directory (str): Directory for the segment files, created if missing
+            prefix (str): Segment filename prefix
+            max_bytes (int): Size after which a new segment is started
+            buffer_size (int): Write buffer size in bytes
+            flush_every (int, optional): Records between flushes to the OS;
+                None only flushes when the buffer fills or on close
+            fsync_every (int, optional): Records between fsyncs; None never
+                fsyncs except on close
+        """
+        self.directory = directory
+        self.prefix = prefix
+        self.max_bytes = max_bytes
+        self.buffer_size = buffer_size
+        self.flush_every = flush_every
+        self.fsync_every = fsync_every
+        self.records_written = 0
+        self._file = None
+        self._size = 0
+
+        os.makedirs(directory, exist_ok=True)
+        existing = segment_paths(directory, prefix)
+        self._segment = 0
+        if existing:
+            recover(existing[-1])
+            self._segment = int(existing[-1][-11:-6])
+        self._open_segment()
+
+    @property
+    def path(self):
+        return os.path.join(self.directory, f"{self.prefix}-{self._segment:05d}.jsonl")
+
+    def _open_segment(self):
+        self._file = open(self.path, 'ab', buffering=self.buffer_size)
+        self._size = self._file.tell()
+
+    def _rotate(self):
+        self._sync()
+        self._file.close()
+        self._segment += 1
+        self._open_segment()
+
+    def _sync(self):
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def write(self, character):
+        """
+        Append one character record.
+
+        Args:
+            character (dict): Character data dictionary
+        """
+        line = json.dumps(character, separators=(",", ":")).encode() + b"\n"
+        if self._size and self._size + len(line) > self.max_bytes:
+            self._rotate()
+        self._file.write(line)
+        self._size += len(line)
+        self.records_written += 1
+
+        if self.fsync_every and self.records_written % self.fsync_every == 0:
+            self._sync()
+        elif self.flush_every and self.records_written % self.flush_every == 0:
+            self._file.flush()
+
+    def write_many(self, characters):
+        """
+        Append every character from an iterable.
+
+        Args:
+            characters (iterable): Character data dictionaries
+        """
+        for character in characters:
+            self.write(character)
+
+    def flush(self, fsync=False):
+        """
+        Push buffered records to the OS, and optionally to disk.
+
+        Args:
+            fsync (bool): Also fsync the current segment
+        """
+        if fsync:
+            self._sync()
+        else:
+            self._file.flush()
+
+    def close(self):
+        """Flush, fsync and close the current segment."""
+        if self._file is not None:
+            self._sync()
+            self._file.close()
+            self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
+
+
+def read_jsonl(path, prefix="characters"):
+    """
+    Stream character records from a JSONL file or a writer's directory.
+
+    A trailing partial record from an interrupted write is skipped.
+
+    Args:
+        path (str): A .jsonl file, or a directory of segments
+        prefix (str): Segment filename prefix when path is a directory
+
+    Yields:
+        dict: Character data dictionaries in write order
+    """
+    paths = segment_paths(path, prefix) if os.path.isdir(path) else [path]
+    for segment in paths:
+        with open(segment, 'rb') as f:
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break
+                yield json.loads(line)
@@ -0,0 +1,159 @@
+"""
+Parallel Bulk Character Loader
+
+Reads many saved character files concurrently on a thread pool and
+normalizes both on-disk shapes into the nested dict produced by
+create_character_from_gui(). Older files such as chris_character.json
+store flat integer stats; newer ones store {"score", "racial bonus",
+"modifier"} per stat. Parsed results are kept in a bounded LRU cache keyed
+by path and modification time, so reloading an unchanged file is free.
+"""
+
+import glob
+import json
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from stats import ABILITY_SCORES
+from stats.rules import HIT_DICE
+
+DEFAULT_PATTERN = "*_character.json"
+DEFAULT_WORKERS = 16
+
+
+def _modifier(score):
+    return (score - 10) // 2
+
+
+def normalize_character(data):
+    """
+    Convert either saved character shape into the nested main.py shape.
+
+    Flat stats get a racial bonus of 0 and computed modifiers. Health and
+    unarmored AC are filled in when missing, with health left as None if
+    the class is unknown.
+
+    Args:
+        data (dict): Character data as read from disk
+
+    Returns:
+        dict: Character with "name", "class", "race" and nested "stats"
+    """
+    source = data.get("stats", {})
+    stats = {}
+    for stat in ABILITY_SCORES:
+        entry = source.get(stat)
+        if isinstance(entry, dict):
+            score = entry["score"]
+            stats[stat] = {
+                "score": score,
+                "racial bonus": entry.get("racial bonus", 0),
+                "modifier": entry.get("modifier", _modifier(score)),
+            }
+        elif entry is not None:
+            stats[stat] = {"score": entry, "racial bonus": 0, "modifier": _modifier(entry)}
+
+    character_class = data.get("class")
+    health = source.get("health")
+    if health is None and character_class in HIT_DICE and "constitution" in stats:
+        health = HIT_DICE[character_class] + stats["constitution"]["modifier"]
+    unarmored_ac = source.get("unarmored ac")
+    if unarmored_ac is None and "dexterity" in stats:
+        unarmored_ac = 10 + stats["dexterity"]["modifier"]
+    stats["health"] = health
+    stats["unarmored ac"] = unarmored_ac
+
+    return {
+        "name": data.get("name"),
+        "class": character_class,
+        "race": data.get("race"),
+        "stats": stats,
+    }
+
+
+class LoadCache:
+    """
+    Thread-safe LRU cache of normalized characters keyed by (path, mtime).
+    """
+
+    def __init__(self, maxsize=100_000):
+        """
+        Args:
+            maxsize (int): Most files kept before evicting the least recent
+        """
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, path, mtime):
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == mtime:
+                self._entries.move_to_end(path)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            return None
+
+    def put(self, path, mtime, character):
+        with self._lock:
+            self._entries[path] = (mtime, character)
+            self._entries.move_to_end(path)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+DEFAULT_CACHE = LoadCache()
+
+
+def _load_one(path, cache):
+    path = os.path.abspath(path)
+    mtime = os.stat(path).st_mtime_ns
+    character = cache.get(path, mtime)
+    if character is None:
+        with open(path, 'rb') as f:
+            character = normalize_character(json.load(f))
+        cache.put(path, mtime, character)
+    return character
+
+
+def _expand(paths_or_dir, pattern):
+    if isinstance(paths_or_dir, (str, os.PathLike)):
+        if os.path.isdir(paths_or_dir):
+            return sorted(glob.glob(os.path.join(paths_or_dir, pattern)))
+        return [paths_or_dir]
+    return list(paths_or_dir)
+
+
+def load_characters(paths_or_dir, workers=DEFAULT_WORKERS, cache=DEFAULT_CACHE, pattern=DEFAULT_PATTERN):
+    """
+    Load and normalize many character files concurrently.
+
+    Returned dicts are shared with the cache; copy one before mutating it.
+
+    Args:
+        paths_or_dir (str | iterable): A directory, a single file, or file paths
+        workers (int): Reader threads
+        cache (LoadCache, optional): Cache to use; None disables caching
+        pattern (str): Glob used when a directory is given
+
+    Returns:
+        list: Normalized character dicts in path order
+    """
+    paths = _expand(paths_or_dir, pattern)
+    cache = cache if cache is not None else LoadCache(maxsize=0)
+    if len(paths) <= 1 or workers <= 1:
+        return [_load_one(path, cache) for path in paths]
+    with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+        return list(pool.map(_load_one, paths, [cache] * len(paths)))
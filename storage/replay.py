@@ -0,0 +1,194 @@
+"""
+Seed Replay Character Store
+
+Stores characters made in replay mode (create_character_from_gui(...,
+seed=...)) as 16-byte recipes - seed, class, race, racial choices and a
+name id - instead of their full stats. Every character is regenerated
+exactly from its recipe on demand; regenerate() rebuilds many at once, one
+columnar batch per class, race and racial choice combination.
+
+File layout:
+    header (32 bytes) | recipes (16 bytes each) | string tables (JSON)
+"""
+
+import json
+import mmap
+import struct
+from array import array
+
+from stats import ABILITY_SCORES
+from stats.races import RACES
+from stats.replay import check_seed, replay_scores
+
+MAGIC = b"SCRP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHQQ8x")
+RECIPE = struct.Struct("<QBBBBI")
+NO_CHOICE = 0xFF
+
+
+def racial_choices(character):
+    """
+    Recover the racial choice stats from a character's racial bonuses.
+
+    Args:
+        character (dict): Character from create_character_from_gui()
+
+    Returns:
+        tuple: (racial_choice1, racial_choice2), None where there is no choice
+    """
+    race = RACES[character["race"]]
+    if "choice" not in race:
+        return None, None
+    chosen = []
+    for stat in ABILITY_SCORES:
+        extra = character["stats"][stat]["racial bonus"] - race[stat]
+        chosen.extend([stat] * (extra // race["choice bonus"]))
+    chosen += [None, None]
+    return chosen[0], chosen[1]
+
+
+def write_recipes(path, characters):
+    """
+    Write replay-mode characters to a recipe store.
+
+    Args:
+        path (str): Destination file
+        characters (iterable): Character dicts carrying a "seed"
+
+    Returns:
+        int: Number of recipes written
+
+    Raises:
+        ValueError: If a character has no seed, or one outside 64 bits
+    """
+    names, classes, races = {}, {}, {}
+    abilities = {stat: index for index, stat in enumerate(ABILITY_SCORES)}
+    records = bytearray()
+    count = 0
+    for character in characters:
+        if "seed" not in character:
+            raise ValueError(f"{character.get('name')!r} was not created in replay mode and has no seed")
+        check_seed(character["seed"], f"seed of {character.get('name')!r}")
+        choice1, choice2 = racial_choices(character)
+        records += RECIPE.pack(
+            character["seed"],
+            classes.setdefault(character["class"], len(classes)),
+            races.setdefault(character["race"], len(races)),
+            abilities.get(choice1, NO_CHOICE),
+            abilities.get(choice2, NO_CHOICE),
+            names.setdefault(character["name"], len(names)),
+        )
+        count += 1
+    tables = json.dumps({"names": list(names), "classes": list(classes), "races": list(races),
+                         "abilities": list(ABILITY_SCORES)}).encode()
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, RECIPE.size, count, HEADER.size + len(records)))
+        f.write(records)
+        f.write(tables)
+    return count
+
+
+class RecipeStore:
+    """
+    Read-only, memory-mapped recipe store.
+
+    Indexing regenerates one character; regenerate() rebuilds many in batches.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Store written by write_recipes()
+
+        Raises:
+            ValueError: If the file is not a recipe store
+        """
+        self._file = open(path, 'rb')
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, record_size, count, tables_offset = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC or version != VERSION or record_size != RECIPE.size:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} recipe store")
+        self._count = count
+        tables = json.loads(self._map[tables_offset:])
+        self.names = tables["names"]
+        self.classes = tables["classes"]
+        self.races = tables["races"]
+        self.abilities = tables["abilities"] + [None] * (NO_CHOICE + 1 - len(tables["abilities"]))
+
+    def __len__(self):
+        return self._count
+
+    def _position(self, index):
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("recipe index out of range")
+        return index
+
+    def recipe(self, index):
+        """
+        The stored recipe for one character.
+
+        Returns:
+            dict: seed, name, class, race and racial choices
+        """
+        seed, class_id, race_id, choice1, choice2, name_id = RECIPE.unpack_from(
+            self._map, HEADER.size + self._position(index) * RECIPE.size)
+        return {"seed": seed, "name": self.names[name_id], "class": self.classes[class_id],
+                "race": self.races[race_id], "racial choices": (self.abilities[choice1], self.abilities[choice2])}
+
+    def __getitem__(self, index):
+        return self.regenerate([index])[0]
+
+    def __iter__(self):
+        for start in range(0, self._count, 10_000):
+            yield from self.regenerate(range(start, min(start + 10_000, self._count)))
+
+    def regenerate(self, indices=None):
+        """
+        Rebuild characters from their recipes, batched by class, race and choices.
+
+        Args:
+            indices (iterable, optional): Positions to rebuild; all by default
+
+        Returns:
+            list: create_character_from_gui() dicts, "seed" included, in the order asked
+        """
+        from characters.batch import CharacterBatch
+
+        if indices is None:
+            end = HEADER.size + self._count * RECIPE.size
+            records = list(RECIPE.iter_unpack(self._map[HEADER.size:end]))
+        else:
+            records = [RECIPE.unpack_from(self._map, HEADER.size + self._position(index) * RECIPE.size)
+                       for index in indices]
+        # Group by the raw ids; names are looked up only for the output
+        groups = {}
+        for position, (seed, class_id, race_id, choice1, choice2, name_id) in enumerate(records):
+            groups.setdefault((class_id, race_id, choice1, choice2), []).append((position, seed, name_id))
+
+        results = [None] * len(records)
+        for (class_id, race_id, choice1, choice2), members in groups.items():
+            scores = [replay_scores(seed) for _, seed, _ in members]
+            columns = [array('b', column) for column in zip(*scores)]
+            batch = CharacterBatch(columns, self.classes[class_id], self.races[race_id],
+                                   self.abilities[choice1], self.abilities[choice2])
+            for offset, (position, seed, name_id) in enumerate(members):
+                character = batch[offset]
+                character["name"] = self.names[name_id]
+                character["seed"] = seed
+                results[position] = character
+        return results
+
+    def close(self):
+        """Release the mapping and the underlying file."""
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.close()
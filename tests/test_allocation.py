@@ -0,0 +1,52 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from characters.allocation import (CLASS_WEIGHTS, POINT_BUY_BUDGET, POINT_BUY_COSTS, STANDARD_ARRAY,
+                                   best_allocation, top_allocations)
+from stats import ABILITY_SCORES
+
+
+def weighted(character_class):
+    weights = [CLASS_WEIGHTS[character_class][stat] for stat in ABILITY_SCORES]
+    return lambda scores: sum(weight * (score - 10) / 2 for weight, score in zip(weights, scores))
+
+
+@pytest.mark.parametrize("method", ["point buy", "standard array"])
+def test_dynamic_program_matches_exhaustive_search(method):
+    fast = top_allocations("Wizard", "High Elf", method, k=3)
+    slow = top_allocations("Wizard", "High Elf", method, objective=weighted("Wizard"), k=3, monotone=False)
+    assert [round(entry["value"], 9) for entry in fast] == [round(entry["value"], 9) for entry in slow]
+    assert fast[0]["value"] >= fast[1]["value"] >= fast[2]["value"]
+
+
+def test_point_buy_stays_in_budget_and_uses_choices():
+    entry = top_allocations("Wizard", "Half Elf", k=1)[0]
+    bases = entry["base scores"]
+    assert sum(POINT_BUY_COSTS[base] for base in bases.values()) <= POINT_BUY_BUDGET
+    assert "intelligence" in entry["racial choices"]
+    stats = entry["character"]["stats"]
+    assert stats["intelligence"]["score"] == bases["intelligence"] + stats["intelligence"]["racial bonus"]
+
+
+def test_best_allocation_is_a_gui_character():
+    character = best_allocation("Fighter", "Human", "standard array", name="Ser")
+    assert character["name"] == "Ser" and character["class"] == "Fighter"
+    bases = sorted(character["stats"][stat]["score"] - 1 for stat in ABILITY_SCORES)
+    assert bases == sorted(STANDARD_ARRAY)
+    assert character["stats"]["strength"]["score"] == 16
+    assert character["stats"]["health"] == 10 + character["stats"]["constitution"]["modifier"]
+
+
+def test_per_stat_functions_and_unknown_method():
+    dump_strength = {"strength": lambda score: -score}
+    entry = top_allocations("Fighter", "Hill Dwarf", objective=dump_strength, k=1)[0]
+    assert entry["base scores"]["strength"] == 8
+    with pytest.raises(ValueError):
+        top_allocations("Fighter", "Human", "roll")
+
+def test_table_caches_are_bounded():
+    from characters import allocation
+    for weight in range(allocation.TABLE_CACHE_SIZE + 10):
+        top_allocations("Wizard", "Human", objective={"intelligence": weight + 1}, k=1)
+    assert allocation._point_buy_table.cache_info().currsize <= allocation.TABLE_CACHE_SIZE
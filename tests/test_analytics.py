@@ -0,0 +1,46 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fractions import Fraction
+from stats.analytics import (array_distribution, joint_distribution, modifier_sum_distribution, order_statistic_distribution,
+                             percentile_of, race_effect, stat_distribution, total_distribution)
+from main import create_character_from_gui
+
+def test_stat_distribution_is_exact():
+    distribution = stat_distribution()
+    assert sum(distribution.values()) == 1
+    assert distribution[3] == Fraction(1, 1296)
+    assert distribution[18] == Fraction(21, 1296)
+
+def test_total_and_order_statistics_sum_to_one():
+    assert sum(total_distribution().values()) == 1
+    for rank in range(1, 7):
+        assert sum(order_statistic_distribution(rank).values()) == 1
+
+def test_percentile_of_bounds():
+    low = {"stats": {stat: 3 for stat in ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma")}}
+    high = {"stats": {stat: 18 for stat in ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma")}}
+    assert percentile_of(low) < 0.001
+    assert percentile_of(high) > 99.999
+
+def test_percentile_of_gui_character():
+    character = create_character_from_gui("x", "Bard", "Half Elf", "dexterity", "wisdom")
+    assert 0 <= percentile_of(character) <= 100
+    assert 0 <= percentile_of(character, "modifier sum") <= 100
+
+def test_race_effect():
+    assert race_effect("Human")["total shift"] == 6
+    assert race_effect("Half Elf", "strength", "dexterity")["total shift"] == 4
+
+def test_joint_distribution_matches_the_marginals():
+    arrays = array_distribution()
+    assert len(arrays) == 54264
+    assert sum(arrays.values()) == 1
+    assert arrays[(18,) * 6] == Fraction(21, 1296) ** 6
+    assert joint_distribution(sum) == total_distribution()
+    assert joint_distribution(lambda array: array[2]) == order_statistic_distribution(3)
+    modifiers = joint_distribution(lambda array: sum((score - 10) // 2 for score in array))
+    assert modifiers == modifier_sum_distribution()
+    best_and_total = joint_distribution(lambda array: (array[0], sum(array)))
+    assert best_and_total[(3, 18)] == Fraction(1, 1296) ** 6
+    assert sum(p for (best, total), p in best_and_total.items() if best == 18) == order_statistic_distribution(1)[18]
@@ -0,0 +1,49 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from characters.batch import generate_characters
+from main import load_character_from_json
+from storage.archive import ArchiveWriter, CharacterArchive, export_archive, import_archive
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.mark.parametrize("codec", ["zlib", "lzma"])
+def test_random_access_and_parallel_read(tmp_path, codec):
+    characters = list(generate_characters(1000, "Monk", "Wood Elf", seed=8))
+    path = str(tmp_path / "roster.scar")
+    with ArchiveWriter(path, codec=codec, block_size=64) as writer:
+        writer.extend(characters)
+    with CharacterArchive(path) as archive:
+        assert len(archive) == 1000 and archive.block_count == 16
+        assert archive[0] == characters[0]
+        assert archive[777] == characters[777]
+        assert archive[-1] == characters[-1]
+        assert archive.read_all(workers=4) == characters
+        with pytest.raises(IndexError):
+            archive[1000]
+    assert os.path.getsize(path) < sum(len(repr(character)) for character in characters) / 4
+
+
+def test_corrupt_block_is_detected(tmp_path):
+    path = str(tmp_path / "roster.scar")
+    with ArchiveWriter(path, block_size=10) as writer:
+        writer.extend(generate_characters(30, "Bard", "Human", seed=1))
+    with open(path, 'r+b') as f:
+        f.seek(40)
+        byte = f.read(1)
+        f.seek(40)
+        f.write(bytes([byte[0] ^ 0xFF]))
+    with CharacterArchive(path) as archive:
+        with pytest.raises(ValueError):
+            archive[0]
+        assert archive[25]["class"] == "Bard"
+
+
+def test_export_import_round_trip(tmp_path):
+    sources = [os.path.join(REPO, "chris_character.json"), os.path.join(REPO, "test_character.json")]
+    path = str(tmp_path / "saves.scar")
+    assert export_archive(sources, path) == 2
+    written = import_archive(path, str(tmp_path / "restored"), index=False)
+    assert [load_character_from_json(p) for p in written] == [load_character_from_json(p) for p in sources]
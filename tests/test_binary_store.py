@@ -0,0 +1,35 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.binary import CharacterStore, write_store
+from main import create_character_from_gui, generate_characters
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "characters.bin")
+    characters = [create_character_from_gui(f"Hero {i}", "Paladin", "Half Elf", "strength", "wisdom") for i in range(20)]
+    characters += list(generate_characters(30, "Wizard", "Rock Gnome", seed=2))
+    assert write_store(path, characters) == 50
+    with CharacterStore(path) as store:
+        assert len(store) == 50
+        assert list(store) == characters
+        assert store[-1] == characters[-1]
+
+def test_score_column_view(tmp_path):
+    path = str(tmp_path / "characters.bin")
+    characters = list(generate_characters(100, "Fighter", "Human", seed=4))
+    write_store(path, characters)
+    with CharacterStore(path) as store:
+        column = store.scores("wisdom")
+        assert [int(score) for score in column] == [c["stats"]["wisdom"]["score"] for c in characters]
+        del column
+
+def test_names_are_read_from_the_heap(tmp_path):
+    path = str(tmp_path / "characters.bin")
+    characters = [create_character_from_gui(name, "Bard", "Human", "charisma", "dexterity")
+                  for name in ("Ånna", "", "Ånna", "Bo")]
+    write_store(path, characters)
+    with CharacterStore(path) as store:
+        assert len(store.names) == 4
+        assert [store.names[i] for i in range(4)] == ["Ånna", "", "Ånna", "Bo"]
+        assert store.names[-1] == "Bo"
+        assert [character["name"] for character in store] == ["Ånna", "", "Ånna", "Bo"]
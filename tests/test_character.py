@@ -0,0 +1,56 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from characters.character import Character, affected_fields
+from main import create_character_from_gui
+
+def test_dict_round_trip():
+    character = create_character_from_gui("Ada", "Sorcerer", "Variant Human", "charisma", "dexterity")
+    record = Character.from_dict(character)
+    assert record.to_dict() == character
+    assert record.charisma == character["stats"]["charisma"]["score"]
+    assert record.race == "Variant Human"
+
+def test_derived_fields_follow_score_changes():
+    record = Character("Bo", "Fighter", "Human", [10, 14, 16, 8, 12, 9])
+    assert record.health == 13
+    assert record.unarmored_ac == 12
+    record.set_score("constitution", 8)
+    record.set_score("dexterity", 9)
+    assert record.modifiers[2] == -1
+    assert record.health == 9
+    assert record.unarmored_ac == 9
+
+def test_slots_prevent_per_instance_dict():
+    record = Character("Bo", "Fighter", "Human", [10] * 6)
+    assert not hasattr(record, "__dict__")
+
+def test_affected_fields_follow_dependency_graph():
+    assert affected_fields("constitution") == ["constitution", "constitution modifier", "health"]
+    assert affected_fields("dexterity") == ["dexterity", "dexterity modifier", "unarmored ac"]
+    assert affected_fields("wisdom") == ["wisdom", "wisdom modifier"]
+
+def test_reroll_keeps_racial_bonus_and_other_stats():
+    record = Character.from_dict(create_character_from_gui("Cy", "Cleric", "Hill Dwarf"))
+    before = record.scores
+    health = record.health
+    assert record.reroll("wisdom") == ["wisdom", "wisdom modifier"]
+    assert record.scores[:4] == before[:4] and record.scores[5] == before[5]
+    assert 4 <= record.wisdom <= 19
+    assert record.health == health
+
+def test_scores_and_names_are_validated():
+    import pytest
+    with pytest.raises(ValueError, match="strength score 300"):
+        Character("A", "Wizard", "Human", (300, 10, 10, 10, 10, 10))
+    with pytest.raises(ValueError, match="expected 6"):
+        Character("A", "Wizard", "Human", (10, 10, 10))
+    with pytest.raises(ValueError, match="unknown class"):
+        Character("A", "Necromancer", "Human", (10,) * 6)
+    with pytest.raises(ValueError, match="unknown race"):
+        Character("A", "Wizard", "Gnoll", (10,) * 6)
+    character = Character("A", "Wizard", "Human", (10,) * 6, (1,) * 6)
+    with pytest.raises(ValueError, match="dexterity score 0"):
+        character.set_score("dexterity", 0)
+    assert character.scores == (10,) * 6
+    assert Character("B", "Wizard", "Human", (10,) * 6, (1,) * 6).racial_bonus is character.racial_bonus
@@ -0,0 +1,41 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from characters.constrained import acceptance_probability, generate_constrained
+from stats.analytics import stat_distribution
+from stats.roll_stat_dice import roll_4d6_drop_lowest_between
+
+
+def test_conditional_rolls_stay_in_range_and_keep_proportions():
+    rolls = roll_4d6_drop_lowest_between(30_000, 15, 17, seed=2).tolist()
+    assert set(rolls) == {15, 16, 17}
+    distribution = stat_distribution()
+    within = sum(distribution[score] for score in (15, 16, 17))
+    for score in (15, 16, 17):
+        assert abs(rolls.count(score) / len(rolls) - float(distribution[score] / within)) < 0.015
+
+
+def test_generate_constrained_meets_bounds_after_racial_bonus():
+    minimums = {"strength": 15, "charisma": 14}
+    batch = generate_constrained(500, "Paladin", "Half Elf", "strength", "constitution", minimums=minimums, seed=4)
+    assert len(batch) == 500
+    assert min(batch.scores["strength"]) >= 15
+    assert min(batch.scores["charisma"]) >= 14
+    # Half Elf gives +1 strength and +2 charisma, so 14 and 12 must be rolled
+    distribution = stat_distribution()
+    expected = sum(p for score, p in distribution.items() if score >= 14) * \
+        sum(p for score, p in distribution.items() if score >= 12)
+    assert batch.acceptance_probability == expected
+    assert batch[0]["stats"]["strength"]["racial bonus"] == 1
+
+
+def test_rare_and_impossible_constraints():
+    everything = {stat: 18 for stat in ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma")}
+    # Human +1 everywhere: every roll must be 17 or 18
+    top = stat_distribution()[17] + stat_distribution()[18]
+    assert acceptance_probability("Human", minimums=everything) == top ** 6
+    batch = generate_constrained(3, "Fighter", "Human", minimums={stat: 19 for stat in everything}, seed=1)
+    assert all(score == 19 for score in batch.scores["wisdom"])
+    with pytest.raises(ValueError):
+        generate_constrained(1, "Fighter", "Human", minimums={"strength": 20})
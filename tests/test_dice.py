@@ -0,0 +1,86 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from fractions import Fraction
+from itertools import product
+import pytest
+from characters.batch import generate_characters
+from main import create_character_from_gui
+from stats import roll_stat_dice
+from stats.analytics import stat_distribution
+from stats.dice import compile_dice
+from stats.roll_stat_dice import _drop_lowest_table, roll_4d6_drop_lowest_batch, roll_ability_score, set_stat_expression
+
+
+def _brute_force(sides, count, keep, reroll_once=()):
+    # Exact distribution by enumerating every first and second roll
+    counts = {}
+    for rolls in product(range(1, sides + 1), repeat=2 * count):
+        dice = [second if first in reroll_once else first for first, second in zip(rolls[::2], rolls[1::2])]
+        total = keep(sorted(dice))
+        counts[total] = counts.get(total, 0) + 1
+    outcomes = sides ** (2 * count)
+    return {total: Fraction(ways, outcomes) for total, ways in counts.items()}
+
+
+def test_default_expression_matches_4d6_drop_lowest():
+    dice = compile_dice("4d6dl1")
+    assert dice is compile_dice("4d6dl1")
+    assert dice.table == _drop_lowest_table(6)
+    assert dice.distribution() == stat_distribution()
+    assert list(dice.roll_batch(500, seed=7)) == list(roll_4d6_drop_lowest_batch(500, seed=7))
+
+
+@pytest.mark.parametrize("expression, keep, reroll_once", [
+    ("3d6kh2", lambda dice: sum(dice[1:]), ()),
+    ("3d4kl1+3", lambda dice: dice[0] + 3, ()),
+    ("3d4ro1d1", lambda dice: sum(dice[1:]), (1,)),
+    ("2d6ro<2", sum, (1, 2)),
+])
+def test_distributions_are_exact(expression, keep, reroll_once):
+    sides = int(expression.split("d")[1][0])
+    count = int(expression[0])
+    assert compile_dice(expression).distribution() == _brute_force(sides, count, keep, reroll_once)
+
+
+def test_reroll_until_and_large_expressions():
+    assert set(compile_dice("4d6r1dl1").distribution()) == set(range(6, 19))
+    sums = compile_dice("20d6")
+    assert sums.table is None and sums.typecode == 'b'
+    assert sum(value * chance for value, chance in sums.distribution().items()) == 70
+    kept = compile_dice("10d6kh3")
+    assert kept.distribution() == compile_dice("10d6k3").distribution()
+    wide = compile_dice("10d20-1d4")
+    rolls = wide.roll_batch(1000, seed=1)
+    assert wide.typecode == 'h' and all(6 <= roll <= 199 for roll in rolls)
+    assert list(rolls) == list(wide.roll_batch(1000, seed=1))
+    assert all(3 <= kept.roll() <= 18 for _ in range(100))
+
+
+@pytest.mark.parametrize("expression", ["", "4d", "2d6 3", "d0", "4d6kh5", "1d6r<6", "4d6r1ro2", "4d6k1d1", "abc"])
+def test_invalid_expressions(expression):
+    with pytest.raises(ValueError):
+        compile_dice(expression)
+
+
+def test_configured_stat_expression():
+    try:
+        set_stat_expression("2d20kl1+3")
+        assert all(4 <= roll_ability_score() <= 23 for _ in range(200))
+        batch = generate_characters(100, "Fighter", "Human", seed=5)
+        assert all(5 <= character["stats"]["wisdom"]["score"] <= 24 for character in batch)
+        with pytest.raises(ValueError):
+            set_stat_expression("9d20")
+        # Scores below 1, or above 127 once a racial bonus is added
+        for expression in ("1d4-5", "1d1+126"):
+            with pytest.raises(ValueError):
+                set_stat_expression(expression)
+        with pytest.raises(ValueError):
+            create_character_from_gui("Vex", "Ranger", "Human", seed=1)
+        set_stat_expression("4d6kh3")
+        assert create_character_from_gui("Vex", "Ranger", "Human", seed=1)["seed"] == 1
+        set_stat_expression("2d20kl1+3")
+        assert roll_stat_dice.stat_dice() is compile_dice("2d20kl1+3")
+    finally:
+        set_stat_expression()
+    assert roll_stat_dice.stat_dice().table == _drop_lowest_table(6)
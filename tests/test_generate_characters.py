@@ -0,0 +1,38 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import builtins
+from main import create_character, generate_characters, create_character_from_gui
+
+def test_generate_characters_shape():
+    batch = generate_characters(50, "Wizard", "Human", seed=3)
+    assert len(batch) == 50
+    for stat in ("strength", "dexterity", "constitution", "intelligence", "wisdom", "charisma"):
+        assert len(batch.scores[stat]) == 50
+        assert min(batch.scores[stat]) >= 4 and max(batch.scores[stat]) <= 19
+
+def test_generate_characters_matches_gui_dict():
+    character = generate_characters(10, "Barbarian", "Half Elf", "strength", "constitution", seed=3)[4]
+    reference = create_character_from_gui("x", "Barbarian", "Half Elf", "strength", "constitution")
+    assert character.keys() == reference.keys()
+    assert character["stats"].keys() == reference["stats"].keys()
+    assert character["stats"]["strength"]["racial bonus"] == 1
+    assert character["stats"]["charisma"]["racial bonus"] == 2
+    con = character["stats"]["constitution"]
+    assert con["modifier"] == (con["score"] - 10) // 2
+    assert character["stats"]["health"] == 12 + con["modifier"]
+    assert character["stats"]["unarmored ac"] == 10 + character["stats"]["dexterity"]["modifier"]
+
+def test_generate_characters_is_seeded():
+    first = generate_characters(20, "Rogue", "Drow", seed=9)
+    second = generate_characters(20, "Rogue", "Drow", seed=9)
+    assert list(first) == list(second)
+
+def test_create_character_prompts(monkeypatch):
+    answers = iter(["Vex", "Wizard", "Elf", "Half Elf", "intelligence", "intelligence", "dexterity"])
+    monkeypatch.setattr(builtins, "input", lambda prompt="": next(answers))
+    character = create_character()
+    assert (character["name"], character["class"], character["race"]) == ("Vex", "Wizard", "Half Elf")
+    assert character["stats"]["intelligence"]["racial bonus"] == 1
+    assert character["stats"]["dexterity"]["racial bonus"] == 1
+    assert "seed" not in character
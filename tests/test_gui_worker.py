@@ -0,0 +1,74 @@
+import os
+import sys
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from gui_worker import BackgroundWorker
+
+class FakeRoot:
+    """Stands in for tk.Tk, running after() callbacks when pumped."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, ms, callback, *args):
+        self.scheduled.append((callback, args))
+
+    def pump(self):
+        scheduled, self.scheduled = self.scheduled, []
+        for callback, args in scheduled:
+            callback(*args)
+
+def test_results_are_delivered_through_after():
+    root = FakeRoot()
+    worker = BackgroundWorker(root)
+    results = []
+    worker.submit(sum, [1, 2, 3], callback=results.append)
+    worker.stop()
+    root.pump()
+    assert results == [6]
+
+def test_jobs_with_the_same_key_are_coalesced():
+    root = FakeRoot()
+    worker = BackgroundWorker(root)
+    gate = threading.Event()
+    written = []
+    worker.submit(gate.wait)
+    for version in range(5):
+        worker.submit(written.append, version, key="save")
+    gate.set()
+    worker.stop()
+    assert written == [4]
+
+def test_close_finishes_saves_and_delivers_their_callbacks():
+    root = FakeRoot()
+    worker = BackgroundWorker(root)
+    gate = threading.Event()
+    written, saved, closed = [], [], []
+    worker.submit(gate.wait, key=("save", "first"))
+    worker.submit(written.append, "a", callback=saved.append, key=("save", "a.json"))
+    worker.submit(written.append, "rolled", key="generate")
+    worker.close(lambda: closed.append(True), keep=lambda key: key[0] == "save")
+    worker.submit(written.append, "late")
+    root.pump()
+    assert not closed
+    gate.set()
+    for _ in range(500):
+        if closed:
+            break
+        root.pump()
+        threading.Event().wait(0.01)
+    assert closed == [True]
+    assert written == ["a"]
+    assert saved == [None]
+
+def test_close_gives_up_after_the_timeout():
+    root = FakeRoot()
+    worker = BackgroundWorker(root)
+    gate = threading.Event()
+    closed = []
+    worker.submit(gate.wait)
+    worker.close(lambda: closed.append(True), timeout=0)
+    root.pump()
+    root.pump()
+    assert closed == [True]
+    gate.set()
@@ -0,0 +1,48 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from array import array
+from fractions import Fraction
+import pytest
+from characters.batch import generate_characters
+from stats.constitution import calculate_health
+from stats.health import hit_point_distribution, hit_point_progression, hit_points, probability_at_least
+
+
+def test_level_one_matches_calculate_health_and_average_rule():
+    assert hit_points("Wizard", 2, 1) == calculate_health("Wizard", 2)
+    # d6 averages 4 per level after the first
+    assert hit_points("Wizard", 2, 5) == 8 + 4 * 6
+    # Each level gains at least 1 hit point
+    assert hit_points("Wizard", -4, 3) == 2 + 1 + 1
+
+
+def test_progression_columns_match_scalar_rules():
+    modifiers = array('b', [-1, 0, 3])
+    columns = hit_point_progression("Fighter", modifiers, levels=20)
+    assert len(columns) == 20
+    assert list(columns[-1]) == [hit_points("Fighter", modifier, 20) for modifier in modifiers]
+    rolled = hit_point_progression("Fighter", modifiers, levels=4, rule="rolled", seed=3)
+    for level, column in enumerate(rolled):
+        for modifier, hp in zip(modifiers, column):
+            assert (10 + modifier) + level * max(1, 1 + modifier) <= hp <= (10 + modifier) + level * (10 + modifier)
+    assert [list(column) for column in rolled] == \
+        [list(column) for column in hit_point_progression("Fighter", modifiers, levels=4, rule="rolled", seed=3)]
+
+
+def test_exact_distribution_agrees_with_batch_simulation():
+    distribution = hit_point_distribution("Cleric", 1, 3)
+    assert sum(distribution.values()) == 1
+    assert distribution[min(distribution)] == Fraction(1, 64)
+    batch = generate_characters(20_000, "Cleric", "Human", seed=5)
+    simulated = batch.hit_points(levels=10, rule="rolled", seed=6)[9]
+    expected = probability_at_least("Cleric", 60, 10, constitution_bonus=1)
+    observed = sum(1 for hp in simulated if hp >= 60) / len(simulated)
+    assert abs(observed - float(expected)) < 0.02
+
+
+def test_invalid_levels_and_rules():
+    with pytest.raises(ValueError):
+        hit_points("Rogue", 0, 21)
+    with pytest.raises(ValueError):
+        hit_point_distribution("Rogue", 0, 5, rule="maximum")
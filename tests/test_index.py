@@ -0,0 +1,53 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.index import CharacterIndex
+from main import save_character_to_json, generate_characters
+
+def test_saves_are_indexed_incrementally(tmp_path):
+    characters = list(generate_characters(40, "Barbarian", "Half-Orc", seed=6))
+    characters += list(generate_characters(40, "Wizard", "High Elf", seed=6))
+    for number, character in enumerate(characters):
+        save_character_to_json(character, str(tmp_path / f"c{number}_character.json"))
+
+    index = CharacterIndex.load(str(tmp_path))
+    assert len(index) == 80
+    found = index.query(character_class="Barbarian", race="Half-Orc", strength=(17, None))
+    expected = [f"c{n}_character.json" for n, c in enumerate(characters)
+                if c["class"] == "Barbarian" and c["stats"]["strength"]["score"] >= 17]
+    assert sorted(found) == sorted(expected)
+    assert len(index.query(race="High Elf")) == 40
+    assert len(index.query(dexterity=(None, 30))) == 80
+
+def test_resave_replaces_entry(tmp_path):
+    character = generate_characters(1, "Rogue", "Drow", seed=1)[0]
+    path = str(tmp_path / "rogue_character.json")
+    save_character_to_json(character, path)
+    character["class"] = "Bard"
+    save_character_to_json(character, path)
+    index = CharacterIndex.load(str(tmp_path))
+    assert index.query(character_class="Rogue") == []
+    assert index.query(character_class="Bard") == ["rogue_character.json"]
+
+def test_rebuild_reads_flat_files(tmp_path):
+    repo = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.path.join(repo, "chris_character.json")) as f:
+        (tmp_path / "chris_character.json").write_text(f.read())
+    index = CharacterIndex.rebuild(str(tmp_path))
+    assert index.query(strength=16) == ["chris_character.json"]
+
+def test_load_compacts_a_mostly_superseded_log(tmp_path, monkeypatch):
+    from storage import index as index_module
+    monkeypatch.setattr(index_module, "COMPACT_SLACK", 5)
+    characters = generate_characters(3, "Fighter", "Human", seed=2)
+    for _ in range(2):
+        for number, character in enumerate(characters):
+            save_character_to_json(character, str(tmp_path / f"c{number}_character.json"))
+    log = tmp_path / index_module.INDEX_FILENAME
+    assert len(CharacterIndex.load(str(tmp_path))) == 3
+    assert len(log.read_text().splitlines()) == 6
+    for number, character in enumerate(characters):
+        save_character_to_json(character, str(tmp_path / f"c{number}_character.json"))
+    index = CharacterIndex.load(str(tmp_path))
+    assert len(log.read_text().splitlines()) == 3
+    assert index.query(character_class="Fighter") == CharacterIndex.load(str(tmp_path)).query(character_class="Fighter")
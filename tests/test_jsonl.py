@@ -0,0 +1,25 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.jsonl import JsonlWriter, read_jsonl, segment_paths
+from main import generate_characters
+
+def test_round_trip_with_rotation(tmp_path):
+    characters = list(generate_characters(200, "Cleric", "Hill Dwarf", seed=1))
+    with JsonlWriter(str(tmp_path), max_bytes=4096) as writer:
+        writer.write_many(characters)
+    assert len(segment_paths(str(tmp_path))) > 1
+    assert list(read_jsonl(str(tmp_path))) == characters
+
+def test_partial_record_is_recovered(tmp_path):
+    characters = list(generate_characters(5, "Cleric", "Hill Dwarf", seed=1))
+    with JsonlWriter(str(tmp_path)) as writer:
+        writer.write_many(characters)
+    path = segment_paths(str(tmp_path))[-1]
+    with open(path, 'ab') as f:
+        f.write(b'{"name":"Half wri')
+    assert list(read_jsonl(path)) == characters
+
+    with JsonlWriter(str(tmp_path)) as writer:
+        writer.write(characters[0])
+    assert list(read_jsonl(str(tmp_path))) == characters + characters[:1]
@@ -0,0 +1,32 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from storage.loader import LoadCache, load_characters, normalize_character
+from main import create_character_from_gui, save_character_to_json
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_flat_schema_is_normalized():
+    chris, sarah = load_characters([os.path.join(REPO, "chris_character.json"), os.path.join(REPO, "test_character.json")], cache=None)
+    assert chris["name"] == "Chris"
+    assert chris["stats"]["strength"] == {"score": 16, "racial bonus": 0, "modifier": 3}
+    assert chris["stats"]["unarmored ac"] == 11
+    assert chris["stats"]["health"] is None
+    assert sarah["stats"]["constitution"]["modifier"] == -1
+
+def test_nested_schema_round_trips():
+    character = create_character_from_gui("Nia", "Druid", "Wood Elf")
+    assert normalize_character(character) == character
+
+def test_directory_load_uses_cache(tmp_path):
+    for number in range(30):
+        save_character_to_json(create_character_from_gui(f"C{number}", "Monk", "Human"), str(tmp_path / f"c{number}_character.json"), index=False)
+    cache = LoadCache(maxsize=100)
+    first = load_characters(str(tmp_path), cache=cache)
+    assert len(first) == 30 and cache.misses == 30
+    second = load_characters(str(tmp_path), cache=cache)
+    assert second == first and cache.hits == 30
+
+    os.utime(tmp_path / "c0_character.json", ns=(0, 0))
+    load_characters(str(tmp_path), cache=cache)
+    assert cache.misses == 31
@@ -0,0 +1,41 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stats import metrics
+from main import create_character_from_gui, save_character_to_json, load_character_from_json
+
+def test_disabled_metrics_record_nothing():
+    metrics.disable()
+    metrics.reset()
+    create_character_from_gui("Ann", "Druid", "Human")
+    assert metrics.snapshot()["stat_calc_dice_rolled_total"] == 0
+    assert metrics.snapshot()["stat_calc_characters_created_total"] == 0
+
+def test_enabled_metrics_count_and_time(tmp_path):
+    metrics.reset()
+    metrics.enable()
+    try:
+        character = create_character_from_gui("Ann", "Druid", "Human")
+        path = str(tmp_path / "ann_character.json")
+        save_character_to_json(character, path)
+        load_character_from_json(path)
+    finally:
+        metrics.disable()
+    snapshot = metrics.snapshot()
+    assert snapshot["stat_calc_dice_rolled_total"] == 24
+    assert snapshot["stat_calc_characters_created_total"] == 1
+    assert snapshot["stat_calc_character_create_seconds"]["count"] == 1
+    assert snapshot["stat_calc_saves_total"] == 1
+    assert snapshot["stat_calc_loads_total"] == 1
+
+def test_prometheus_file(tmp_path):
+    metrics.reset()
+    metrics.SAVE_SECONDS.observe(0.002)
+    path = str(tmp_path / "stat_calc.prom")
+    metrics.write_prometheus(path)
+    text = open(path).read()
+    assert "# TYPE stat_calc_save_seconds histogram" in text
+    assert 'stat_calc_save_seconds_bucket{le="0.005"} 1' in text
+    assert 'stat_calc_save_seconds_bucket{le="0.001"} 0' in text
+    assert "stat_calc_save_seconds_count 1" in text
+    metrics.reset()
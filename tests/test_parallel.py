@@ -0,0 +1,37 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from characters.parallel import generate_characters_parallel, chunk_seed
+
+def test_chunk_seeds_are_distinct():
+    seeds = {chunk_seed(7, index) for index in range(100)}
+    assert len(seeds) == 100
+    assert chunk_seed(7, 3) == chunk_seed(7, 3)
+
+def test_parallel_results_independent_of_worker_count():
+    serial = generate_characters_parallel(900, "Monk", "Wood Elf", seed=11, workers=1, chunk_size=200)
+    pooled = generate_characters_parallel(900, "Monk", "Wood Elf", seed=11, workers=2, chunk_size=200)
+    assert len(pooled) == 900
+    assert list(serial) == list(pooled)
+
+def test_workers_use_the_parent_backend():
+    from stats import ABILITY_SCORES, rng
+    from characters import parallel
+    try:
+        rng.set_backend("packed")
+        serial = generate_characters_parallel(400, "Monk", "Wood Elf", seed=5, workers=1, chunk_size=200)
+        pooled = generate_characters_parallel(400, "Monk", "Wood Elf", seed=5, workers=2, chunk_size=200)
+        assert list(serial) == list(pooled)
+        # A spawned worker starts on "auto"; the backend name it is handed
+        # still reproduces the parent's chunk
+        rng.set_backend("auto")
+        buffer = bytearray(len(ABILITY_SCORES) * 400)
+        parallel._roll_chunk(memoryview(buffer), 400, 0, 200, chunk_seed(5, 0), "packed")
+        assert [buffer[i * 400] for i in range(6)] == [serial.scores[stat][0] - bonus
+                                                       for stat, bonus in serial.racial_bonus.items()]
+        default = generate_characters_parallel(400, "Monk", "Wood Elf", seed=5, workers=1, chunk_size=200)
+        rng.set_backend("system")
+        system = generate_characters_parallel(400, "Monk", "Wood Elf", seed=5, workers=1, chunk_size=200)
+        assert list(system) == list(default)
+    finally:
+        rng.set_backend("auto")
@@ -0,0 +1,59 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from main import create_character_from_gui
+from stats import rng
+from stats.replay import replay_scores
+from storage.replay import RECIPE, RecipeStore, racial_choices, write_recipes
+
+
+def test_replay_scores_are_pinned_across_backends():
+    # Stored seeds must keep producing these scores forever
+    assert replay_scores(0) == (9, 10, 11, 11, 7, 14)
+    try:
+        rng.set_backend("packed", seed=1)
+        assert replay_scores(2 ** 64 - 1) == (9, 9, 14, 15, 9, 15)
+    finally:
+        rng.set_backend("auto")
+
+
+def test_seeded_gui_characters_are_reproducible():
+    first = create_character_from_gui("Vex", "Ranger", "Half Elf", "dexterity", "wisdom", seed=42)
+    assert first == create_character_from_gui("Vex", "Ranger", "Half Elf", "dexterity", "wisdom", seed=42)
+    assert first["seed"] == 42
+    fresh = create_character_from_gui("Vex", "Ranger", "Half Elf", seed=True)
+    assert 0 <= fresh["seed"] < 2 ** 64
+    assert "seed" not in create_character_from_gui("Vex", "Ranger", "Half Elf")
+    assert racial_choices(first) == ("dexterity", "wisdom")
+
+
+def test_recipe_store_regenerates_exactly(tmp_path):
+    characters = [
+        create_character_from_gui("Vex", "Ranger", "Half Elf", "dexterity", "wisdom", seed=True),
+        create_character_from_gui("Tor", "Barbarian", "Half-Orc", seed=True),
+        create_character_from_gui("Ida", "Wizard", "Variant Human", "intelligence", "dexterity", seed=True),
+        create_character_from_gui("Vex", "Ranger", "Half Elf", "dexterity", "wisdom", seed=True),
+    ]
+    path = str(tmp_path / "party.recipes")
+    assert write_recipes(path, characters) == 4
+    assert RECIPE.size == 16
+    with RecipeStore(path) as store:
+        assert len(store) == 4
+        assert store.regenerate() == characters
+        assert store[2] == characters[2]
+        assert store.regenerate([3, 0]) == [characters[3], characters[0]]
+        assert store.recipe(-1)["racial choices"] == ("dexterity", "wisdom")
+    with pytest.raises(ValueError):
+        write_recipes(path, [create_character_from_gui("No", "Bard", "Human")])
+
+def test_seeds_outside_64_bits_are_rejected_up_front(tmp_path):
+    for seed in (-1, 2 ** 64, "7", 1.0):
+        with pytest.raises(ValueError, match="seed must be an integer"):
+            create_character_from_gui("Vex", "Ranger", "Human", seed=seed)
+        with pytest.raises(ValueError, match="seed must be"):
+            replay_scores(seed)
+    character = create_character_from_gui("Vex", "Ranger", "Human", seed=3)
+    character["seed"] = 2 ** 64
+    with pytest.raises(ValueError, match="seed of 'Vex'"):
+        write_recipes(str(tmp_path / "recipes.bin"), [character])
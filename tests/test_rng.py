@@ -0,0 +1,82 @@
+import os
+import sys
+import threading
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from stats import rng
+from stats.roll_stat_dice import _drop_lowest_table, roll_4d6_drop_lowest_batch, roll_dice_batch
+
+FACES = (1, 2, 3, 4, 5, 6)
+# Chi-square critical values at 5 degrees of freedom. Seeded backends see
+# the same faces every run, so p = 0.001 cannot flake; the unseedable
+# system backend gets p = 1.5e-8 so the suite does not fail by chance
+CRITICAL_VALUE = 20.515
+SYSTEM_CRITICAL_VALUE = 45.0
+
+
+def available_backends():
+    return [name for name in rng.BACKENDS if name != "numpy" or rng.load_numpy() is not None]
+
+
+@pytest.mark.parametrize("name", available_backends())
+def test_backend_faces_are_uniform(name):
+    backend = rng.BACKENDS[name](None if name == "system" else 1)
+    faces = backend.choices(FACES, 60_000).tolist()
+    counts = [faces.count(face) for face in FACES]
+    chi_square = sum((count - 10_000) ** 2 / 10_000 for count in counts)
+    assert chi_square < (SYSTEM_CRITICAL_VALUE if name == "system" else CRITICAL_VALUE)
+    assert backend.choice(FACES) in FACES
+
+
+@pytest.mark.parametrize("name", [name for name in available_backends() if name != "system"])
+def test_seeded_backends_repeat(name):
+    table = tuple(range(3, 19))
+    first = rng.BACKENDS[name](7).choices(table, 1000).tolist()
+    assert first == rng.BACKENDS[name](7).choices(table, 1000).tolist()
+
+
+@pytest.mark.parametrize("name", available_backends())
+def test_one_entry_and_wide_tables(name):
+    backend = rng.BACKENDS[name](None if name == "system" else 1)
+    assert backend.choices((4,), 10).tolist() == [4] * 10
+    assert backend.choice((4,)) == 4
+    wide = (200, 300, -1000)
+    assert set(backend.choices(wide, 100).tolist()) <= set(wide)
+
+
+def test_auto_never_picks_packed():
+    try:
+        rng.set_backend("auto")
+        for n in (1, rng.NUMPY_THRESHOLD - 1, rng.NUMPY_THRESHOLD, 10 ** 6):
+            assert rng._backend_for(n) in ("mt", "numpy")
+            assert rng.get_rng(n).name in ("mt", "numpy")
+    finally:
+        rng.set_backend("auto")
+
+
+def test_system_backend_rejects_seed():
+    with pytest.raises(ValueError):
+        rng.SystemBackend(1)
+    with pytest.raises(ValueError):
+        rng.set_backend("system", seed=1)
+
+
+def test_set_backend_seeds_each_thread():
+    def rolls():
+        results = []
+        thread = threading.Thread(target=lambda: results.append(roll_dice_batch(50).tolist()))
+        thread.start()
+        thread.join()
+        return results[0]
+
+    try:
+        rng.set_backend("packed", seed=3)
+        assert rng.get_rng().name == "packed"
+        first = rolls()
+        rng.set_backend("packed", seed=3)
+        rng.get_rng()
+        assert rolls() == first
+        expected = rng.PackedBackend(5).choices(_drop_lowest_table(6), 10).tolist()
+        assert roll_4d6_drop_lowest_batch(10, seed=5).tolist() == expected
+    finally:
+        rng.set_backend("auto")
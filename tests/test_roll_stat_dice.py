@@ -1,7 +1,7 @@
 import os
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from stats.roll_stat_dice import roll_dice, add_rolls, roll_4d6_drop_lowest
+from stats.roll_stat_dice import roll_dice, add_rolls, roll_4d6_drop_lowest, roll_dice_batch, roll_4d6_drop_lowest_batch
 
 def test_roll_4d6_drop_lowest():
     result = roll_4d6_drop_lowest()
@@ -20,4 +20,38 @@ def test_add_rolls():
 def test_roll_dice():
     for _ in range(10):
         result = roll_dice(6)
-        assert 1 <= result <=6
\ No newline at end of file
+        assert 1 <= result <=6
+
+def test_roll_dice_batch():
+    results = roll_dice_batch(1000, 6, seed=1)
+    assert len(results) == 1000
+    assert min(results) >= 1 and max(results) <= 6
+
+def test_roll_4d6_drop_lowest_batch():
+    results = roll_4d6_drop_lowest_batch(1000, seed=1)
+    assert len(results) == 1000
+    assert min(results) >= 3 and max(results) <= 18
+
+def test_roll_4d6_drop_lowest_batch_is_seeded():
+    first = list(roll_4d6_drop_lowest_batch(500, seed=42))
+    second = list(roll_4d6_drop_lowest_batch(500, seed=42))
+    assert first == second
+
+def test_large_dice():
+    results = roll_dice_batch(1000, 200, seed=1)
+    assert min(results) >= 1 and max(results) <= 200 and max(results) > 127
+    batch = roll_4d6_drop_lowest_batch(500, size=100, seed=2)
+    assert min(batch) >= 3 and max(batch) <= 300 and max(batch) > 127
+    assert list(batch) == list(roll_4d6_drop_lowest_batch(500, size=100, seed=2))
+    assert 3 <= roll_4d6_drop_lowest(100) <= 300
+
+def test_dice_beyond_the_tables():
+    from stats import roll_stat_dice
+    assert 1 <= roll_dice(10 ** 7) <= 10 ** 7
+    assert 10 ** 7 not in roll_stat_dice._faces
+    results = roll_dice_batch(100, 10 ** 7, seed=3)
+    assert min(results) >= 1 and max(results) <= 10 ** 7 and max(results) > 32767
+    assert 3 <= roll_4d6_drop_lowest(200) <= 600
+    batch = roll_4d6_drop_lowest_batch(300, size=200, seed=4)
+    assert min(batch) >= 3 and max(batch) <= 600 and max(batch) > 127
+    assert list(batch) == list(roll_4d6_drop_lowest_batch(300, size=200, seed=4))
@@ -0,0 +1,82 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from itertools import chain
+from characters.batch import generate_characters
+from roster import COLUMNS, RosterModel, character_row, open_roster
+from storage.archive import ArchiveWriter
+from storage.binary import write_store
+
+
+def _roster():
+    batches = [generate_characters(150, "Wizard", "Rock Gnome", seed=1),
+               generate_characters(150, "Fighter", "Human", seed=2),
+               generate_characters(100, "Bard", "Half Elf", "charisma", "dexterity", seed=3)]
+    for number, batch in enumerate(batches):
+        batch.name = f"Party {number}"
+    return list(chain.from_iterable(batches))
+
+
+def _expected(characters, filters, sort, descending):
+    rows = [character_row(character) for character in characters]
+    indices = [i for i, row in enumerate(rows)
+               if all(row[COLUMNS.index(field)] == condition if isinstance(condition, str)
+                      else condition[0] <= row[COLUMNS.index(field)] <= condition[1]
+                      for field, condition in filters.items())]
+    if sort is not None:
+        column = COLUMNS.index(sort)
+        # sort() is stable in both directions, like the counting sort
+        indices.sort(key=lambda i: rows[i][column], reverse=descending)
+    return indices
+
+
+def test_pages_load_lazily_and_stale_pages_are_dropped():
+    characters = _roster()
+    model = RosterModel(characters, page_size=50, cached_pages=2)
+    assert len(model) == 400 and model.row(0) is None
+    assert model.missing_pages(40, 120) == [0, 1, 2]
+    for page in (0, 1, 2):
+        assert model.store_page(model.load_page(page))
+    assert model.row(120) == character_row(characters[120])
+    assert model.row(0) is None and model.missing_pages(0, 60) == [0]
+
+    stale = model.load_page(0)
+    model.set_view(model.compute_view(sort="strength", descending=True))
+    assert not model.store_page(stale) and model.row(100) is None
+    model.store_page(model.load_page(0))
+    assert model.row(0) == character_row(characters[model.index(0)])
+    assert model.row(0)[COLUMNS.index("strength")] == max(c["stats"]["strength"]["score"] for c in characters)
+
+
+@pytest.mark.parametrize("filters, sort, descending", [
+    ({}, "class", False),
+    ({}, "race", True),
+    ({"class": "Wizard"}, "intelligence", True),
+    ({"strength": (12, 15), "race": "Human"}, "health", False),
+    ({"dexterity": (14, 18), "charisma": (8, 20), "class": "Bard"}, None, False),
+])
+def test_views_match_plain_sort_and_filter(tmp_path, filters, sort, descending):
+    characters = _roster()
+    path = str(tmp_path / "roster.bin")
+    write_store(path, characters)
+    with open_roster(path) as store:
+        for source in (characters, store):
+            view = RosterModel(source).compute_view(filters, sort, descending)
+            assert list(view) == _expected(characters, filters, sort, descending)
+
+
+def test_open_roster_and_cancellation(tmp_path):
+    characters = _roster()
+    path = str(tmp_path / "roster.scar")
+    with ArchiveWriter(path, block_size=64) as writer:
+        writer.extend(characters)
+    with open_roster(path) as archive:
+        model = RosterModel(archive)
+        assert model.compute_view(sort="wisdom", cancelled=lambda: True) is None
+        assert len(model.compute_view({"class": "Fighter"})) == 150
+        assert model.labels["class"] == ["Wizard", "Fighter", "Bard"]
+    other = tmp_path / "notes.txt"
+    other.write_text("not a roster")
+    with pytest.raises(ValueError):
+        open_roster(str(other))
@@ -0,0 +1,41 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stats.rules import validate_rules, compile_rules, bonus_vector, HIT_DICE
+from stats.classes import CLASSES
+
+def test_rules_are_valid():
+    validate_rules()
+
+def test_bonus_vector_fixed_race_ignores_choices():
+    assert bonus_vector("Half-Orc") == (2, 0, 1, 0, 0, 0)
+    assert bonus_vector("Half-Orc", "wisdom", "charisma") == (2, 0, 1, 0, 0, 0)
+
+def test_bonus_vector_choice_race():
+    assert bonus_vector("Half Elf", "strength", "dexterity") == (1, 1, 0, 0, 0, 2)
+    assert bonus_vector("Variant Human", "strength", "strength") == (4, 0, 2, 0, 0, 0)
+    assert bonus_vector("Half Elf", "", None) == (0, 0, 0, 0, 0, 2)
+
+def test_compiled_rules_cover_every_class():
+    assert HIT_DICE == CLASSES
+    assert compile_rules()["hit dice"] == CLASSES
+
+def test_cache_only_trusts_validated_entries(tmp_path, monkeypatch):
+    import marshal
+    from stats import rules
+    monkeypatch.setattr(rules, "CACHE_DIR", str(tmp_path))
+    compiled = rules.load_rules()
+    (path,) = tmp_path.iterdir()
+    assert rules.load_rules() == compiled
+    with open(path, 'wb') as f:
+        marshal.dump({"bonus vectors": {}, "hit dice": {}}, f)
+    assert rules.load_rules() == compiled
+    with open(path, 'rb') as f:
+        assert marshal.load(f)["rules"] == compiled
+
+def test_validation_without_sources(monkeypatch):
+    import inspect
+    def no_source(module):
+        raise OSError("could not get source code")
+    monkeypatch.setattr(inspect, "getsource", no_source)
+    validate_rules()
@@ -0,0 +1,131 @@
+import asyncio
+import json
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pytest
+from main import create_character_from_gui, save_character_to_json
+from stat_calc.server import CharacterService, HTTPError
+
+PAYLOAD = {"class": "Wizard", "race": "High Elf", "name": "Ada", "count": 3}
+
+
+async def request(reader, writer, method, path, payload=None, close=False):
+    body = json.dumps(payload).encode() if payload is not None else b""
+    connection = "Connection: close\r\n" if close else ""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\n{connection}Content-Length: {len(body)}\r\n\r\n"
+                 .encode() + body)
+    head = await reader.readuntil(b"\r\n\r\n")
+    headers = dict(line.split(": ", 1) for line in head.decode().split("\r\n")[1:] if line)
+    data = await reader.readexactly(int(headers["Content-Length"]))
+    return int(head.split(b" ")[1]), headers, data
+
+
+def run_with_service(scenario, **options):
+    async def run():
+        service = CharacterService(**options)
+        server = await service.start("127.0.0.1", 0)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.sockets[0].getsockname()[1])
+        try:
+            return await scenario(service, reader, writer)
+        finally:
+            writer.close()
+            await service.close()
+    return asyncio.run(run())
+
+
+def test_generate_and_reroll_share_one_keep_alive_connection():
+    async def scenario(service, reader, writer):
+        status, headers, body = await request(reader, writer, "POST", "/generate", PAYLOAD)
+        assert status == 200 and headers["Connection"] == "keep-alive"
+        characters = json.loads(body)["characters"]
+        assert [character["name"] for character in characters] == ["Ada"] * 3
+        assert set(characters[0]) == set(create_character_from_gui("Ada", "Wizard", "High Elf"))
+
+        status, _, body = await request(reader, writer, "POST", "/reroll",
+                                        {"character": characters[0], "stat": "constitution"})
+        result = json.loads(body)
+        assert status == 200 and "health" in result["changed"]
+        assert result["character"]["stats"]["dexterity"] == characters[0]["stats"]["dexterity"]
+
+        status, headers, _ = await request(reader, writer, "GET", "/nowhere", close=True)
+        assert status == 404 and headers["Connection"] == "close"
+    run_with_service(scenario)
+
+
+def test_concurrent_generates_are_batched():
+    async def scenario(service, reader, writer):
+        results = await asyncio.gather(*(service.generate(dict(PAYLOAD, count=1)) for _ in range(20)))
+        assert all(len(result["characters"]) == 1 for result in results)
+        assert service.batches < 20
+    run_with_service(scenario, batch_window=0.05)
+
+
+def test_load_stays_inside_data_directory(tmp_path):
+    save_character_to_json(create_character_from_gui("Bo", "Rogue", "Drow"), str(tmp_path / "bo_character.json"),
+                           index=False)
+
+    async def scenario(service, reader, writer):
+        status, _, body = await request(reader, writer, "POST", "/load", {"path": "bo_character.json"})
+        assert status == 200 and json.loads(body)["character"]["name"] == "Bo"
+        status, _, _ = await request(reader, writer, "POST", "/load", {"path": "../secrets.json"})
+        assert status == 400
+        status, _, _ = await request(reader, writer, "POST", "/generate", {"class": "Bard", "race": "Gnome?"})
+        assert status == 400
+    run_with_service(scenario, data_dir=str(tmp_path))
+
+
+def test_full_queue_answers_503():
+    async def scenario():
+        service = CharacterService(max_queue=1)
+        waiting = asyncio.ensure_future(service.generate(dict(PAYLOAD)))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPError) as error:
+            await service.generate(dict(PAYLOAD))
+        assert error.value.status == 503
+        waiting.cancel()
+    asyncio.run(scenario())
+
+
+def test_reroll_rejects_unknown_names_and_bad_scores():
+    from characters import character as character_module
+    character = create_character_from_gui("Ada", "Wizard", "High Elf")
+    bad_class = dict(character, **{"class": "Wizard9000"})
+    bad_score = json.loads(json.dumps(character))
+    bad_score["stats"]["strength"]["score"] = 300
+    bad_bonus = json.loads(json.dumps(character))
+    bad_bonus["stats"]["strength"]["racial bonus"] = 7
+    nested_bonus = json.loads(json.dumps(character))
+    nested_bonus["stats"]["strength"]["racial bonus"] = [[1]]
+    known = (len(character_module._CLASS_NAMES), len(character_module._BONUS_VECTORS))
+
+    async def scenario(service, reader, writer):
+        for posted in (bad_class, bad_score, bad_bonus, nested_bonus, "nope"):
+            status, _, _ = await request(reader, writer, "POST", "/reroll", {"character": posted, "stat": "wisdom"})
+            assert status == 400
+    run_with_service(scenario)
+    assert (len(character_module._CLASS_NAMES), len(character_module._BONUS_VECTORS)) == known
+
+
+def test_batches_are_capped_by_characters(monkeypatch):
+    from stat_calc import server
+    monkeypatch.setattr(server, "MAX_BATCH_CHARACTERS", 25)
+
+    async def scenario(service, reader, writer):
+        results = await asyncio.gather(*(service.generate(dict(PAYLOAD, count=10)) for _ in range(7)))
+        assert all(len(result["characters"]) == 10 for result in results)
+        assert service.batches >= 4
+    run_with_service(scenario, batch_window=0.05)
+
+
+def test_bad_content_length_and_boolean_count_answer_400():
+    async def scenario(service, reader, writer):
+        port = service._server.sockets[0].getsockname()[1]
+        for length in ("-5", "abc", "1_0"):
+            bad_reader, bad_writer = await asyncio.open_connection("127.0.0.1", port)
+            bad_writer.write(f"POST /generate HTTP/1.1\r\nHost: test\r\nContent-Length: {length}\r\n\r\n".encode())
+            assert (await bad_reader.read()).startswith(b"HTTP/1.1 400")
+            bad_writer.close()
+        status, _, _ = await request(reader, writer, "POST", "/generate", dict(PAYLOAD, count=True))
+        assert status == 400
+    run_with_service(scenario)
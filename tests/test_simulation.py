@@ -0,0 +1,68 @@
+import os
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stats.analytics import stat_distribution
+from simulation.aggregators import Histogram, Moments, Predicate, QuantileSketch
+from simulation.engine import simulate
+
+
+def no_score_above_13(best):
+    return best <= 13
+
+
+def test_moments_merge_matches_single_pass():
+    values = list(range(100))
+    whole = Moments("x")
+    whole.add(values)
+    left, right = Moments("x"), Moments("x")
+    left.add(values[:37])
+    right.add(values[37:])
+    left.merge(right)
+    assert left.count == 100
+    assert abs(left.mean - whole.mean) < 1e-9
+    assert abs(left.variance - whole.variance) < 1e-9
+
+
+def test_quantile_sketch_stays_small_and_close():
+    sketch = QuantileSketch("x", k=100)
+    for start in range(0, 100_000, 10_000):
+        sketch.add(list(range(start, start + 10_000)))
+    assert sketch.count == 100_000
+    assert sum(map(len, sketch.levels)) < 1000
+    assert abs(sketch.quantile(0.5) - 50_000) < 3_000
+
+
+def test_simulate_is_chunked_and_seeded():
+    aggregators = [Histogram("strength"), Moments("total"), Predicate(no_score_above_13)]
+    histogram, moments, odds = simulate(20_000, aggregators, seed=3, chunk_size=3_000)
+    assert histogram.count == moments.count == odds.count == 20_000
+    assert aggregators[0].count == 0
+    for value, probability in stat_distribution().items():
+        assert abs(histogram.result().get(value, 0) - float(probability)) < 0.02
+    assert abs(moments.mean - 6 * 12.24) < 0.3
+    again = simulate(20_000, aggregators, seed=3, chunk_size=3_000)[0]
+    assert again.counts == histogram.counts
+
+
+def test_simulate_characters_in_parallel():
+    serial = simulate(6_000, [Histogram("health")], "Wizard", "Hill Dwarf", seed=1, chunk_size=1_000)[0]
+    parallel = simulate(6_000, [Histogram("health")], "Wizard", "Hill Dwarf", seed=1, chunk_size=1_000, workers=2)[0]
+    assert serial.counts == parallel.counts
+    assert min(serial.counts) >= 1
+
+
+def test_sketches_are_reseeded_per_chunk_and_merged_in_order():
+    serial = simulate(8_000, [QuantileSketch("strength", k=20)], seed=5, chunk_size=1_000)[0]
+    parallel = simulate(8_000, [QuantileSketch("strength", k=20)], seed=5, chunk_size=1_000, workers=2)[0]
+    assert serial.levels == parallel.levels
+    first, second = QuantileSketch("x", k=8), QuantileSketch("x", k=8)
+    first.reseed(1)
+    second.reseed(2)
+    flips = [first._random.getrandbits(32) for _ in range(4)]
+    assert flips != [second._random.getrandbits(32) for _ in range(4)]
+
+
+def test_race_without_class_is_rejected():
+    import pytest
+    with pytest.raises(ValueError, match="character_class"):
+        simulate(1000, [Moments("total")], character_race="Human")
@@ -0,0 +1,34 @@
+import json
+import os
+import subprocess
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from stat_calc.cli import main
+
+REPO = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def test_generate_writes_json_lines(capsys):
+    assert main(["generate", "--class", "Paladin", "--race", "Half Elf", "--choice1", "strength", "-n", "3", "--seed", "5"]) == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 3
+    character = json.loads(lines[0])
+    assert character["class"] == "Paladin"
+    assert character["stats"]["strength"]["racial bonus"] == 1
+
+def test_generate_is_seeded(capsys):
+    main(["generate", "--class", "Monk", "--race", "Drow", "-n", "2", "--seed", "8"])
+    first = capsys.readouterr().out
+    main(["generate", "--class", "Monk", "--race", "Drow", "-n", "2", "--seed", "8"])
+    assert capsys.readouterr().out == first
+
+def test_cli_never_imports_the_gui():
+    result = subprocess.run([sys.executable, "-X", "importtime", "-m", "stat_calc", "generate", "--class", "Bard", "--race", "Human"],
+                            cwd=REPO, capture_output=True, text=True, check=True)
+    imported = {line.split("|")[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+    assert "tkinter" not in imported
+    assert "character_creation_gui" not in imported
+
+def test_package_import_is_lazy():
+    code = "import sys, stat_calc; print('stats.rules' in sys.modules); stat_calc.generate_characters; print('stats.rules' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=REPO, capture_output=True, text=True, check=True)
+    assert result.stdout.split() == ["False", "True"]